@@ -0,0 +1,261 @@
+"""Benchmarks of user_agent generation hot paths and import time.
+
+Usage::
+
+    python benchmarks/bench_user_agent.py --output var/bench.json
+    python benchmarks/bench_user_agent.py --compare var/bench.json
+
+Results are printed as a table and could be saved as JSON document
+{"meta": {...}, "results": [{"group", "name", "ns_per_op", "ops_per_sec"}]}
+to compare performance of different releases.
+"""
+# from __future__ import annotations
+# ruff: noqa: INP001
+
+import json
+import platform
+import subprocess  # nosec
+import sys
+import time
+import timeit
+from argparse import ArgumentParser
+from random import Random
+
+import user_agent
+from user_agent import base
+from user_agent.base import (
+    UserAgentGenerator,
+    build_config_variants,
+    build_navigator,
+    build_system_components,
+    generate_navigator,
+    generate_navigator_js,
+    generate_user_agent,
+    get_chrome_build,
+    get_firefox_build,
+    get_ua_renderer,
+    pick_config_ids,
+    pick_system_components,
+    resolve_config_variants,
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias
+    from typing import Any, Callable, Dict, List, Tuple
+
+    BenchResult = Dict[str, Any]
+    # pylint: enable=deprecated-typing-alias
+
+BULK_SIZE = 10000
+IMPORT_RUNS = 5
+
+
+def measure(func, number, repeat):
+    # type: (Callable[[], Any], int, int) -> float
+    """Return best time of one call of `func` in nanoseconds."""
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def make_result(group, name, ns_per_op):
+    # type: (str, str, float) -> BenchResult
+    return {
+        "group": group,
+        "name": name,
+        "ns_per_op": round(ns_per_op, 1),
+        "ops_per_sec": round(1e9 / ns_per_op, 1) if ns_per_op else None,
+    }
+
+
+def iter_micro_benchmarks(rng):
+    # type: (Random) -> List[Tuple[str, Callable[[], Any]]]
+    system = {"ua_platform": "X11; Linux x86_64"}
+    app = {"build_version": "86.0.4240.75"}
+    chrome_template = base.USER_AGENT_TEMPLATE["chrome"]
+    chrome_renderer = get_ua_renderer("chrome")
+    return [
+        ("resolve_config_variants", lambda: resolve_config_variants(None, None, None)),
+        ("build_config_variants", lambda: build_config_variants(None, None, None)),
+        ("pick_config_ids", lambda: pick_config_ids(None, None, None, rng)),
+        (
+            "pick_system_components[win]",
+            lambda: pick_system_components("desktop", "win", "chrome", rng),
+        ),
+        (
+            "pick_system_components[mac,chrome]",
+            lambda: pick_system_components("desktop", "mac", "chrome", rng),
+        ),
+        (
+            "pick_system_components[android,chrome]",
+            lambda: pick_system_components("smartphone", "android", "chrome", rng),
+        ),
+        (
+            "build_system_components[linux,firefox]",
+            lambda: build_system_components("desktop", "linux", "firefox", rng),
+        ),
+        ("get_firefox_build", lambda: get_firefox_build(rng)),
+        ("get_chrome_build", lambda: get_chrome_build(rng)),
+        (
+            "template[str.format]",
+            lambda: chrome_template.format(system=system, app=app),
+        ),
+        (
+            "template[compiled]",
+            lambda: chrome_renderer(
+                system["ua_platform"], app["build_version"], None, None
+            ),
+        ),
+        (
+            "build_navigator[desktop,win,chrome]",
+            lambda: build_navigator("desktop", "win", "chrome", rng),
+        ),
+    ]
+
+
+def iter_e2e_benchmarks(rng):
+    # type: (Random) -> List[Tuple[str, Callable[[], Any]]]
+    result = []  # type: List[Tuple[str, Callable[[], Any]]]
+    for device_type, os_id, navigator_id in build_config_variants(device_type="all"):
+        label = "{},{},{}".format(device_type, os_id, navigator_id)
+        opts = {
+            "device_type": device_type,
+            "os": os_id,
+            "navigator": navigator_id,
+            "rng": rng,
+        }
+        result.append(
+            (
+                "generate_user_agent[{}]".format(label),
+                lambda opts=opts: generate_user_agent(**opts),  # type: ignore[misc]
+            )
+        )
+        result.append(
+            (
+                "generate_navigator_js[{}]".format(label),
+                lambda opts=opts: generate_navigator_js(**opts),  # type: ignore[misc]
+            )
+        )
+    result.append(("generate_navigator[default]", lambda: generate_navigator(rng=rng)))
+    return result
+
+
+def run_bulk_benchmarks(rng_factory, scale):
+    # type: (Callable[[], Random], float) -> List[BenchResult]
+    size = max(1, int(BULK_SIZE * scale))
+    results = []
+    for device_type in ("desktop", "all"):
+        gen = UserAgentGenerator(device_type=device_type, rng=rng_factory())
+        for method in ("user_agents", "navigators", "navigators_js"):
+            func = getattr(gen, method)
+            start = time.perf_counter()
+            func(size)
+            elapsed = time.perf_counter() - start
+            results.append(
+                make_result(
+                    "bulk",
+                    "UserAgentGenerator.{}[{}]".format(method, device_type),
+                    elapsed / size * 1e9,
+                )
+            )
+    return results
+
+
+def run_import_benchmark():
+    # type: () -> List[BenchResult]
+    """Measure cold import time of the package with `-X importtime`."""
+    timings = []
+    for _ in range(IMPORT_RUNS):
+        proc = subprocess.run(  # noqa: S603
+            [sys.executable, "-X", "importtime", "-c", "import user_agent"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        for line in proc.stderr.splitlines():
+            fields = [x.strip() for x in line.split("|")]
+            if len(fields) == 3 and fields[2] == "user_agent":  # noqa: PLR2004
+                timings.append(int(fields[1]) * 1000)
+    return [make_result("import", "import user_agent", min(timings))]
+
+
+def run_benchmarks(quick, rng_name, name_filter):
+    # type: (bool, str, str | None) -> List[BenchResult]
+    scale = 0.1 if quick else 1.0
+    repeat = 3 if quick else 5
+    number = 200 if quick else 2000
+
+    def rng_factory():
+        # type: () -> Random
+        if rng_name == "system":
+            return base.randomizer
+        return Random(1)  # noqa: S311
+
+    results = []
+    for group, benchmarks in (
+        ("micro", iter_micro_benchmarks(rng_factory())),
+        ("e2e", iter_e2e_benchmarks(rng_factory())),
+    ):
+        for name, func in benchmarks:
+            if name_filter and name_filter not in name:
+                continue
+            results.append(make_result(group, name, measure(func, number, repeat)))
+    for result in run_bulk_benchmarks(rng_factory, scale) + run_import_benchmark():
+        if not name_filter or name_filter in result["name"]:
+            results.append(result)
+    return results
+
+
+def print_results(results, baseline):
+    # type: (List[BenchResult], Dict[str, BenchResult]) -> None
+    for result in results:
+        line = "{:<8} {:<58} {:>12.1f} ns".format(
+            result["group"], result["name"], result["ns_per_op"]
+        )
+        base_result = baseline.get(result["name"])
+        if base_result:
+            line += "  x{:.2f}".format(base_result["ns_per_op"] / result["ns_per_op"])
+        print(line)
+
+
+def main():
+    # type: () -> None
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="fewer iterations")
+    parser.add_argument(
+        "--rng",
+        choices=("seeded", "system"),
+        default="seeded",
+        help="random source: seeded random.Random (stable) or SystemRandom",
+    )
+    parser.add_argument("--filter", help="run only benchmarks containing FILTER")
+    parser.add_argument("--output", help="save results as JSON to OUTPUT file")
+    parser.add_argument(
+        "--compare", help="JSON file with baseline results, print speedup factors"
+    )
+    opts = parser.parse_args()
+    results = run_benchmarks(opts.quick, opts.rng, opts.filter)
+    baseline = {}  # type: Dict[str, BenchResult]
+    if opts.compare:
+        with open(opts.compare, encoding="utf-8") as inp:
+            baseline = {x["name"]: x for x in json.load(inp)["results"]}
+    print_results(results, baseline)
+    if opts.output:
+        doc = {
+            "meta": {
+                "user_agent_version": user_agent.__version__,
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "rng": opts.rng,
+                "quick": opts.quick,
+                "time": int(time.time()),
+            },
+            "results": results,
+        }
+        with open(opts.output, "w", encoding="utf-8") as out:
+            json.dump(doc, out, indent=2)
+
+
+if __name__ == "__main__":
+    main()
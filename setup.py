@@ -4,7 +4,6 @@ setup(
     name="user_agent",
     version="0.1.14",
     packages=["user_agent", "user_agent.data"],
-    install_requires=["six", "pytz"],
     include_package_data=True,
     entry_points={
         "console_scripts": {
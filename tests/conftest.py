@@ -0,0 +1,6 @@
+# pylint: disable=missing-docstring
+import sys
+
+# Modules of python 3 only features, they use syntax and imports missing
+# in python 2
+collect_ignore = [] if sys.version_info >= (3,) else ["test_aio.py", "test_service.py"]  # noqa: UP036 python 2 compatible
@@ -0,0 +1,101 @@
+# pylint: disable=missing-docstring
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+from typing import Any
+
+import pytest
+
+from user_agent import (
+    InvalidOption,
+    generate_navigators,
+    generate_navigators_js,
+    generate_user_agents,
+)
+from user_agent.aio import (
+    agenerate_navigator,
+    agenerate_navigator_js,
+    agenerate_user_agent,
+    aiter_navigators,
+    aiter_navigators_js,
+    aiter_user_agents,
+)
+
+
+async def collect(aiterator):
+    # type: (Any) -> list[Any]
+    return [item async for item in aiterator]
+
+
+def test_agenerate_user_agent():
+    # type: () -> None
+    user_agent = asyncio.run(agenerate_user_agent(os="win"))
+    assert "Windows" in user_agent
+
+
+def test_agenerate_navigator():
+    # type: () -> None
+    nav = asyncio.run(agenerate_navigator(navigator="firefox"))
+    assert nav["navigator_id"] == "firefox"
+
+
+def test_agenerate_navigator_js_seeded():
+    # type: () -> None
+    nav = asyncio.run(agenerate_navigator_js(rng=Random(1)))  # noqa: S311
+    assert nav == generate_navigators_js(1, rng=Random(1))[0]  # noqa: S311
+
+
+def test_agenerate_invalid_option():
+    # type: () -> None
+    with pytest.raises(InvalidOption):
+        asyncio.run(agenerate_user_agent(os="dos"))
+
+
+def test_aiter_navigators_same_as_sync():
+    # type: () -> None
+    items = asyncio.run(
+        collect(aiter_navigators(100, os="win", rng=Random(1), batch_size=30))  # noqa: S311
+    )
+    assert items == generate_navigators(100, os="win", rng=Random(1))  # noqa: S311
+
+
+def test_aiter_navigators_js_same_as_sync():
+    # type: () -> None
+    items = asyncio.run(collect(aiter_navigators_js(10, rng=Random(1), batch_size=3)))  # noqa: S311
+    assert items == generate_navigators_js(10, rng=Random(1))  # noqa: S311
+
+
+def test_aiter_user_agents_executor():
+    # type: () -> None
+    with ThreadPoolExecutor(1) as executor:
+        items = asyncio.run(
+            collect(aiter_user_agents(7, rng=Random(1), executor=executor))  # noqa: S311
+        )
+    assert items == generate_user_agents(7, rng=Random(1))  # noqa: S311
+
+
+def test_aiter_zero_count():
+    # type: () -> None
+    assert not asyncio.run(collect(aiter_user_agents(0)))
+
+
+def test_aiter_infinite():
+    # type: () -> None
+    async def take(count):
+        # type: (int) -> list[str]
+        result = []
+        async for user_agent in aiter_user_agents(batch_size=4):
+            result.append(user_agent)
+            if len(result) == count:
+                break
+        return result
+
+    assert len(asyncio.run(take(10))) == 10  # noqa: PLR2004
+
+
+def test_aiter_invalid_options():
+    # type: () -> None
+    with pytest.raises(InvalidOption):
+        asyncio.run(collect(aiter_navigators(1, navigator="netscape")))
+    with pytest.raises(ValueError, match="Batch size"):
+        asyncio.run(collect(aiter_navigators(1, batch_size=0)))
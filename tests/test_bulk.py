@@ -0,0 +1,121 @@
+# pylint: disable=missing-docstring
+import csv
+import json
+import re
+from typing import Any, Iterable
+
+import pytest
+
+from user_agent import InvalidOption
+from user_agent.bulk import iter_bulk_chunks
+
+TOTAL = 250
+CHUNK_SIZE = 40
+
+
+def flatten(chunks):
+    # type: (Iterable[list[Any]]) -> list[Any]
+    return [item for chunk in chunks for item in chunk]
+
+
+def test_chunks_layout():
+    # type: () -> None
+    chunks = list(
+        iter_bulk_chunks(TOTAL, seed=1, processes=1, chunk_size=CHUNK_SIZE)
+    )
+    assert [len(x) for x in chunks] == [CHUNK_SIZE] * 6 + [10]
+
+
+def test_output_does_not_depend_on_processes():
+    # type: () -> None
+    results = [
+        flatten(
+            iter_bulk_chunks(
+                TOTAL,
+                kind="navigator_js",
+                seed=42,
+                processes=processes,
+                chunk_size=CHUNK_SIZE,
+                device_type="all",
+            )
+        )
+        for processes in (1, 2)
+    ]
+    assert len(results[0]) == TOTAL
+    assert results[0] == results[1]
+
+
+def test_seed_changes_output():
+    # type: () -> None
+    outputs = [
+        flatten(iter_bulk_chunks(TOTAL, kind="user_agent", seed=seed, processes=1))
+        for seed in (1, 2)
+    ]
+    assert outputs[0] != outputs[1]
+
+
+def test_generation_options():
+    # type: () -> None
+    for agent in flatten(
+        iter_bulk_chunks(
+            TOTAL, kind="user_agent", processes=2, os="linux", navigator="chrome"
+        )
+    ):
+        assert re.match("^Mozilla.*Linux.*Chrome", agent)
+
+
+def test_output_format():
+    # type: () -> None
+    blocks = list(
+        iter_bulk_chunks(
+            TOTAL,
+            kind="user_agent",
+            seed=1,
+            processes=2,
+            chunk_size=CHUNK_SIZE,
+            output_format="text",
+        )
+    )
+    assert "".join(blocks).splitlines() == flatten(
+        iter_bulk_chunks(
+            TOTAL, kind="user_agent", seed=1, processes=1, chunk_size=CHUNK_SIZE
+        )
+    )
+    navs = flatten(
+        iter_bulk_chunks(TOTAL, kind="navigator_js", seed=1, chunk_size=CHUNK_SIZE)
+    )
+    blocks = list(
+        iter_bulk_chunks(
+            TOTAL,
+            kind="navigator_js",
+            seed=1,
+            chunk_size=CHUNK_SIZE,
+            output_format="jsonl",
+        )
+    )
+    assert [json.loads(line) for line in "".join(blocks).splitlines()] == navs
+    blocks = list(
+        iter_bulk_chunks(
+            TOTAL,
+            kind="navigator_js",
+            seed=1,
+            chunk_size=CHUNK_SIZE,
+            output_format="csv",
+        )
+    )
+    rows = list(csv.DictReader("".join(blocks).splitlines()))
+    assert [row["userAgent"] for row in rows] == [nav["userAgent"] for nav in navs]
+
+
+def test_invalid_options():
+    # type: () -> None
+    with pytest.raises(InvalidOption):
+        iter_bulk_chunks(TOTAL, os="linux", navigator="ie")
+    with pytest.raises(InvalidOption):
+        iter_bulk_chunks(TOTAL, kind="html")
+    with pytest.raises(InvalidOption):
+        iter_bulk_chunks(TOTAL, chunk_size=0)
+    with pytest.raises(InvalidOption):
+        iter_bulk_chunks(TOTAL, output_format="xml")
+    with pytest.raises(InvalidOption):
+        iter_bulk_chunks(TOTAL, kind="navigator", output_format="text")
@@ -0,0 +1,127 @@
+# pylint: disable=missing-docstring
+import threading
+from random import Random
+
+import pytest
+
+from user_agent import InvalidOption, UserAgentCache
+from user_agent.base import convert_navigator_to_js
+
+
+class FakeClock:
+    def __init__(self):  # noqa: ANN204
+        # type: () -> None
+        self.now = 0.0
+
+    def __call__(self):  # noqa: ANN204
+        # type: () -> float
+        return self.now
+
+
+def make_cache(ttl=None, max_size=100, os=None, clock=None):
+    # type: (None | float, int, None | str, None | FakeClock) -> UserAgentCache
+    return UserAgentCache(
+        ttl=ttl,
+        max_size=max_size,
+        os=os,
+        rng=Random(1),  # noqa: S311
+        clock=clock or FakeClock(),
+    )
+
+
+def test_cache_returns_same_config():
+    # type: () -> None
+    cache = make_cache()
+    first = cache.navigator("a")
+    assert cache.navigator("a") == first
+    assert cache.user_agent("a") == first["user_agent"]
+    assert cache.navigator_js("a") == convert_navigator_to_js(first)
+    assert cache.navigator("b") != first
+    assert cache.stats() == {
+        "size": 2,
+        "hits": 3,
+        "misses": 2,
+        "evictions": 0,
+        "expirations": 0,
+    }
+
+
+def test_cache_returns_copies():
+    # type: () -> None
+    cache = make_cache()
+    cache.navigator("a")["user_agent"] = "foo"
+    cache.navigator_js("a")["userAgent"] = "foo"
+    assert cache.user_agent("a") != "foo"
+    assert cache.navigator_js("a")["userAgent"] != "foo"
+
+
+def test_cache_ttl():
+    # type: () -> None
+    clock = FakeClock()
+    cache = make_cache(ttl=10, clock=clock)
+    user_agents = {cache.user_agent("a")}
+    clock.now = 9.9
+    assert cache.user_agent("a") in user_agents
+    for idx in range(20):
+        clock.now = 10.0 * (idx + 1)
+        user_agents.add(cache.user_agent("a"))
+    assert len(user_agents) > 10  # noqa: PLR2004
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 20)
+
+
+def test_cache_lru_eviction():
+    # type: () -> None
+    cache = make_cache(max_size=2)
+    user_agent = cache.user_agent("a")
+    cache.user_agent("b")
+    cache.user_agent("a")
+    cache.user_agent("c")
+    assert len(cache) == 2  # noqa: PLR2004
+    assert cache.user_agent("a") == user_agent
+    assert cache.stats()["evictions"] == 1
+    cache.user_agent("b")
+    assert cache.stats()["misses"] == 4  # noqa: PLR2004
+
+
+def test_cache_invalidate_and_clear():
+    # type: () -> None
+    cache = make_cache()
+    cache.user_agent("a")
+    cache.user_agent("b")
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["misses"] == 2  # noqa: PLR2004
+
+
+def test_cache_options():
+    # type: () -> None
+    cache = make_cache(os="linux")
+    assert {cache.navigator(idx)["os_id"] for idx in range(20)} == {"linux"}
+    with pytest.raises(InvalidOption):
+        make_cache(os="dos")
+    with pytest.raises(ValueError, match="positive"):
+        make_cache(max_size=0)
+
+
+def test_cache_threads():
+    # type: () -> None
+    cache = make_cache(max_size=50)
+    results = []  # type: list[dict[int, str]]
+
+    def worker():
+        # type: () -> None
+        results.append({key: cache.user_agent(key) for key in range(40)})
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(result == results[0] for result in results)
+    stats = cache.stats()
+    assert stats["misses"] == 40  # noqa: PLR2004
+    assert stats["hits"] == 40 * 7
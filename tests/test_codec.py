@@ -0,0 +1,152 @@
+# pylint: disable=missing-docstring
+from array import array
+from random import Random
+
+import pytest
+
+from user_agent import (
+    NavigatorConfig,
+    UserAgentGenerator,
+    UserAgentSpace,
+    decode_navigator,
+    decode_navigators,
+    encode_navigator,
+    encode_navigators,
+    generate_navigator,
+)
+from user_agent.codec import (
+    CODE_ARRAY_TYPE,
+    CODE_INDEX_BITS,
+    CODE_VERSION,
+    get_code_space,
+)
+
+NUM_SAMPLES = 2000
+GOLDEN_CONFIGS = [
+    (
+        144115188801444539,
+        {
+            "os_id": "win",
+            "navigator_id": "ie",
+            "platform": "Windows NT 10.0; WOW64",
+            "oscpu": "Windows NT 10.0; WOW64",
+            "build_version": "MSIE 9.0",
+            "build_id": None,
+            "app_version": (
+                "5.0 (compatible; MSIE 9.0; Windows NT 10.0; WOW64; Trident/5.0)"
+            ),
+            "app_name": "Microsoft Internet Explorer",
+            "app_code_name": "Mozilla",
+            "product": "Gecko",
+            "product_sub": None,
+            "vendor": "",
+            "vendor_sub": "",
+            "user_agent": (
+                "Mozilla/5.0 (compatible; MSIE 9.0; Windows NT 10.0; WOW64;"
+                " Trident/5.0)"
+            ),
+        },
+    ),
+    (
+        144115189985642311,
+        {
+            "os_id": "android",
+            "navigator_id": "firefox",
+            "platform": "Linux armv7l",
+            "oscpu": "Linux armv7l",
+            "build_version": "47.0",
+            "build_id": "20160723003729",
+            "app_version": "5.0 (Android 5.1.1)",
+            "app_name": "Netscape",
+            "app_code_name": "Mozilla",
+            "product": "Gecko",
+            "product_sub": "20100101",
+            "vendor": "",
+            "vendor_sub": "",
+            "user_agent": (
+                "Mozilla/5.0 (Android 5.1.1; Tablet; rv:47.0) Gecko/47.0 Firefox/47.0"
+            ),
+        },
+    ),
+]
+
+
+def test_codec_roundtrip():
+    # type: () -> None
+    gen = UserAgentGenerator(device_type="all", rng=Random(1))  # noqa: S311
+    for config in gen.iter_navigators(NUM_SAMPLES):
+        code = encode_navigator(config)
+        assert 0 <= code < 2**64
+        assert code >> CODE_INDEX_BITS == CODE_VERSION
+        assert decode_navigator(code) == config
+
+
+def test_codes_are_stable():
+    # type: () -> None
+    # Change of these values means change of codes,
+    # CODE_VERSION must be increased then
+    for code, config in GOLDEN_CONFIGS:
+        assert encode_navigator(config) == code
+        assert decode_navigator(code) == config
+
+
+def test_codec_compact_config():
+    # type: () -> None
+    config = generate_navigator(device_type="all", rng=Random(2))  # noqa: S311
+    assert encode_navigator(NavigatorConfig(config)) == encode_navigator(config)
+
+
+def test_codec_arrays():
+    # type: () -> None
+    configs = UserAgentGenerator(device_type="all", rng=Random(3)).navigators(100)  # noqa: S311
+    codes = encode_navigators(configs)
+    if CODE_ARRAY_TYPE is not None:
+        assert isinstance(codes, array)
+        assert codes.itemsize == 8  # noqa: PLR2004
+    assert list(decode_navigators(codes)) == configs
+
+
+def test_space_navigator_index():
+    # type: () -> None
+    space = UserAgentSpace(device_type="all", mode="navigator")
+    rng = Random(4)  # noqa: S311
+    for _ in range(NUM_SAMPLES):
+        index = rng.randrange(len(space))
+        assert space.navigator_index(space.navigator(index)) == index
+    space = UserAgentSpace(device_type="all")
+    for index in range(0, len(space), 97):
+        assert space.navigator_index(space.navigator(index)) == index
+
+
+def test_space_navigator_index_not_in_space():
+    # type: () -> None
+    space = UserAgentSpace(os="win")
+    config = generate_navigator(os="linux", rng=Random(1))  # noqa: S311
+    with pytest.raises(ValueError, match="not in space"):
+        space.navigator_index(config)
+    config = generate_navigator(os="win", navigator="chrome", rng=Random(1))  # noqa: S311
+    with pytest.raises(ValueError, match="not in space"):
+        space.navigator_index(dict(config, user_agent="Lynx/2.8"))
+    user_agent = str(config["user_agent"])
+    user_agent = user_agent.replace(str(config["build_version"]), "1.2.3")
+    with pytest.raises(ValueError, match="Unknown item of build"):
+        space.navigator_index(
+            dict(config, user_agent=user_agent, build_version="1.2.3")
+        )
+
+
+def test_space_navigator_index_firefox_build():
+    # type: () -> None
+    config = generate_navigator(navigator="firefox", rng=Random(1))  # noqa: S311
+    space = get_code_space()
+    for build_id in ("20170124", "2017012410004x", "19990101000000"):
+        with pytest.raises(ValueError, match="Unknown firefox build"):
+            space.navigator_index(dict(config, build_id=build_id))
+
+
+def test_decode_invalid_code():
+    # type: () -> None
+    with pytest.raises(ValueError, match="version"):
+        decode_navigator(123)
+    with pytest.raises(ValueError, match="Invalid code"):
+        decode_navigator((CODE_VERSION << CODE_INDEX_BITS) | len(get_code_space()))
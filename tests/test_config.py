@@ -0,0 +1,83 @@
+# pylint: disable=missing-docstring
+import pickle
+from random import Random
+
+import pytest
+
+from user_agent import NavigatorConfig, UserAgentGenerator, generate_navigator
+from user_agent.base import convert_navigator_to_js
+from user_agent.config import INTERN_CACHE, NAVIGATOR_FIELDS, intern_value
+
+
+def test_config_is_mapping():
+    # type: () -> None
+    rng = Random(1)  # noqa: S311
+    for _ in range(100):
+        nav = generate_navigator(device_type="all", rng=rng)
+        config = NavigatorConfig(nav)
+        assert config == nav
+        assert config.to_dict() == nav
+        assert list(config) == list(NAVIGATOR_FIELDS)
+        assert dict(config.items()) == nav
+        assert config["user_agent"] == config.user_agent == nav["user_agent"]
+        assert config.get("build_id") == nav["build_id"]
+        assert config.to_js() == convert_navigator_to_js(nav)
+
+
+def test_config_unknown_key():
+    # type: () -> None
+    config = NavigatorConfig(generate_navigator(rng=Random(1)))  # noqa: S311
+    assert "foo" not in config
+    assert config.get("foo") is None
+    with pytest.raises(KeyError):
+        _ = config["foo"]
+    with pytest.raises(AttributeError):
+        config.foo = "bar"  # type: ignore[attr-defined]
+
+
+def test_config_is_read_only():
+    # type: () -> None
+    nav = generate_navigator(rng=Random(1))  # noqa: S311
+    config = NavigatorConfig(nav)
+    for key in ("user_agent", "app_code_name"):
+        with pytest.raises(AttributeError, match="read-only"):
+            setattr(config, key, "bar")
+        with pytest.raises(AttributeError, match="read-only"):
+            delattr(config, key)
+    assert config == nav
+
+
+def test_config_shares_strings():
+    # type: () -> None
+    gen = UserAgentGenerator(os="win", navigator="ie", rng=Random(1))  # noqa: S311
+    configs = gen.configs(200)
+    by_user_agent = {}  # type: dict[str | None, str | None]
+    for config in configs:
+        user_agent = by_user_agent.setdefault(config.user_agent, config.user_agent)
+        assert config.user_agent is user_agent
+
+
+def test_intern_cache_is_bounded(monkeypatch):
+    # type: (pytest.MonkeyPatch) -> None
+    monkeypatch.setattr("user_agent.config.INTERN_CACHE_SIZE", 10)
+    for idx in range(25):
+        assert intern_value(str(idx)) == str(idx)
+    assert len(INTERN_CACHE) <= 10  # noqa: PLR2004
+    assert intern_value(None) is None
+
+
+def test_config_pickle():
+    # type: () -> None
+    config = NavigatorConfig(generate_navigator(rng=Random(1)))  # noqa: S311
+    restored = pickle.loads(pickle.dumps(config))  # noqa: S301
+    assert isinstance(restored, NavigatorConfig)
+    assert restored == config
+
+
+def test_generator_configs():
+    # type: () -> None
+    gen = UserAgentGenerator(rng=Random(5))  # noqa: S311
+    expected = UserAgentGenerator(rng=Random(5)).navigators(20)  # noqa: S311
+    assert gen.configs(20) == expected
+    assert isinstance(gen.config(), NavigatorConfig)
+    assert len(list(gen.iter_configs(3))) == 3  # noqa: PLR2004
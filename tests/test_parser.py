@@ -0,0 +1,90 @@
+# pylint: disable=missing-docstring
+from random import Random
+
+from user_agent import (
+    UserAgentParser,
+    UserAgentSpace,
+    generate_navigator,
+    parse_user_agent,
+    parse_user_agents,
+)
+from user_agent.base import resolve_config_variants
+
+NUM_SAMPLES = 2000
+PARSED_KEYS = ("os_id", "navigator_id", "build_version", "platform", "oscpu")
+
+
+def test_parse_generated_navigators():
+    # type: () -> None
+    rng = Random(1)  # noqa: S311
+    for _ in range(NUM_SAMPLES):
+        nav = generate_navigator(device_type="all", rng=rng)
+        config = parse_user_agent(nav["user_agent"])  # type: ignore[arg-type]
+        assert config is not None
+        for key in PARSED_KEYS:
+            if nav["os_id"] == "android" and key in {"platform", "oscpu"}:
+                assert config[key] is None
+            else:
+                assert config[key] == nav[key]
+
+
+def test_parse_device_type():
+    # type: () -> None
+    for variant in resolve_config_variants(device_type="all"):
+        device_type, os_id, navigator_id = variant
+        space = UserAgentSpace(
+            device_type=device_type, os=os_id, navigator=navigator_id
+        )
+        for idx in (0, len(space) - 1):
+            config = parse_user_agent(space[idx])  # type: ignore[arg-type]
+            assert config is not None
+            assert (
+                config["device_type"],
+                config["os_id"],
+                config["navigator_id"],
+            ) == variant
+
+
+def test_parse_unknown():
+    # type: () -> None
+    for user_agent in (
+        "",
+        "curl/7.68.0",
+        (
+            "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X)"
+            " AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0"
+            " Mobile/15E148 Safari/604.1"
+        ),
+        (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            " (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0"
+        ),
+        "Mozilla/5.0 (Windows NT 6.1; rv:50.0) Gecko/20100101 Firefox/51.0",
+    ):
+        assert parse_user_agent(user_agent) is None
+
+
+def test_parser_cache():
+    # type: () -> None
+    parser = UserAgentParser(cache_size=2)
+    user_agents = [
+        generate_navigator(rng=Random(seed))["user_agent"] for seed in range(3)  # noqa: S311
+    ]
+    for user_agent in user_agents:
+        parser.parse(user_agent)  # type: ignore[arg-type]
+    assert list(parser.cache) == user_agents[1:]
+    config = parser.parse(user_agents[1])  # type: ignore[arg-type]
+    assert list(parser.cache) == [user_agents[2], user_agents[1]]
+    assert config is not None
+    config["os_id"] = "changed"
+    assert parser.parse(user_agents[1])["os_id"] != "changed"  # type: ignore[arg-type,index]
+    assert UserAgentParser(cache_size=0).parse(user_agents[0]) is not None  # type: ignore[arg-type]
+
+
+def test_parse_many():
+    # type: () -> None
+    lines = ["{}\n".format(ua) for ua in UserAgentSpace(os="win")[:10]] + ["zzz\n"]
+    configs = list(parse_user_agents(lines))
+    assert len(configs) == len(lines)
+    assert all(config is not None for config in configs[:-1])
+    assert configs[-1] is None
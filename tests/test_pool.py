@@ -0,0 +1,71 @@
+# pylint: disable=missing-docstring
+from random import Random
+
+import pytest
+
+from user_agent import (
+    InvalidOption,
+    PoolExhaustedError,
+    UserAgentPool,
+    UserAgentSpace,
+)
+
+TAKE_SIZE = 10
+
+
+def test_pool_items_are_distinct():
+    # type: () -> None
+    pool = UserAgentPool(os="mac", rng=Random(1))  # noqa: S311
+    items = pool.take(len(pool))
+    assert len(set(items)) == len(pool)
+    assert set(items) == set(UserAgentSpace(os="mac"))
+    assert pool.exhausted
+    assert pool.remaining == 0
+
+
+def test_pool_exhaustion():
+    # type: () -> None
+    pool = UserAgentPool(os="linux", navigator="firefox", rng=Random(1))  # noqa: S311
+    pool.take(len(pool) - 1)
+    assert pool.remaining == 1
+    with pytest.raises(PoolExhaustedError):
+        pool.take(2)
+    assert pool.remaining == 1
+    assert len(pool.take(1)) == 1
+    assert pool.take(0) == []
+    with pytest.raises(PoolExhaustedError):
+        pool.take(1)
+
+
+def test_pool_reset():
+    # type: () -> None
+    pool = UserAgentPool(rng=Random(1))  # noqa: S311
+    first = pool.take(TAKE_SIZE)
+    pool.reset()
+    assert pool.remaining == len(pool)
+    assert pool.take(TAKE_SIZE) != first
+
+
+def test_pool_seeded_order():
+    # type: () -> None
+    first = UserAgentPool(device_type="all", rng=Random(5))  # noqa: S311
+    second = UserAgentPool(device_type="all", rng=Random(5))  # noqa: S311
+    assert first.take(TAKE_SIZE) == second.take(TAKE_SIZE)
+
+
+def test_pool_iteration_and_navigators():
+    # type: () -> None
+    pool = UserAgentPool(os="win", navigator="ie", rng=Random(1))  # noqa: S311
+    navs = pool.take_navigators(TAKE_SIZE)
+    assert {nav["navigator_id"] for nav in navs} == {"ie"}
+    rest = list(pool)
+    assert len(rest) == len(pool) - TAKE_SIZE
+    assert not {nav["user_agent"] for nav in navs} & set(rest)
+
+
+def test_pool_invalid_options():
+    # type: () -> None
+    with pytest.raises(InvalidOption):
+        UserAgentPool(os="win", device_type="tablet")
+    with pytest.raises(ValueError, match="negative"):
+        UserAgentPool().take(-1)
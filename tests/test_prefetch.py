@@ -0,0 +1,115 @@
+# pylint: disable=missing-docstring
+import time
+from random import Random
+
+import pytest
+
+from user_agent import InvalidOption, PrefetchBuffer
+
+WAIT_TIMEOUT = 10
+
+
+def wait_refill(prefetch):
+    # type: (PrefetchBuffer) -> None
+    deadline = time.time() + WAIT_TIMEOUT
+    while prefetch.refill_pending:
+        assert time.time() < deadline
+        time.sleep(0.01)
+    assert len(prefetch) >= prefetch.low_water
+
+
+def test_prefetch_is_filled_in_constructor():
+    # type: () -> None
+    with PrefetchBuffer(size=50, batch_size=20, rng=Random(1)) as prefetch:  # noqa: S311
+        assert len(prefetch) == 50  # noqa: PLR2004
+        assert prefetch.stats()["refills"] == 3  # noqa: PLR2004
+        assert prefetch.get()["user_agent"]
+
+
+def test_prefetch_refills_in_thread():
+    # type: () -> None
+    with PrefetchBuffer(size=40, low_water=30, rng=Random(1)) as prefetch:  # noqa: S311
+        for _ in range(15):
+            prefetch.get()
+        wait_refill(prefetch)
+        stats = prefetch.stats()
+        assert stats["underruns"] == 0
+        assert stats["refills"] >= 2  # noqa: PLR2004
+        assert stats["refill_time"] > 0
+    assert prefetch.thread is None
+
+
+def test_prefetch_refills_in_executor():
+    # type: () -> None
+    # concurrent.futures is missing in python 2
+    futures = pytest.importorskip("concurrent.futures")
+    with futures.ThreadPoolExecutor(1) as executor:
+        prefetch = PrefetchBuffer(size=40, rng=Random(1), executor=executor)  # noqa: S311
+        assert prefetch.thread is None
+        for _ in range(30):
+            prefetch.get()
+        wait_refill(prefetch)
+        assert prefetch.stats()["refills"] >= 2  # noqa: PLR2004
+
+
+class FailingExecutor:
+    def __init__(self):  # noqa: ANN204
+        # type: () -> None
+        self.calls = 0
+
+    def submit(self, func):  # noqa: ARG002 pylint: disable=unused-argument
+        # type: (object) -> None
+        self.calls += 1
+        raise RuntimeError("cannot schedule new futures after shutdown")
+
+
+def test_prefetch_submit_error():
+    # type: () -> None
+    executor = FailingExecutor()
+    prefetch = PrefetchBuffer(  # type: ignore[arg-type]
+        size=4, low_water=4, rng=Random(1), executor=executor  # noqa: S311
+    )
+    with pytest.raises(RuntimeError):
+        prefetch.get()
+    assert not prefetch.refill_pending
+    with pytest.raises(RuntimeError):
+        prefetch.get()
+    assert executor.calls == 2  # noqa: PLR2004
+    prefetch.refill()
+    assert len(prefetch) == 4  # noqa: PLR2004
+
+
+def test_prefetch_generates_without_lock():
+    # type: () -> None
+    with PrefetchBuffer(size=4, rng=Random(1)) as prefetch:  # noqa: S311
+        navigators = prefetch.generator.navigators
+
+        def check_navigators(count):
+            # type: (int) -> list[dict[str, str | None]]
+            assert not prefetch.lock.locked()
+            return navigators(count)
+
+        prefetch.generator.navigators = check_navigators  # type: ignore[method-assign]
+        prefetch.buffer.clear()
+        prefetch.refill()
+        assert len(prefetch) == 4  # noqa: PLR2004
+
+
+def test_prefetch_underrun():
+    # type: () -> None
+    prefetch = PrefetchBuffer(size=5, rng=Random(1))  # noqa: S311
+    prefetch.close()
+    configs = [prefetch.get() for _ in range(8)]
+    assert all(config["user_agent"] for config in configs)
+    assert prefetch.stats()["underruns"] == 3  # noqa: PLR2004
+    assert len(prefetch) == 0
+
+
+def test_prefetch_options():
+    # type: () -> None
+    with PrefetchBuffer(size=20, os="mac", rng=Random(1)) as prefetch:  # noqa: S311
+        assert {prefetch.get()["os_id"] for _ in range(20)} == {"mac"}
+    with pytest.raises(InvalidOption):
+        PrefetchBuffer(os="dos")
+    with pytest.raises(ValueError, match="positive"):
+        PrefetchBuffer(size=0)
@@ -0,0 +1,187 @@
+# pylint: disable=missing-docstring
+import os
+import threading
+from collections import Counter
+from random import Random
+
+import pytest
+
+from user_agent import generate_navigator, generate_user_agents
+from user_agent.randomness import (
+    FORK_HOOK_INSTALLED,
+    BufferedSystemRandom,
+    ThreadLocalRandom,
+    derive_seed,
+)
+
+NUM_DRAWS = 5000
+
+
+def test_choice_covers_all_items():
+    # type: () -> None
+    rng = BufferedSystemRandom(buffer_size=64)
+    items = tuple(range(5))
+    counter = Counter(rng.choice(items) for _ in range(NUM_DRAWS))
+    assert set(counter) == set(items)
+    for count in counter.values():
+        assert count > NUM_DRAWS / len(items) / 2
+
+
+def test_bounded_integers():
+    # type: () -> None
+    rng = BufferedSystemRandom(buffer_size=64)
+    for high in (1, 7, 255, 256, 1000, 2**40, 2**70):
+        for _ in range(100):
+            assert 0 <= rng.randint(0, high) <= high
+    for _ in range(100):
+        assert 0.0 <= rng.random() < 1.0
+
+
+def test_empty_range():
+    # type: () -> None
+    rng = BufferedSystemRandom(buffer_size=64)
+    with pytest.raises(IndexError):
+        rng.choice([])
+    with pytest.raises(ValueError):  # noqa: PT011
+        rng.randrange(0)
+    assert rng.randrange(1) == 0
+
+
+def test_getrandbits():
+    # type: () -> None
+    rng = BufferedSystemRandom(buffer_size=64)
+    assert rng.getrandbits(0) == 0
+    for k in (1, 8, 9, 64, 65, 200):
+        assert 0 <= rng.getrandbits(k) < 2**k
+    with pytest.raises(ValueError, match="non-negative"):
+        rng.getrandbits(-1)
+
+
+def test_reset_and_refill():
+    # type: () -> None
+    rng = BufferedSystemRandom(buffer_size=16)
+    rng.read_bytes(10)
+    rng.reset()
+    assert len(rng.read_bytes(100)) == 100  # noqa: PLR2004
+
+
+def test_buffer_size():
+    # type: () -> None
+    rng = BufferedSystemRandom(buffer_size=13)
+    for k in (4, 64, 100):
+        for _ in range(10):
+            assert 0 <= rng.getrandbits(k) < 2**k
+    for size in (0, -8):
+        with pytest.raises(ValueError, match="Buffer size"):
+            BufferedSystemRandom(buffer_size=size)
+
+
+def test_no_state():
+    # type: () -> None
+    rng = BufferedSystemRandom()
+    rng.seed(1)
+    with pytest.raises(NotImplementedError):
+        rng.getstate()
+
+
+def test_generation_with_buffered_rng():
+    # type: () -> None
+    rng = BufferedSystemRandom()
+    nav = generate_navigator(device_type="all", rng=rng)
+    assert nav["user_agent"].startswith("Mozilla/5.0")
+    assert len(generate_user_agents(10, rng=rng)) == 10  # noqa: PLR2004
+
+
+def test_thread_local_reproducible():
+    # type: () -> None
+    assert generate_user_agents(5, rng=ThreadLocalRandom(1)) == generate_user_agents(
+        5, rng=ThreadLocalRandom(1)
+    )
+    assert generate_user_agents(5, rng=ThreadLocalRandom(1)) == generate_user_agents(
+        5,
+        rng=Random(derive_seed(1, 0)),  # noqa: S311
+    )
+    assert generate_user_agents(5, rng=ThreadLocalRandom(1)) != generate_user_agents(
+        5, rng=ThreadLocalRandom(2)
+    )
+
+
+def test_thread_local_threads_independent():
+    # type: () -> None
+    rng = ThreadLocalRandom("root")
+    results = {}
+
+    def worker(idx):
+        # type: (int) -> None
+        results[idx] = generate_user_agents(5, rng=rng)
+
+    for idx in range(3):
+        thread = threading.Thread(target=worker, args=(idx,))
+        thread.start()
+        thread.join()
+    for idx in range(3):
+        expected_rng = Random(derive_seed("root", idx))  # noqa: S311
+        assert results[idx] == generate_user_agents(5, rng=expected_rng)
+    assert len({tuple(items) for items in results.values()}) == 3  # noqa: PLR2004
+
+
+def test_thread_local_seed():
+    # type: () -> None
+    rng = ThreadLocalRandom(1)
+    first = [rng.random() for _ in range(5)]
+    rng.seed(1)
+    assert [rng.random() for _ in range(5)] == first
+    assert ThreadLocalRandom().random() != ThreadLocalRandom().random()
+    with pytest.raises(TypeError):
+        rng.seed(1.5)
+    with pytest.raises(NotImplementedError):
+        rng.getstate()
+
+
+def test_thread_local_seed_types():
+    # type: () -> None
+    # long and unicode on python 2
+    big_seed = 2**63 + 5
+    expected = Random(derive_seed(big_seed, 0)).random()  # noqa: S311
+    assert ThreadLocalRandom(big_seed).random() == expected
+    text_seed = b"root".decode("ascii")
+    expected = Random(derive_seed("root", 0)).random()  # noqa: S311
+    assert ThreadLocalRandom(text_seed).random() == expected
+
+
+def test_thread_local_methods():
+    # type: () -> None
+    rng = ThreadLocalRandom(1)
+    items = list(range(10))
+    rng.shuffle(items)
+    assert sorted(items) == list(range(10))
+    assert 0 <= rng.randint(0, 5) <= 5  # noqa: PLR2004
+    assert 0 <= rng.getrandbits(100) < 2**100
+    assert rng.choice("abc") in "abc"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork is not available")
+def test_thread_local_fork():
+    # type: () -> None
+    rng = ThreadLocalRandom(1)
+    parent_items = generate_user_agents(3, rng=rng)
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        os.write(write_fd, "\n".join(generate_user_agents(3, rng=rng)).encode())
+        os._exit(0)  # noqa: SLF001 pylint: disable=protected-access
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as inp:
+        child_items = inp.read().decode().split("\n")
+    os.waitpid(pid, 0)
+    # python without os.register_at_fork derives state from process id
+    path = ("fork", 1, 0) if FORK_HOOK_INSTALLED else ("pid", pid, 0)
+    assert child_items == generate_user_agents(
+        3,
+        rng=Random(derive_seed(1, *path)),  # noqa: S311
+    )
+    assert child_items != parent_items
+    # parent continues its own sequence
+    expected_rng = Random(derive_seed(1, 0))  # noqa: S311
+    expected = generate_user_agents(6, rng=expected_rng)
+    assert parent_items + generate_user_agents(3, rng=rng) == expected
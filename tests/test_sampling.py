@@ -0,0 +1,192 @@
+# pylint: disable=missing-docstring
+from collections import Counter
+from random import Random
+
+import pytest
+
+from user_agent import (
+    InvalidOption,
+    UserAgentGenerator,
+    base,
+    generate_navigator,
+    generate_user_agent,
+)
+from user_agent.sampling import AliasTable, RandomPermutation, build_alias_table
+
+NUM_DRAWS = 10000
+
+
+def test_alias_table_distribution():
+    # type: () -> None
+    weights = [1, 2, 3, 0, 4]
+    table = AliasTable("abcde", weights)
+    rng = Random(1)  # noqa: S311
+    counter = Counter(table.choice(rng) for _ in range(NUM_DRAWS))
+    assert "d" not in counter
+    for item, weight in zip("abcde", weights):
+        expected = NUM_DRAWS * weight / float(sum(weights))
+        assert abs(counter[item] - expected) < expected * 0.1 + 1
+
+
+def test_alias_table_single_item():
+    # type: () -> None
+    table = AliasTable(["x"], [5])
+    rng = Random(1)  # noqa: S311
+    assert {table.choice(rng) for _ in range(100)} == {"x"}
+
+
+def test_alias_table_invalid_weights():
+    # type: () -> None
+    with pytest.raises(ValueError, match="empty"):
+        build_alias_table([])
+    with pytest.raises(ValueError, match="negative"):
+        build_alias_table([1, -1])
+    with pytest.raises(ValueError, match="positive"):
+        build_alias_table([0, 0])
+    with pytest.raises(ValueError, match="Number of weights"):
+        AliasTable("ab", [1])
+
+
+def test_alias_table_one_random_call_per_draw():
+    # type: () -> None
+    table = AliasTable("abc", [1, 1, 2])
+    rng = Random(1)  # noqa: S311
+    expected_rng = Random(1)  # noqa: S311
+    for _ in range(100):
+        table.choice(rng)
+        expected_rng.random()
+    assert rng.random() == expected_rng.random()
+
+
+def test_os_weight(monkeypatch):
+    # type: (pytest.MonkeyPatch) -> None
+    monkeypatch.setattr(base, "OS_WEIGHT", {"win": 3, "linux": 1})
+    rng = Random(1)  # noqa: S311
+    counter = Counter(generate_navigator(rng=rng)["os_id"] for _ in range(2000))
+    assert set(counter) == {"win", "linux"}
+    assert 2.5 < counter["win"] / float(counter["linux"]) < 3.5  # noqa: PLR2004
+
+
+def test_navigator_weight_inside_os(monkeypatch):
+    # type: (pytest.MonkeyPatch) -> None
+    monkeypatch.setattr(base, "NAVIGATOR_WEIGHT", {"ie": 1})
+    rng = Random(1)  # noqa: S311
+    navs = {
+        (nav["os_id"], nav["navigator_id"])
+        for nav in (generate_navigator(rng=rng) for _ in range(500))
+    }
+    # os without weighted navigators falls back to uniform choice
+    assert ("win", "ie") in navs
+    assert ("win", "chrome") not in navs
+    assert ("mac", "chrome") in navs
+
+
+def test_all_weights_zero_is_uniform(monkeypatch):
+    # type: (pytest.MonkeyPatch) -> None
+    monkeypatch.setattr(base, "OS_WEIGHT", {"win": 1})
+    rng = Random(1)  # noqa: S311
+    oses = {generate_navigator(os="linux", rng=rng)["os_id"] for _ in range(10)}
+    assert oses == {"linux"}
+
+
+def test_platform_and_build_weights(monkeypatch):
+    # type: (pytest.MonkeyPatch) -> None
+    monkeypatch.setattr(base, "OS_PLATFORM_WEIGHT", {"win": {"Windows NT 10.0": 1}})
+    monkeypatch.setattr(base, "OS_CPU_WEIGHT", {"win": {"Win64; x64": 1}})
+    monkeypatch.setattr(base, "CHROME_BUILD_WEIGHT", {"86.0.4240.75": 1})
+    monkeypatch.setattr(base, "FIREFOX_VERSION_WEIGHT", {"50.0": 1})
+    monkeypatch.setattr(base, "IE_VERSION_WEIGHT", {11: 1})
+    rng = Random(1)  # noqa: S311
+    for _ in range(50):
+        assert generate_user_agent(os="win", navigator="chrome", rng=rng) == (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            " (KHTML, like Gecko) Chrome/86.0.4240.75 Safari/537.36"
+        )
+        nav = generate_navigator(os="win", navigator="firefox", rng=rng)
+        assert nav["build_version"] == "50.0"
+        nav = generate_navigator(os="win", navigator="ie", rng=rng)
+        assert nav["build_version"] == "MSIE 11.0"
+
+
+def test_generator_uses_weights(monkeypatch):
+    # type: (pytest.MonkeyPatch) -> None
+    monkeypatch.setattr(base, "NAVIGATOR_WEIGHT", {"firefox": 1})
+    gen = UserAgentGenerator(os="win", rng=Random(1))  # noqa: S311
+    assert {nav["navigator_id"] for nav in gen.navigators(100)} == {"firefox"}
+    assert {gen.navigator()["navigator_id"] for _ in range(10)} == {"firefox"}
+
+
+def test_weights_changed_in_place(monkeypatch):
+    # type: (pytest.MonkeyPatch) -> None
+    os_weight = {"win": 1, "linux": 0}
+    build_weight = {"86.0.4240.75": 1}
+    monkeypatch.setattr(base, "OS_WEIGHT", os_weight)
+    monkeypatch.setattr(base, "CHROME_BUILD_WEIGHT", build_weight)
+    rng = Random(1)  # noqa: S311
+    nav = generate_navigator(navigator="chrome", rng=rng)
+    assert nav["os_id"] == "win"
+    assert nav["build_version"] == "86.0.4240.75"
+    os_weight.update(win=0, linux=1)
+    build_weight.clear()
+    build_weight["85.0.4183.102"] = 1
+    base.set_weights()
+    for _ in range(10):
+        nav = generate_navigator(navigator="chrome", rng=rng)
+        assert nav["os_id"] == "linux"
+        assert nav["build_version"] == "85.0.4183.102"
+
+
+def test_set_weights(monkeypatch):
+    # type: (pytest.MonkeyPatch) -> None
+    # restore original weights after the test
+    monkeypatch.setattr(base, "OS_WEIGHT", None)
+    monkeypatch.setattr(base, "NAVIGATOR_WEIGHT", None)
+    base.set_weights(os={"mac": 1}, navigator={"firefox": 1})
+    assert base.OS_WEIGHT == {"mac": 1}
+    rng = Random(1)  # noqa: S311
+    nav = generate_navigator(rng=rng)
+    assert (nav["os_id"], nav["navigator_id"]) == ("mac", "firefox")
+    with pytest.raises(InvalidOption):
+        base.set_weights(mac={"10.8": 1})
+
+
+def test_generator_follows_weights_changes(monkeypatch):
+    # type: (pytest.MonkeyPatch) -> None
+    os_weight = {"win": 1, "linux": 0}
+    monkeypatch.setattr(base, "OS_WEIGHT", os_weight)
+    gen = UserAgentGenerator(rng=Random(1))  # noqa: S311
+    navs = gen.iter_navigators()
+    assert {next(navs)["os_id"] for _ in range(10)} == {"win"}
+    os_weight.update(win=0, linux=1)
+    base.set_weights()
+    assert {gen.navigator()["os_id"] for _ in range(10)} == {"linux"}
+    assert {next(navs)["os_id"] for _ in range(10)} == {"linux"}
+    monkeypatch.setattr(base, "OS_WEIGHT", {"mac": 1})
+    assert {nav["os_id"] for nav in gen.navigators(10)} == {"mac"}
+
+
+def test_weights_are_not_set_by_default():
+    # type: () -> None
+    rng = Random(7)  # noqa: S311
+    expected_rng = Random(7)  # noqa: S311
+    variants = base.resolve_config_variants(None, None, None)
+    for _ in range(20):
+        assert base.pick_config_ids(rng=rng) == expected_rng.choice(variants)
+
+
+def test_random_permutation_is_bijection():
+    # type: () -> None
+    for size in (0, 1, 2, 3, 7, 64, 65, 1000):
+        perm = RandomPermutation(size, Random(size))  # noqa: S311
+        assert sorted(perm[idx] for idx in range(size)) == list(range(size))
+    with pytest.raises(IndexError):
+        _ = RandomPermutation(3, Random(1))[3]  # noqa: S311
+
+
+def test_random_permutation_depends_on_rng():
+    # type: () -> None
+    first = RandomPermutation(100, Random(1))  # noqa: S311
+    second = RandomPermutation(100, Random(2))  # noqa: S311
+    same = RandomPermutation(100, Random(1))  # noqa: S311
+    assert [first[idx] for idx in range(100)] != [second[idx] for idx in range(100)]
+    assert [first[idx] for idx in range(100)] == [same[idx] for idx in range(100)]
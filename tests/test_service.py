@@ -0,0 +1,210 @@
+# pylint: disable=missing-docstring
+import json
+import threading
+from http.client import HTTPConnection
+from typing import Any, Iterator
+
+import pytest
+
+from user_agent import InvalidOption, PrefetchBuffer
+from user_agent.service import (
+    SERVICE_MAX_COUNT,
+    UNIX_SOCKETS_SUPPORTED,
+    UserAgentService,
+    UserAgentServiceClient,
+    make_server,
+    parse_service_address,
+)
+
+
+@pytest.fixture(name="service")
+def fixture_service():
+    # type: () -> Iterator[UserAgentService]
+    service = UserAgentService(size=20, batch_size=10)
+    yield service
+    service.close()
+
+
+def run_server(address, service):
+    # type: (str, UserAgentService) -> Any
+    server = make_server(address, service)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+@pytest.fixture(name="tcp_address")
+def fixture_tcp_address(service):
+    # type: (UserAgentService) -> Iterator[str]
+    server = run_server("127.0.0.1:0", service)
+    yield "127.0.0.1:{}".format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def test_parse_service_address():
+    # type: () -> None
+    assert parse_service_address("localhost:8000") == ("tcp", "localhost", 8000)
+    for address in ("localhost", "localhost:port", ":80"):
+        with pytest.raises(ValueError, match="Invalid address"):
+            parse_service_address(address)
+
+
+@pytest.mark.skipif(not UNIX_SOCKETS_SUPPORTED, reason="no unix sockets")
+def test_parse_unix_address():
+    # type: () -> None
+    assert parse_service_address("unix:/run/ua.sock") == ("unix", "/run/ua.sock", 0)
+    with pytest.raises(ValueError, match="Invalid address"):
+        parse_service_address("unix:")
+
+
+@pytest.mark.skipif(UNIX_SOCKETS_SUPPORTED, reason="unix sockets are supported")
+def test_unix_address_not_supported():
+    # type: () -> None
+    with pytest.raises(ValueError, match="not supported"):
+        parse_service_address("unix:/run/ua.sock")
+
+
+def test_handle_kinds(service):
+    # type: (UserAgentService) -> None
+    status, user_agent = service.handle("/user_agent", {"os": ["win"]})
+    assert status == 200  # noqa: PLR2004
+    assert "Windows" in user_agent
+    status, nav = service.handle("/navigator", {"navigator": ["firefox"]})
+    assert nav["navigator_id"] == "firefox"
+    status, nav_js = service.handle("/navigator_js", {})
+    assert "userAgent" in nav_js
+
+
+def test_handle_count(service):
+    # type: (UserAgentService) -> None
+    status, items = service.handle("/user_agent", {"count": ["30"]})
+    assert status == 200  # noqa: PLR2004
+    assert len(items) == 30  # noqa: PLR2004
+    for count in ("0", "-1", "x", str(SERVICE_MAX_COUNT + 1)):
+        status, data = service.handle("/user_agent", {"count": [count]})
+        assert status == 400  # noqa: PLR2004
+        assert "count" in data["error"]
+
+
+def test_handle_errors(service):
+    # type: (UserAgentService) -> None
+    status, data = service.handle("/user_agent", {"os": ["dos"]})
+    assert status == 400  # noqa: PLR2004
+    assert "error" in data
+    status, data = service.handle("/unknown", {})
+    assert status == 404  # noqa: PLR2004
+
+
+def test_handle_pool_per_options(service):
+    # type: (UserAgentService) -> None
+    service.handle("/user_agent", {"os": ["win,mac"]})
+    service.handle("/user_agent", {"os": ["mac,win"]})
+    service.handle("/user_agent", {"os": ["mac,win,mac"]})
+    service.handle("/user_agent", {"os": ["linux"]})
+    status, stats = service.handle("/stats", {})
+    assert status == 200  # noqa: PLR2004
+    assert sorted(pool["options"]["os"] for pool in stats["pools"]) == [
+        "linux",
+        "mac,win",
+    ]
+
+
+def test_pool_created_outside_service_lock(service, monkeypatch):
+    # type: (UserAgentService, pytest.MonkeyPatch) -> None
+    created = []
+    original_init = PrefetchBuffer.__init__
+
+    def check_init(self, *args, **kwargs):  # noqa: ANN002, ANN003
+        # type: (PrefetchBuffer, Any, Any) -> None
+        assert not service.lock.locked()
+        created.append(kwargs["os"])
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(PrefetchBuffer, "__init__", check_init)
+    threads = [
+        threading.Thread(target=service.handle, args=("/navigator", {"os": ["win"]}))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert created == [("win",)]
+    assert not service.pool_locks
+    status, _ = service.handle("/navigator", {"os": ["dos"]})
+    assert status == 400  # noqa: PLR2004
+    assert not service.pool_locks
+
+
+def test_default_options():
+    # type: () -> None
+    service = UserAgentService(size=10, os="mac")
+    try:
+        _, items = service.handle("/navigator", {"count": ["10"]})
+        assert {nav["os_id"] for nav in items} == {"mac"}
+        _, nav = service.handle("/navigator", {"os": ["linux"]})
+        assert nav["os_id"] == "linux"
+    finally:
+        service.close()
+
+
+def test_client_tcp(tcp_address):
+    # type: (str) -> None
+    client = UserAgentServiceClient(tcp_address)
+    try:
+        assert "Windows" in client.user_agent(os="win")
+        assert client.navigator(navigator=["chrome"])["navigator_id"] == "chrome"
+        assert "userAgent" in client.navigator_js()
+        assert len(client.navigators_js(5, device_type="smartphone")) == 5  # noqa: PLR2004
+        assert len(client.stats()["pools"]) == 4  # noqa: PLR2004
+        with pytest.raises(InvalidOption):
+            client.user_agent(os="dos")
+    finally:
+        client.close()
+
+
+def test_client_reconnects(tcp_address):
+    # type: (str) -> None
+    client = UserAgentServiceClient(tcp_address)
+    try:
+        client.user_agent()
+        # simulate connection closed by server
+        assert client.connection.sock is not None
+        client.connection.sock.close()
+        assert client.user_agent()
+    finally:
+        client.close()
+
+
+def test_raw_http(tcp_address):
+    # type: (str) -> None
+    host, port = tcp_address.split(":")
+    conn = HTTPConnection(host, int(port))
+    try:
+        conn.request("GET", "/navigator_js?os=android&count=2")
+        response = conn.getresponse()
+        assert response.status == 200  # noqa: PLR2004
+        assert response.getheader("Content-Type") == "application/json"
+        items = json.loads(response.read())
+        assert all("Android" in nav["userAgent"] for nav in items)
+    finally:
+        conn.close()
+
+
+@pytest.mark.skipif(not UNIX_SOCKETS_SUPPORTED, reason="no unix sockets")
+def test_unix_socket(tmp_path, service):
+    # type: (Any, UserAgentService) -> None
+    path = str(tmp_path / "ua.sock")
+    address = "unix:{}".format(path)
+    for _ in range(2):
+        # second server replaces socket file left by first one
+        server = run_server(address, service)
+        client = UserAgentServiceClient(address)
+        try:
+            assert "Mac OS" in client.user_agent(os="mac")
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,121 @@
+# pylint: disable=missing-docstring
+import os
+import sys
+import uuid
+from random import Random
+from subprocess import check_output  # nosec
+from typing import Any, Iterator
+
+import pytest
+
+from user_agent import (
+    InvalidOption,
+    SharedUserAgentPool,
+    attach_shared_pool,
+    create_shared_pool,
+    generate_navigators,
+    generate_navigators_js,
+)
+from user_agent.shared import SHARED_POOL_HEADER
+
+POOL_SIZE = 100
+
+
+@pytest.fixture(name="shm_pool")
+def fixture_shm_pool():
+    # type: () -> Iterator[SharedUserAgentPool]
+    # shared memory requires python 3.8+
+    pytest.importorskip("multiprocessing.shared_memory")
+    pool = create_shared_pool(
+        POOL_SIZE, name="ua_test_{}".format(uuid.uuid4().hex[:12]), rng=Random(1)  # noqa: S311
+    )
+    yield pool
+    pool.unlink()
+    pool.close()
+
+
+def test_shared_memory_pool(shm_pool):
+    # type: (SharedUserAgentPool) -> None
+    expected = generate_navigators(POOL_SIZE, rng=Random(1))  # noqa: S311
+    assert len(shm_pool) == POOL_SIZE
+    assert [shm_pool[idx] for idx in range(POOL_SIZE)] == expected
+    assert list(shm_pool) == expected
+    assert shm_pool.navigator(-1) == expected[-1]
+    assert shm_pool.user_agent(3) == expected[3]["user_agent"]
+    assert shm_pool.navigator_js(5) == generate_navigators_js(6, rng=Random(1))[5]  # noqa: S311
+    assert shm_pool.random_navigator(Random(1)) in expected  # noqa: S311
+    with pytest.raises(IndexError):
+        shm_pool.code(POOL_SIZE)
+
+
+def test_attach_shared_memory(shm_pool):
+    # type: (SharedUserAgentPool) -> None
+    assert shm_pool.name is not None
+    with attach_shared_pool(name=shm_pool.name) as pool:
+        assert len(pool) == POOL_SIZE
+        assert pool.navigator(10) == shm_pool.navigator(10)
+        with pytest.raises(TypeError):
+            pool.buffer[0] = 0
+
+
+def test_attach_in_other_process(shm_pool):
+    # type: (SharedUserAgentPool) -> None
+    code = (
+        "import sys;"
+        "from user_agent import attach_shared_pool;"
+        "pool = attach_shared_pool(name=sys.argv[1]);"
+        "print(pool.user_agent(7));"
+        "pool.close()"
+    )
+    assert shm_pool.name is not None
+    output = check_output([sys.executable, "-c", code, shm_pool.name])  # noqa: S603
+    assert output.decode("utf-8").strip() == shm_pool.user_agent(7)
+    # exit of attached process does not destroy the block
+    with attach_shared_pool(name=shm_pool.name) as pool:
+        assert pool.user_agent(7) == shm_pool.user_agent(7)
+
+
+def test_file_pool(tmp_path):
+    # type: (Any) -> None
+    path = str(tmp_path / "pool.bin")
+    with create_shared_pool(POOL_SIZE, path=path, os="win", rng=Random(1)) as pool:  # noqa: S311
+        assert pool.name is None
+        expected = generate_navigators(POOL_SIZE, os="win", rng=Random(1))  # noqa: S311
+        assert list(pool) == expected
+    assert os.path.getsize(path) == SHARED_POOL_HEADER.size + POOL_SIZE * 8
+    with attach_shared_pool(path=path) as pool:
+        assert pool.navigator(0) == expected[0]
+        pool.unlink()
+    assert not os.path.exists(path)
+
+
+def test_empty_pool(tmp_path):
+    # type: (Any) -> None
+    with create_shared_pool(0, path=str(tmp_path / "pool.bin")) as pool:
+        assert not list(pool)
+        with pytest.raises(IndexError):
+            pool.random_navigator()
+
+
+def test_invalid_pool_file(tmp_path):
+    # type: (Any) -> None
+    path = tmp_path / "pool.bin"
+    path.write_bytes(b"x" * 100)
+    with pytest.raises(ValueError, match="does not contain pool"):
+        attach_shared_pool(path=str(path))
+    create_shared_pool(10, path=str(path)).close()
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="truncated"):
+        attach_shared_pool(path=str(path))
+
+
+def test_invalid_arguments(tmp_path):
+    # type: (Any) -> None
+    with pytest.raises(ValueError, match="Exactly one"):
+        create_shared_pool(10)
+    with pytest.raises(ValueError, match="Exactly one"):
+        attach_shared_pool(name="ua", path="ua.bin")
+    with pytest.raises(ValueError, match="non-negative"):
+        create_shared_pool(-1, path=str(tmp_path / "pool.bin"))
+    with pytest.raises(InvalidOption):
+        create_shared_pool(10, path=str(tmp_path / "pool.bin"), os="dos")
@@ -0,0 +1,91 @@
+# pylint: disable=missing-docstring
+from itertools import islice
+from random import Random
+
+import pytest
+
+from user_agent import (
+    InvalidOption,
+    UserAgentSpace,
+    generate_navigator,
+    generate_user_agent,
+)
+from user_agent.base import CHROME_BUILD, IE_VERSION, OS_CPU, OS_PLATFORM
+
+NUM_SAMPLES = 500
+
+
+def test_space_size():
+    # type: () -> None
+    space = UserAgentSpace(os="win", navigator=("chrome", "ie"))
+    win_size = len(OS_PLATFORM["win"]) * len(OS_CPU["win"])
+    assert len(space) == win_size * (len(CHROME_BUILD) + len(IE_VERSION))
+
+
+def test_space_items_are_distinct():
+    # type: () -> None
+    space = UserAgentSpace(device_type="desktop")
+    items = list(space)
+    assert len(items) == len(space)
+    assert len(set(items)) == len(space)
+
+
+def test_generated_user_agents_belong_to_space():
+    # type: () -> None
+    rng = Random(1)  # noqa: S311
+    for opts in ({}, {"os": "android", "navigator": "firefox"}):
+        items = set(UserAgentSpace(**opts))  # type: ignore[arg-type]
+        for _ in range(NUM_SAMPLES):
+            assert generate_user_agent(rng=rng, **opts) in items
+
+
+def test_unrank_matches_iteration():
+    # type: () -> None
+    space = UserAgentSpace(device_type="all")
+    assert list(islice(space, 100)) == [space[idx] for idx in range(100)]
+    assert space[-1] == space[len(space) - 1]
+    assert space[10:13] == [space[10], space[11], space[12]]
+    with pytest.raises(IndexError):
+        space.user_agent(len(space))
+
+
+def test_navigator_mode():
+    # type: () -> None
+    space = UserAgentSpace(os="win", navigator="firefox", mode="navigator")
+    assert len(space) > len(UserAgentSpace(os="win", navigator="firefox"))
+    first = space.navigator(0)
+    last = space.navigator(-1)
+    assert first["build_id"] != last["build_id"]
+    assert set(first) == set(generate_navigator())
+    assert space.navigator_js(0)["buildID"] == first["build_id"]
+    assert next(space.iter_navigators()) == first
+
+
+def test_sample_is_distinct():
+    # type: () -> None
+    space = UserAgentSpace(os="mac")
+    items = space.sample(len(space), rng=Random(1))  # noqa: S311
+    assert len(set(items)) == len(space)
+    with pytest.raises(ValueError, match=r"[Ss]ample"):
+        space.sample(len(space) + 1)
+
+
+def test_sample_navigators_are_distinct():
+    # type: () -> None
+    space = UserAgentSpace(os="win", navigator="firefox", mode="navigator")
+    navs = space.sample_navigators(NUM_SAMPLES, rng=Random(1))  # noqa: S311
+    assert len({tuple(sorted(nav.items())) for nav in navs}) == NUM_SAMPLES
+    assert space.sample(NUM_SAMPLES, rng=Random(1)) == [  # noqa: S311
+        nav["user_agent"] for nav in navs
+    ]
+    # distinct configs which differ only in build time have same header
+    assert space.navigator(0) != space.navigator(1)
+    assert space.user_agent(0) == space.user_agent(1)
+
+
+def test_invalid_options():
+    # type: () -> None
+    with pytest.raises(InvalidOption):
+        UserAgentSpace(mode="zzz")
+    with pytest.raises(InvalidOption):
+        UserAgentSpace(os="win", navigator="ie", device_type="smartphone")
@@ -0,0 +1,93 @@
+# pylint: disable=missing-docstring
+import subprocess
+import sys
+from collections import Counter
+
+import pytest
+
+from user_agent import InvalidOption, navigator_for_key, user_agent_for_key
+from user_agent.sticky import get_key_variants
+
+NUM_KEYS = 3000
+
+
+def test_same_key_same_user_agent():
+    # type: () -> None
+    for idx in range(100):
+        key = "proxy-{}:account".format(idx)
+        assert user_agent_for_key(key) == user_agent_for_key(key)
+        assert navigator_for_key(key) == navigator_for_key(key)
+    assert user_agent_for_key("key") == user_agent_for_key(b"key")
+    text_key = b"\xd0\xba\xd0\xbb\xd1\x8e\xd1\x87".decode("utf-8")
+    assert user_agent_for_key(text_key) == user_agent_for_key(text_key.encode("utf-8"))
+
+
+def test_mapping_is_stable():
+    # type: () -> None
+    # Change of these values means change of mapping,
+    # KEY_MAPPING_VERSION must be increased then
+    assert user_agent_for_key("proxy-1:account-42") == (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.8; rv:48.0)"
+        " Gecko/20100101 Firefox/48.0"
+    )
+    assert user_agent_for_key(b"key", os="win", navigator="firefox") == (
+        "Mozilla/5.0 (Windows NT 6.2; rv:46.0) Gecko/20100101 Firefox/46.0"
+    )
+    assert navigator_for_key("abc", device_type="all")["user_agent"] == (
+        "Mozilla/5.0 (Android 5.0; Mobile; rv:48.0) Gecko/48.0 Firefox/48.0"
+    )
+
+
+def test_variants_order_is_frozen():
+    # type: () -> None
+    # Variants are selected by index, their order is part of mapping
+    variants = get_key_variants(device_type="all")
+    assert [(x.device_type, x.os_id, x.navigator_id) for x in variants] == [
+        ("desktop", "linux", "chrome"),
+        ("desktop", "linux", "firefox"),
+        ("desktop", "mac", "chrome"),
+        ("desktop", "mac", "firefox"),
+        ("desktop", "win", "chrome"),
+        ("desktop", "win", "firefox"),
+        ("desktop", "win", "ie"),
+        ("smartphone", "android", "chrome"),
+        ("smartphone", "android", "firefox"),
+        ("tablet", "android", "chrome"),
+        ("tablet", "android", "firefox"),
+    ]
+
+
+def test_mapping_does_not_depend_on_process():
+    # type: () -> None
+    code = "from user_agent import user_agent_for_key; print(user_agent_for_key('k'))"
+    outputs = {
+        subprocess.check_output(  # noqa: S603
+            [sys.executable, "-c", code], env={"PYTHONHASHSEED": str(seed)}
+        )
+        for seed in (1, 2)
+    }
+    assert len(outputs) == 1
+    assert outputs.pop().decode().strip() == user_agent_for_key("k")
+
+
+def test_keys_are_spread_over_variants():
+    # type: () -> None
+    counter = Counter(
+        navigator_for_key("key-{}".format(idx))["navigator_id"]
+        for idx in range(NUM_KEYS)
+    )
+    # chrome is in 3 of 7 desktop variants: win 3, mac 2, linux 2
+    assert abs(counter["chrome"] * 7 / 3.0 - NUM_KEYS) < 0.1 * NUM_KEYS
+    user_agents = {user_agent_for_key("key-{}".format(idx)) for idx in range(100)}
+    assert len(user_agents) > 90  # noqa: PLR2004
+
+
+def test_options():
+    # type: () -> None
+    for idx in range(50):
+        nav = navigator_for_key(str(idx), os="linux", navigator="chrome")
+        assert (nav["os_id"], nav["navigator_id"]) == ("linux", "chrome")
+    with pytest.raises(InvalidOption):
+        user_agent_for_key("key", os="dos")
+    with pytest.raises(TypeError):
+        user_agent_for_key(42)  # type: ignore[arg-type]
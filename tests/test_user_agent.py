@@ -1,22 +1,34 @@
 # pylint: disable=missing-docstring
+import calendar
+import csv
 import json
 import re
+import sys
 from copy import deepcopy
-from datetime import datetime
+from random import Random
 from subprocess import check_output  # nosec
+from typing import Any
 
 import pytest
-import pytz
 
 import user_agent.base
 from user_agent import (
     InvalidOption,
+    UserAgentGenerator,
     generate_navigator,
     generate_navigator_js,
+    generate_navigators,
+    generate_navigators_js,
     generate_user_agent,
+    generate_user_agents,
+    iter_navigators,
+    iter_navigators_js,
+    iter_user_agents,
 )
+from user_agent.randomness import BufferedSystemRandom
 
 FIREFOX_BUILD_ID = 14
+BATCH_SIZE = 50
 
 
 def test_it():
@@ -187,6 +199,56 @@ def test_ua_script_extended():
         assert "Chrome" in data["userAgent"]
 
 
+def test_ua_script_seed():
+    # type: () -> None
+    outputs = [
+        check_output("ua -e --seed 7", shell=True).decode("utf-8")  # noqa: S602,S607
+        for _ in range(2)
+    ]
+    assert outputs[0] == outputs[1]
+    assert "userAgent" in json.loads(outputs[0])
+
+
+def test_ua_script_bulk_text():
+    # type: () -> None
+    out = check_output(  # noqa: S602
+        "ua -o linux -n chrome -c 20", shell=True  # noqa: S607
+    ).decode("utf-8")
+    lines = out.splitlines()
+    assert len(lines) == 20  # noqa: PLR2004
+    for line in lines:
+        assert re.match("^Mozilla.*Linux.*Chrome", line)
+
+
+def test_ua_script_bulk_jsonl_seed():
+    # type: () -> None
+    outputs = [
+        check_output(  # noqa: S602
+            "ua -c 20 -f jsonl --seed 1 -p {}".format(processes),
+            shell=True,  # noqa: S607
+        ).decode("utf-8")
+        for processes in (1, 2)
+    ]
+    assert outputs[0] == outputs[1]
+    navs = [json.loads(line) for line in outputs[0].splitlines()]
+    assert len(navs) == 20  # noqa: PLR2004
+    assert "userAgent" in navs[0]
+
+
+def test_ua_script_bulk_csv_output_file(tmp_path):
+    # type: (Any) -> None
+    path = tmp_path / "out.csv"
+    check_output(  # noqa: S602
+        "ua -c 5 -f csv -n firefox --output {}".format(path), shell=True  # noqa: S607
+    )
+    with path.open() as inp:
+        rows = list(csv.DictReader(inp))
+    assert len(rows) == 5  # noqa: PLR2004
+    for row in rows:
+        assert "Firefox" in row["userAgent"]
+        assert len(row["buildID"]) == FIREFOX_BUILD_ID
+
+
 def test_feature_platform():
     # type: () -> None
     for _ in range(50):
@@ -255,8 +317,8 @@ def test_build_id_firefox():
     # type: () -> None
     orig_ff_ver = deepcopy(user_agent.base.FIREFOX_VERSION)
     user_agent.base.FIREFOX_VERSION = [
-        ("49.0", datetime(2016, 9, 20, tzinfo=pytz.utc)),
-        ("50.0", datetime(2016, 11, 15, tzinfo=pytz.utc)),
+        ("49.0", calendar.timegm((2016, 9, 20, 0, 0, 0))),
+        ("50.0", calendar.timegm((2016, 11, 15, 0, 0, 0))),
     ]
     try:
         for _ in range(50):
@@ -265,11 +327,8 @@ def test_build_id_firefox():
             if "50.0" in nav["user_agent"]:
                 assert nav["build_id"].startswith("20161115")
             else:
-                time_ = datetime.strptime(nav["build_id"], "%Y%m%d%H%M%S").replace(
-                    tzinfo=pytz.utc
-                )
-                assert datetime(2016, 9, 20, 0, tzinfo=pytz.utc) <= time_
-                assert time_ < datetime(2016, 11, 15, tzinfo=pytz.utc)
+                # build id is formatted as %Y%m%d%H%M%S
+                assert "20160920000000" <= nav["build_id"] < "20161115000000"
     finally:
         user_agent.base.FIREFOX_VERSION = orig_ff_ver
 
@@ -338,3 +397,230 @@ def test_device_type_smartphone_chrome():
         assert "Mobile" in agent
         agent = generate_user_agent(device_type="tablet", navigator="chrome")
         assert "Mobile" not in agent
+
+
+def test_generate_user_agents():
+    # type: () -> None
+    agents = generate_user_agents(BATCH_SIZE, os="linux", navigator="chrome")
+    assert len(agents) == BATCH_SIZE
+    for agent in agents:
+        assert re.match("^Mozilla.*Linux.*Chrome", agent)
+
+
+def test_generate_navigators():
+    # type: () -> None
+    navs = generate_navigators(BATCH_SIZE, device_type="all")
+    assert len(navs) == BATCH_SIZE
+    for nav in navs:
+        assert set(nav.keys()) == set(generate_navigator().keys())
+    assert not generate_navigators(0)
+
+
+def test_generate_navigators_js():
+    # type: () -> None
+    for nav in generate_navigators_js(50, navigator="chrome"):
+        assert ("Mozilla/" + nav["appVersion"]) == nav["userAgent"]
+
+
+def test_generate_batch_invalid_option():
+    # type: () -> None
+    with pytest.raises(InvalidOption):
+        generate_user_agents(10, os="dos")
+    with pytest.raises(InvalidOption):
+        generate_navigators(10, os="linux", navigator="ie")
+
+
+def test_config_variants_cache():
+    # type: () -> None
+    variants = user_agent.base.resolve_config_variants(None, ["win", "linux"], None)
+    assert variants is user_agent.base.resolve_config_variants(
+        None, ("win", "linux"), None
+    )
+    assert variants == user_agent.base.build_config_variants(
+        None, ("win", "linux"), None
+    )
+    assert user_agent.base.resolve_config_variants(
+        "desktop", "win", "ie"
+    ) == user_agent.base.resolve_config_variants(("desktop",), ("win",), ["ie"])
+
+
+def test_config_variants_cache_invalid_option():
+    # type: () -> None
+    for _ in range(2):
+        with pytest.raises(InvalidOption):
+            user_agent.base.resolve_config_variants(None, "linux", "ie")
+        with pytest.raises(InvalidOption):
+            user_agent.base.resolve_config_variants(None, [["win"]], None)
+
+
+def test_seeded_rng():
+    # type: () -> None
+    for func in (generate_user_agent, generate_navigator, generate_navigator_js):
+        results = [func(device_type="all", rng=Random(42)) for _ in range(2)]  # noqa: S311
+        assert results[0] == results[1]
+    assert generate_navigators(
+        BATCH_SIZE, device_type="all", rng=Random(1)  # noqa: S311
+    ) == generate_navigators(BATCH_SIZE, device_type="all", rng=Random(1))  # noqa: S311
+    assert generate_user_agents(
+        BATCH_SIZE, device_type="all", rng=Random(1)  # noqa: S311
+    ) != generate_user_agents(BATCH_SIZE, device_type="all", rng=Random(2))  # noqa: S311
+
+
+def test_device_data_lazy_loading():
+    # type: () -> None
+    code = (
+        "import user_agent, user_agent.device as dev;"
+        "user_agent.generate_user_agents(100, device_type='desktop');"
+        "assert not dev.DATA_CACHE;"
+        "user_agent.generate_user_agent(os='android', navigator='chrome');"
+        "assert list(dev.DATA_CACHE) == [dev.SMARTPHONE_DEV_IDS_LOCATION];"
+        "assert dev.TABLET_DEV_IDS is dev.get_tablet_dev_ids()"
+    )
+    check_output([sys.executable, "-c", code])  # noqa: S603
+
+
+def test_lazy_exports():
+    # type: () -> None
+    for name in user_agent.__all__:
+        assert getattr(user_agent, name) is not None
+    assert user_agent.UserAgentParser is user_agent.parser.UserAgentParser
+    with pytest.raises(AttributeError):
+        user_agent.missing_name  # noqa: B018 # pylint: disable=pointless-statement
+
+
+def test_import_does_not_load_heavy_modules():
+    # type: () -> None
+    # random is required by the package, python 2 version of it loads hashlib
+    code = (
+        "import sys, random;"
+        "before = set(sys.modules);"
+        "import user_agent;"
+        "loaded = set(sys.modules) - before;"
+        "heavy = {'typing', 'datetime', 'json', 'pytz', 'six',"
+        " 're', 'hashlib', 'threading', 'mmap'};"
+        "assert not loaded & heavy, loaded"
+    )
+    check_output([sys.executable, "-c", code])  # noqa: S603
+
+
+def test_firefox_build_table():
+    # type: () -> None
+    table = user_agent.base.build_firefox_build_table(
+        [
+            ("49.0", calendar.timegm((2016, 9, 20, 0, 0, 0))),
+            ("50.0", calendar.timegm((2016, 9, 22, 12, 0, 0))),
+        ]
+    )
+    assert table == [
+        ("49.0", 0, 86400 * 2 + 43200, ["20160920", "20160921", "20160922"]),
+        ("50.0", 43200, 86400, ["20160922", "20160923"]),
+    ]
+    assert user_agent.base.get_firefox_build_table() is (
+        user_agent.base.get_firefox_build_table()
+    )
+
+
+def test_compiled_ua_templates():
+    # type: () -> None
+    system = {"ua_platform": "X11; Linux x86_64"}
+    app = {"build_version": "51.0", "geckotrail": "20100101", "trident_version": "7.0"}
+    for tpl_name, template in user_agent.base.USER_AGENT_TEMPLATE.items():
+        render = user_agent.base.get_ua_renderer(tpl_name)
+        assert render(
+            system["ua_platform"],
+            app["build_version"],
+            app["geckotrail"],
+            app["trident_version"],
+        ) == template.format(system=system, app=app)
+    render = user_agent.base.compile_ua_template("100% {app[build_version]}")
+    assert render("", "1.0") == "100% 1.0"
+    with pytest.raises(ValueError, match="Unknown field"):
+        user_agent.base.compile_ua_template("{app[foo]}")
+
+
+def test_iter_user_agents():
+    # type: () -> None
+    agents = iter_user_agents(os="linux", navigator="chrome")
+    for _ in range(BATCH_SIZE):
+        assert re.match("^Mozilla.*Linux.*Chrome", next(agents))
+    assert len(list(iter_user_agents(BATCH_SIZE))) == BATCH_SIZE
+
+
+def test_iter_navigators():
+    # type: () -> None
+    navs = list(iter_navigators(BATCH_SIZE, device_type="all"))
+    assert len(navs) == BATCH_SIZE
+    for nav in navs:
+        assert set(nav.keys()) == set(generate_navigator().keys())
+    for nav in iter_navigators_js(BATCH_SIZE, navigator="chrome"):
+        assert ("Mozilla/" + nav["appVersion"]) == nav["userAgent"]
+
+
+def test_iter_seeded():
+    # type: () -> None
+    assert list(iter_navigators(BATCH_SIZE, rng=Random(1))) == (  # noqa: S311
+        generate_navigators(BATCH_SIZE, rng=Random(1))  # noqa: S311
+    )
+
+
+def test_batch_matches_single_calls():
+    # type: () -> None
+    for options in (
+        {"os": "win", "navigator": "chrome"},
+        {"device_type": "all"},
+        {"os": ("linux", "mac")},
+    ):
+        rng = Random(5)  # noqa: S311
+        expected = [generate_user_agent(rng=rng, **options) for _ in range(5)]
+        rng = Random(5)  # noqa: S311
+        assert generate_user_agents(5, rng=rng, **options) == expected
+        rng = Random(5)  # noqa: S311
+        gen = UserAgentGenerator(rng=rng, **options)
+        assert [gen.user_agent() for _ in range(5)] == expected
+
+
+def test_generator_buffers_system_entropy():
+    # type: () -> None
+    gen = UserAgentGenerator()
+    assert isinstance(gen.rng, BufferedSystemRandom)
+    assert len(set(gen.user_agents(BATCH_SIZE))) > 1
+
+
+def test_iter_invalid_option():
+    # type: () -> None
+    # options are validated on call, not on first item
+    with pytest.raises(InvalidOption):
+        iter_user_agents(os="dos")
+    with pytest.raises(InvalidOption):
+        iter_navigators_js(os="linux", navigator="ie")
+
+
+def test_user_agent_generator():
+    # type: () -> None
+    gen = UserAgentGenerator(os="linux", navigator="chrome")
+    assert gen.variants == (("desktop", "linux", "chrome"),)
+    assert re.match("^Mozilla.*Linux.*Chrome", gen.user_agent())
+    assert gen.navigator()["navigator_id"] == "chrome"
+    assert gen.navigator_js()["vendor"] == "Google Inc."
+    assert len(gen.user_agents(BATCH_SIZE)) == BATCH_SIZE
+    assert len(gen.navigators(BATCH_SIZE)) == BATCH_SIZE
+    assert len(gen.navigators_js(BATCH_SIZE)) == BATCH_SIZE
+    agents = gen.iter_user_agents()
+    for _ in range(BATCH_SIZE):
+        assert "Chrome" in next(agents)
+
+
+def test_user_agent_generator_seeded():
+    # type: () -> None
+    gens = [
+        UserAgentGenerator(device_type="all", rng=Random(7))  # noqa: S311
+        for _ in range(2)
+    ]
+    assert gens[0].navigators(BATCH_SIZE) == gens[1].navigators(BATCH_SIZE)
+    assert gens[0].user_agent() == gens[1].user_agent()
+
+
+def test_user_agent_generator_invalid_option():
+    # type: () -> None
+    with pytest.raises(InvalidOption):
+        UserAgentGenerator(os="linux", navigator="ie")
@@ -1,5 +1,103 @@
-from .base import generate_navigator, generate_navigator_js, generate_user_agent
+# pylint: disable=duplicate-code
+from .base import (
+    UserAgentGenerator,
+    generate_navigator,
+    generate_navigator_js,
+    generate_navigators,
+    generate_navigators_js,
+    generate_user_agent,
+    generate_user_agents,
+    iter_navigators,
+    iter_navigators_js,
+    iter_user_agents,
+)
+from .compat import enable_module_getattr
+from .config import NavigatorConfig
 from .error import *  # noqa: F403 pylint: disable=wildcard-import
 
+# Do not import typing at runtime, it slows down importing of the package
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+    from .cache import UserAgentCache
+    from .codec import (
+        decode_navigator,
+        decode_navigators,
+        encode_navigator,
+        encode_navigators,
+    )
+    from .parser import UserAgentParser, parse_user_agent, parse_user_agents
+    from .pool import UserAgentPool
+    from .prefetch import PrefetchBuffer
+    from .shared import SharedUserAgentPool, attach_shared_pool, create_shared_pool
+    from .space import UserAgentSpace
+    from .sticky import navigator_for_key, user_agent_for_key
+
 __version__ = "0.1.14"  # type: str
-__all__ = ["generate_navigator", "generate_navigator_js", "generate_user_agent"]
+__all__ = [
+    "NavigatorConfig",
+    "PrefetchBuffer",
+    "SharedUserAgentPool",
+    "UserAgentCache",
+    "UserAgentGenerator",
+    "UserAgentParser",
+    "UserAgentPool",
+    "UserAgentSpace",
+    "attach_shared_pool",
+    "create_shared_pool",
+    "decode_navigator",
+    "decode_navigators",
+    "encode_navigator",
+    "encode_navigators",
+    "generate_navigator",
+    "generate_navigator_js",
+    "generate_navigators",
+    "generate_navigators_js",
+    "generate_user_agent",
+    "generate_user_agents",
+    "iter_navigators",
+    "iter_navigators_js",
+    "iter_user_agents",
+    "navigator_for_key",
+    "parse_user_agent",
+    "parse_user_agents",
+    "user_agent_for_key",
+]
+
+# Names exported from submodules which are imported on first access,
+# the submodules load standard modules which are slow to import
+LAZY_ATTRIBUTES = {
+    "PrefetchBuffer": "prefetch",
+    "SharedUserAgentPool": "shared",
+    "UserAgentCache": "cache",
+    "UserAgentParser": "parser",
+    "UserAgentPool": "pool",
+    "UserAgentSpace": "space",
+    "attach_shared_pool": "shared",
+    "create_shared_pool": "shared",
+    "decode_navigator": "codec",
+    "decode_navigators": "codec",
+    "encode_navigator": "codec",
+    "encode_navigators": "codec",
+    "navigator_for_key": "sticky",
+    "parse_user_agent": "parser",
+    "parse_user_agents": "parser",
+    "user_agent_for_key": "sticky",
+}  # type: dict[str, str]
+
+
+def __getattr__(name):
+    # type: (str) -> Any
+    """Import submodule on first access to name exported from it."""
+    module_name = LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    from importlib import import_module  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    value = getattr(import_module("." + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+enable_module_getattr(__name__)
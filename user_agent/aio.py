@@ -0,0 +1,255 @@
+"""Asyncio interface of generation functions.
+
+Generation runs in executor, so even bulk generation and loading of data
+tables on first use do not block event loop::
+
+    user_agent = await agenerate_user_agent(os="win")
+    async for config in aiter_navigators_js(1000):
+        ...
+
+The module requires python 3.6+, it is not imported by `user_agent` package.
+"""
+
+import asyncio
+from functools import partial
+
+from .base import (
+    UserAgentGenerator,
+    generate_navigator,
+    generate_navigator_js,
+    generate_user_agent,
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias,consider-alternative-union-syntax
+    from concurrent.futures import Executor
+    from random import Random
+    from typing import (
+        Any,
+        AsyncIterator,
+        Callable,
+        Dict,
+        Iterator,
+        List,
+        Optional,
+        Sequence,
+        TypeVar,
+    )
+
+    NavigatorDict = Dict[str, Optional[str]]
+    T = TypeVar("T")
+    # pylint: enable=deprecated-typing-alias,consider-alternative-union-syntax
+
+__all__ = [
+    "agenerate_navigator",
+    "agenerate_navigator_js",
+    "agenerate_user_agent",
+    "aiter_navigators",
+    "aiter_navigators_js",
+    "aiter_user_agents",
+]
+
+AIO_BATCH_SIZE = 256
+# asyncio.get_running_loop is missing in python 3.6
+get_running_loop = getattr(
+    asyncio, "get_running_loop", asyncio.get_event_loop
+)  # type: Callable[[], asyncio.AbstractEventLoop]
+
+
+def run_in_executor(executor, func):
+    # type: (None | Executor, Callable[[], T]) -> asyncio.Future[T]
+    return get_running_loop().run_in_executor(executor, func)
+
+
+async def agenerate_navigator(
+    os=None,  # type: None | str
+    navigator=None,  # type: None | str
+    device_type=None,  # type: None | str
+    rng=None,  # type: None | Random
+    executor=None,  # type: None | Executor
+):
+    # type: (...) -> NavigatorDict
+    """Generate web navigator's config in executor, see `generate_navigator`.
+
+    :param executor: `concurrent.futures.Executor`, default executor of
+        event loop by default
+    """
+    return await run_in_executor(
+        executor,
+        partial(
+            generate_navigator,
+            os=os,
+            navigator=navigator,
+            device_type=device_type,
+            rng=rng,
+        ),
+    )
+
+
+async def agenerate_navigator_js(
+    os=None,  # type: None | str
+    navigator=None,  # type: None | str
+    device_type=None,  # type: None | str
+    rng=None,  # type: None | Random
+    executor=None,  # type: None | Executor
+):
+    # type: (...) -> NavigatorDict
+    """Generate config for `windows.navigator` in executor.
+
+    See `generate_navigator_js` and `agenerate_navigator`.
+    """
+    return await run_in_executor(
+        executor,
+        partial(
+            generate_navigator_js,
+            os=os,
+            navigator=navigator,
+            device_type=device_type,
+            rng=rng,
+        ),
+    )
+
+
+async def agenerate_user_agent(
+    os=None,  # type: None | str
+    navigator=None,  # type: None | str
+    device_type=None,  # type: None | str
+    rng=None,  # type: None | Random
+    executor=None,  # type: None | Executor
+):
+    # type: (...) -> str
+    """Generate User-Agent header in executor.
+
+    See `generate_user_agent` and `agenerate_navigator`.
+    """
+    return await run_in_executor(
+        executor,
+        partial(
+            generate_user_agent,
+            os=os,
+            navigator=navigator,
+            device_type=device_type,
+            rng=rng,
+        ),
+    )
+
+
+def iter_batch_sizes(count, batch_size):
+    # type: (None | int, int) -> Iterator[int]
+    """Yield sizes of batches of `count` items, infinitely if count is None."""
+    if count is None:
+        while True:
+            yield batch_size
+    for start in range(0, count, batch_size):
+        yield min(batch_size, count - start)
+
+
+async def aiter_batches(
+    method_name,  # type: str
+    count,  # type: None | int
+    generator_options,  # type: Dict[str, Any]
+    batch_size,  # type: int
+    executor,  # type: None | Executor
+):
+    # type: (...) -> AsyncIterator[Any]
+    """Yield items generated by batches in executor.
+
+    Next batch is generated while items of current batch are consumed.
+
+    :param method_name: name of `UserAgentGenerator` method which accepts
+        number of items and returns list of them
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive")
+    generator = await run_in_executor(
+        executor, partial(UserAgentGenerator, **generator_options)
+    )
+    method = getattr(generator, method_name)  # type: Callable[[int], List[Any]]
+    pending = None  # type: None | asyncio.Future[List[Any]]
+    for size in iter_batch_sizes(count, batch_size):
+        if pending is None:
+            pending = run_in_executor(executor, partial(method, size))
+            continue
+        batch = await pending
+        # generate next batch while items of current one are consumed
+        pending = run_in_executor(executor, partial(method, size))
+        for item in batch:
+            yield item
+    if pending is not None:
+        for item in await pending:
+            yield item
+
+
+def aiter_navigators(  # pylint: disable=too-many-positional-arguments
+    count=None,  # type: None | int
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+    rng=None,  # type: None | Random
+    batch_size=AIO_BATCH_SIZE,  # type: int
+    executor=None,  # type: None | Executor
+):
+    # type: (...) -> AsyncIterator[NavigatorDict]
+    """Return async iterator yielding web navigator's configs.
+
+    Configs are generated in executor by batches of `batch_size` items,
+    see `iter_navigators`. Options are validated in executor when
+    iteration starts.
+
+    :param count: number of configs to yield, by default the iterator
+        is infinite
+    """
+    return aiter_batches(
+        "navigators",
+        count,
+        {"os": os, "navigator": navigator, "device_type": device_type, "rng": rng},
+        batch_size,
+        executor,
+    )
+
+
+def aiter_navigators_js(  # pylint: disable=too-many-positional-arguments
+    count=None,  # type: None | int
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+    rng=None,  # type: None | Random
+    batch_size=AIO_BATCH_SIZE,  # type: int
+    executor=None,  # type: None | Executor
+):
+    # type: (...) -> AsyncIterator[NavigatorDict]
+    """Return async iterator yielding configs for `windows.navigator`.
+
+    Accepts same options as `aiter_navigators`.
+    """
+    return aiter_batches(
+        "navigators_js",
+        count,
+        {"os": os, "navigator": navigator, "device_type": device_type, "rng": rng},
+        batch_size,
+        executor,
+    )
+
+
+def aiter_user_agents(  # pylint: disable=too-many-positional-arguments
+    count=None,  # type: None | int
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+    rng=None,  # type: None | Random
+    batch_size=AIO_BATCH_SIZE,  # type: int
+    executor=None,  # type: None | Executor
+):
+    # type: (...) -> AsyncIterator[str]
+    """Return async iterator yielding User-Agent headers.
+
+    Accepts same options as `aiter_navigators`.
+    """
+    return aiter_batches(
+        "user_agents",
+        count,
+        {"os": os, "navigator": navigator, "device_type": device_type, "rng": rng},
+        batch_size,
+        executor,
+    )
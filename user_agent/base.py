@@ -1,3 +1,4 @@
+# pylint: disable=too-many-lines
 """Generation random, valid HTTP User-Agent header and web navgator JS object.
 
 Functions:
@@ -5,10 +6,23 @@ Functions:
 * generate_navigator:  generates web navigator's config
 * generate_navigator_js:  generates web navigator's config with keys
     identical keys used in navigator object
+* generate_user_agents, generate_navigators, generate_navigators_js:
+    batch versions of functions above, options are resolved once per batch
+* iter_user_agents, iter_navigators, iter_navigators_js:
+    lazy streaming versions of functions above, options are resolved once
+* UserAgentGenerator: reusable object with all options resolved once,
+    it also generates compact `NavigatorConfig` objects
+
+Weights:
+* OS_WEIGHT, NAVIGATOR_WEIGHT, OS_PLATFORM_WEIGHT, OS_CPU_WEIGHT,
+    CHROME_BUILD_WEIGHT, FIREFOX_VERSION_WEIGHT, IE_VERSION_WEIGHT:
+    optional relative weights of items of data tables, e.g. to make
+    windows more common than linux, by default all choices are uniform
+* set_weights: replaces weights or applies in place changes of them
 
 FIXME:
 * add Edge, Safari and Opera support
-* add random config i.e. windows is more common than linux
+* ship default weights based on real market share
 
 Specs:
 * https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/User-Agent/Firefox
@@ -30,24 +44,64 @@ Lists of user agents:
 """
 # from __future__ import annotations
 
-import typing
-from datetime import datetime, timedelta
-from itertools import product
-from random import SystemRandom
+import time
+from itertools import product, repeat
+from operator import itemgetter
+from random import Random, SystemRandom  # pylint: disable=unused-import
 
-import pytz
-from six.moves.collections_abc import (  # pylint: disable=import-error,unused-import
-    Sequence,
-)
+try:
+    from collections.abc import Sequence
+except ImportError:  # python 2
+    # pylint: disable=deprecated-class
+    from collections import Sequence  # type: ignore[attr-defined] # noqa: UP035
 
-from .device import SMARTPHONE_DEV_IDS
+from .config import NavigatorConfig
+from .device import get_smartphone_dev_ids
 from .error import InvalidOption
+from .sampling import AliasTable
 from .warning import warn
 
 # pylint: enable=line-too-long
 
+# Do not import typing at runtime, it slows down importing of the package
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias,consider-alternative-union-syntax
+    from typing import (
+        Any,
+        Callable,
+        Dict,
+        Iterator,
+        List,
+        Optional,
+        Tuple,
+    )
+
+    VariantsCacheKey = Tuple[Any, Any, Any]
+    FirefoxBuildRange = Tuple[str, int, int, List[str]]
+    AppComponents = Tuple[
+        str, Optional[str], str, str, Optional[str], Optional[str], Optional[str]
+    ]
+    NavigatorDict = Dict[str, Optional[str]]
+    UaRenderer = Callable[[str, str, Optional[str], Optional[str]], str]
+    Weights = Dict[Any, float]
+    # cached objects: items, weights and alias table built for them
+    AliasCacheEntry = Tuple[Any, Any, Optional[AliasTable]]
+    # pylint: enable=deprecated-typing-alias,consider-alternative-union-syntax
+
 
-__all__ = ["generate_navigator", "generate_navigator_js", "generate_user_agent"]
+__all__ = [
+    "UserAgentGenerator",
+    "generate_navigator",
+    "generate_navigator_js",
+    "generate_navigators",
+    "generate_navigators_js",
+    "generate_user_agent",
+    "generate_user_agents",
+    "iter_navigators",
+    "iter_navigators_js",
+    "iter_user_agents",
+]
 
 IE_NETSCAPE_VERSION = 11
 randomizer = SystemRandom()
@@ -137,15 +191,22 @@ NAVIGATOR_OS = {
     "firefox": ("win", "linux", "mac", "android"),
     "ie": ("win",),
 }
+# (version, release date as UTC unix timestamp)
 FIREFOX_VERSION = [
-    ("45.0", datetime(2016, 3, 8, tzinfo=pytz.utc)),
-    ("46.0", datetime(2016, 4, 26, tzinfo=pytz.utc)),
-    ("47.0", datetime(2016, 6, 7, tzinfo=pytz.utc)),
-    ("48.0", datetime(2016, 8, 2, tzinfo=pytz.utc)),
-    ("49.0", datetime(2016, 9, 20, tzinfo=pytz.utc)),
-    ("50.0", datetime(2016, 11, 15, tzinfo=pytz.utc)),
-    ("51.0", datetime(2017, 1, 24, tzinfo=pytz.utc)),
-]  # type: list[tuple[str, datetime]]
+    ("45.0", 1457395200),  # 2016-03-08
+    ("46.0", 1461628800),  # 2016-04-26
+    ("47.0", 1465257600),  # 2016-06-07
+    ("48.0", 1470096000),  # 2016-08-02
+    ("49.0", 1474329600),  # 2016-09-20
+    ("50.0", 1479168000),  # 2016-11-15
+    ("51.0", 1485216000),  # 2017-01-24
+]  # type: list[tuple[str, int]]
+SECONDS_IN_DAY = 86400
+# Precomputed build time ranges of firefox versions,
+# see `get_firefox_build_table`
+FIREFOX_BUILD_TABLE_CACHE = (
+    {}
+)  # type: dict[int, tuple[list[tuple[str, int]], list[FirefoxBuildRange]]]
 
 # Top chrome builds from website access log
 # for september, october 2020
@@ -227,6 +288,50 @@ USER_AGENT_TEMPLATE = {
 }
 
 
+# Cache of resolved (device_type, os, navigator) variants
+# for each set of options normalized with `normalize_option_value`
+VARIANTS_CACHE_SIZE = 256
+VARIANTS_CACHE = (
+    {}
+)  # type: dict[VariantsCacheKey, tuple[tuple[str, str, str], ...]]
+# Order of arguments of compiled USER_AGENT_TEMPLATE renderers
+UA_TEMPLATE_FIELDS = ("ua_platform", "build_version", "geckotrail", "trident_version")
+# Compiled renderers of USER_AGENT_TEMPLATE items, see `get_ua_renderer`
+UA_RENDERER_CACHE = {}  # type: dict[str, UaRenderer]
+FIREFOX_APP_VERSION = {
+    "win": "5.0 (Windows)",
+    "mac": "5.0 (Macintosh)",
+    "linux": "5.0 (X11)",
+}
+
+# Optional relative weights of items of data tables, None means uniform
+# choice. Weights are dicts {item: weight}, items missing in dict have zero
+# weight. If all allowed items have zero weight, choice is uniform.
+# Alias tables are cached by identity of weights dicts: replace dict with
+# new one or call `set_weights` after changing it in place.
+# Weights of OS_NAVIGATOR keys, e.g. {"win": 70, "mac": 20, "linux": 10}
+OS_WEIGHT = None  # type: None | dict[str, float]
+# Weights of NAVIGATOR_OS keys, they define shares of navigators
+# inside each os, e.g. {"chrome": 65, "firefox": 25, "ie": 10}
+NAVIGATOR_WEIGHT = None  # type: None | dict[str, float]
+# Weights of OS_PLATFORM items for each os,
+# e.g. {"win": {"Windows NT 10.0": 80, "Windows NT 6.1": 20}}
+OS_PLATFORM_WEIGHT = None  # type: None | dict[str, dict[str, float]]
+# Weights of OS_CPU items for each os, e.g. {"win": {"Win64; x64": 80}}
+OS_CPU_WEIGHT = None  # type: None | dict[str, dict[str, float]]
+# Weights of CHROME_BUILD items, e.g. {"86.0.4240.75": 10}
+CHROME_BUILD_WEIGHT = None  # type: None | dict[str, float]
+# Weights of FIREFOX_VERSION items by version, e.g. {"51.0": 10}
+FIREFOX_VERSION_WEIGHT = None  # type: None | dict[str, float]
+# Weights of IE_VERSION items by numeric version, e.g. {11: 10, 10: 2}
+IE_VERSION_WEIGHT = None  # type: None | dict[int, float]
+# Weights of table rows are looked up by first item of row
+TABLE_ROW_ID = itemgetter(0)
+# Cache of alias tables built for data tables and weights,
+# see `get_alias_table` and `get_variants_alias_table`
+ALIAS_TABLE_CACHE_SIZE = 256
+ALIAS_TABLE_CACHE = {}  # type: dict[tuple[Any, ...], AliasCacheEntry]
+
 MACOSX_CHROME_BUILD_RANGE = {
     # https://en.wikipedia.org/wiki/MacOS#Release_history
     "10.8": (0, 8),
@@ -237,37 +342,200 @@ MACOSX_CHROME_BUILD_RANGE = {
 }  # type: dict[str, tuple[int, int]]
 
 
-def get_firefox_build():
-    # type: () -> tuple[str, str]
-    build_ver, date_from = randomizer.choice(FIREFOX_VERSION)
+WEIGHT_NAMES = {
+    "os": "OS_WEIGHT",
+    "navigator": "NAVIGATOR_WEIGHT",
+    "os_platform": "OS_PLATFORM_WEIGHT",
+    "os_cpu": "OS_CPU_WEIGHT",
+    "chrome_build": "CHROME_BUILD_WEIGHT",
+    "firefox_version": "FIREFOX_VERSION_WEIGHT",
+    "ie_version": "IE_VERSION_WEIGHT",
+}
+
+
+def set_weights(**weights):  # noqa: ANN003
+    # type: (**None | dict[Any, Any]) -> None
+    """Replace weights of data tables and drop cached alias tables.
+
+    Keyword names are lowercase names of weights variables without
+    "_WEIGHT" suffix, e.g. ``set_weights(os={"win": 70, "mac": 30})``.
+    Call it without arguments after changing weights dicts in place.
+
+    :raises InvalidOption: if name of weights is unknown
+    """
+    for name in weights:
+        if name not in WEIGHT_NAMES:
+            raise InvalidOption(
+                "Invalid weights name: {}. Valid names are: {}".format(
+                    name, ", ".join(sorted(WEIGHT_NAMES))
+                )
+            )
+    module_vars = globals()
+    for name, value in weights.items():
+        module_vars[WEIGHT_NAMES[name]] = value
+    ALIAS_TABLE_CACHE.clear()
+
+
+def cache_alias_table(key, items, weights, table):
+    # type: (tuple[Any, ...], Any, Any, None | AliasTable) -> None | AliasTable
+    """Save alias table built for `items` and `weights` in ALIAS_TABLE_CACHE.
+
+    Key consists of ids of `items` and `weights`, the objects are saved
+    along with the table, so the ids could not be reused by other objects
+    while table is cached.
+    """
+    if len(ALIAS_TABLE_CACHE) >= ALIAS_TABLE_CACHE_SIZE:
+        ALIAS_TABLE_CACHE.clear()
+    ALIAS_TABLE_CACHE[key] = (items, weights, table)
+    return table
+
+
+def get_alias_table(
+    items,  # type: Sequence[Any]
+    weights,  # type: Weights
+    key=None,  # type: None | Callable[[Any], Any]
+):
+    # type: (...) -> None | AliasTable
+    """Return alias table for weighted choice from `items`.
+
+    Weight of item is looked up in `weights` by item itself or by `key(item)`.
+    Table is built once for each pair of `items` and `weights` objects.
+
+    :return: alias table or None if all items have zero weight
+    :raises ValueError: if any weight is negative
+    """
+    cache_key = (id(items), key, id(weights))
     try:
-        idx = FIREFOX_VERSION.index((build_ver, date_from))
-        _, date_to = FIREFOX_VERSION[idx + 1]
-    except IndexError:
-        date_to = date_from + timedelta(days=1)
-    sec_range = (date_to - date_from).total_seconds() - 1
-    build_rnd_time = date_from + timedelta(
-        seconds=randomizer.randint(0, int(sec_range))
+        return ALIAS_TABLE_CACHE[cache_key][2]
+    except KeyError:
+        pass
+    item_weights = [
+        weights.get(item if key is None else key(item), 0) for item in items
+    ]
+    return cache_alias_table(
+        cache_key,
+        items,
+        weights,
+        AliasTable(items, item_weights) if any(item_weights) else None,
     )
-    return build_ver, build_rnd_time.strftime("%Y%m%d%H%M%S")
 
 
-def get_chrome_build():
-    # type: () -> str
-    return randomizer.choice(CHROME_BUILD)
+def weighted_choice(
+    items,  # type: Sequence[Any]
+    weights,  # type: None | Weights
+    rng,  # type: Random
+    key=None,  # type: None | Callable[[Any], Any]
+):
+    # type: (...) -> Any
+    """Return random item of `items` chosen according to `weights`.
+
+    Choice is uniform if `weights` is None or all items have zero weight.
+    """
+    if weights is not None:
+        table = get_alias_table(items, weights, key)
+        if table is not None:
+            return table.choice(rng)
+    return rng.choice(items)
+
 
+def build_firefox_build_table(versions):
+    # type: (list[tuple[str, int]]) -> list[FirefoxBuildRange]
+    """Precompute ranges of possible build times for firefox versions.
+
+    Each version could be built at any second between its release and
+    release of next version (or next day for the last version).
+
+    Returns list of tuples (version, start offset, number of seconds,
+    day prefixes) where offsets are counted from midnight of release day
+    and day prefixes are release day and following days formatted
+    as "%Y%m%d".
+    """
+    table = []
+    for idx, (build_ver, date_from) in enumerate(versions):
+        date_to = (
+            versions[idx + 1][1]
+            if idx + 1 < len(versions)
+            else date_from + SECONDS_IN_DAY
+        )
+        day_start = date_from - date_from % SECONDS_IN_DAY
+        day_prefixes = [
+            time.strftime("%Y%m%d", time.gmtime(day_ts))
+            for day_ts in range(day_start, date_to, SECONDS_IN_DAY)
+        ]
+        table.append(
+            (build_ver, date_from - day_start, date_to - date_from, day_prefixes)
+        )
+    return table
+
+
+def get_firefox_build_table():
+    # type: () -> list[FirefoxBuildRange]
+    """Return build table for current content of FIREFOX_VERSION.
+
+    Table is built once and rebuilt only if FIREFOX_VERSION is replaced.
+    """
+    try:
+        source, table = FIREFOX_BUILD_TABLE_CACHE[id(FIREFOX_VERSION)]
+    except KeyError:
+        pass
+    else:
+        if source is FIREFOX_VERSION:
+            return table
+    table = build_firefox_build_table(FIREFOX_VERSION)
+    FIREFOX_BUILD_TABLE_CACHE.clear()
+    FIREFOX_BUILD_TABLE_CACHE[id(FIREFOX_VERSION)] = (FIREFOX_VERSION, table)
+    return table
+
+
+def get_firefox_build(rng=None):
+    # type: (None | Random) -> tuple[str, str]
+    if rng is None:
+        rng = randomizer
+    build_range = weighted_choice(
+        get_firefox_build_table(), FIREFOX_VERSION_WEIGHT, rng, TABLE_ROW_ID
+    )  # type: FirefoxBuildRange
+    return format_firefox_build(build_range, rng.randrange(build_range[2]))
+
+
+def format_firefox_build(build_range, offset):
+    # type: (FirefoxBuildRange, int) -> tuple[str, str]
+    """Return (version, build id) of firefox built `offset` seconds after release.
+
+    :param build_range: item of table built by `build_firefox_build_table`
+    :param offset: number of seconds, less than number of seconds in range
+    """
+    build_ver, start_offset, _, day_prefixes = build_range
+    day, seconds = divmod(start_offset + offset, SECONDS_IN_DAY)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return build_ver, "%s%02d%02d%02d" % (  # noqa: UP031
+        day_prefixes[day],
+        hours,
+        minutes,
+        seconds,
+    )
+
+
+def get_chrome_build(rng=None):
+    # type: (None | Random) -> str
+    return weighted_choice(  # type: ignore[no-any-return]
+        CHROME_BUILD, CHROME_BUILD_WEIGHT, randomizer if rng is None else rng
+    )
 
-def get_ie_build():
-    # type: () -> tuple[int, str, str]
+
+def get_ie_build(rng=None):
+    # type: (None | Random) -> tuple[int, str, str]
     """Return random IE version as tuple (numeric_version, us-string component).
 
     Example: (8, 'MSIE 8.0')
     """
-    return randomizer.choice(IE_VERSION)
+    return weighted_choice(  # type: ignore[no-any-return]
+        IE_VERSION, IE_VERSION_WEIGHT, randomizer if rng is None else rng, TABLE_ROW_ID
+    )
 
 
-def fix_chrome_mac_platform(platform):
-    # type: (str) -> str
+def fix_chrome_mac_platform(platform, rng=None):
+    # type: (str, None | Random) -> str
     """Fix chrome version on mac OS.
 
     Chrome on Mac OS adds minor version number and uses underscores instead
@@ -275,155 +543,287 @@ def fix_chrome_mac_platform(platform):
     but for Chrome it will be 'Intel Mac OS X 10_11_6'.
 
     :param platform: - string like "Macintosh; Intel Mac OS X 10.8"
+    :param rng: random generator, module's `randomizer` is used by default
     :return: platform with version number including minor number and formatted
     with underscores, e.g. "Macintosh; Intel Mac OS X 10_8_2"
     """
+    build = (randomizer if rng is None else rng).choice(get_mac_builds(platform))
+    return format_chrome_mac_platform(platform, build)
+
+
+def get_mac_builds(platform):
+    # type: (str) -> range
+    """Return range of minor version numbers of mac os platform.
+
+    :param platform: - string like "Macintosh; Intel Mac OS X 10.8"
+    """
+    return range(*MACOSX_CHROME_BUILD_RANGE[platform.split("OS X ")[1]])
+
+
+def format_chrome_mac_platform(platform, build):
+    # type: (str, int) -> str
+    """Return mac os platform with minor version number as chrome shows it.
+
+    See `fix_chrome_mac_platform`.
+    """
     ver = platform.split("OS X ")[1]
-    build_range = range(*MACOSX_CHROME_BUILD_RANGE[ver])
-    build = randomizer.choice(build_range)
     mac_ver = ver.replace(".", "_") + "_" + str(build)
     return "Macintosh; Intel Mac OS X {}".format(mac_ver)
 
 
-def build_system_components(device_type, os_id, navigator_id):
-    # type: (str, str, str) -> dict[str, str]
-    """Build random platform and oscpu components for given parameters.
+def choose_os_platform(os_id, rng):
+    # type: (str, Random) -> str
+    """Return random OS_PLATFORM item of given os, see OS_PLATFORM_WEIGHT."""
+    return weighted_choice(  # type: ignore[no-any-return]
+        OS_PLATFORM[os_id],
+        None if OS_PLATFORM_WEIGHT is None else OS_PLATFORM_WEIGHT.get(os_id),
+        rng,
+    )
 
-    Returns dict {platform_version, platform, ua_platform, oscpu}
 
-    platform_version is OS name used in different places
-    ua_platform goes to navigator.platform
-    platform is used in building navigator.userAgent
-    oscpu goes to navigator.oscpu
+def choose_os_cpu(os_id, rng):
+    # type: (str, Random) -> str
+    """Return random OS_CPU item of given os, see OS_CPU_WEIGHT."""
+    return weighted_choice(  # type: ignore[no-any-return]
+        OS_CPU[os_id],
+        None if OS_CPU_WEIGHT is None else OS_CPU_WEIGHT.get(os_id),
+        rng,
+    )
+
+
+def pick_system_components(device_type, os_id, navigator_id, rng=None):
+    # type: (str, str, str, None | Random) -> tuple[str, str, str, str]
+    """Pick random platform and oscpu components for given parameters.
+
+    Returns tuple (platform_version, platform, ua_platform, oscpu),
+    see `build_system_components` for description of items.
     """
+    if rng is None:
+        rng = randomizer
     assert os_id in {"win", "linux", "mac", "android"}
+    mac_build = None
+    device_id = None  # type: Any
+    if os_id == "win":
+        platform_version = choose_os_platform("win", rng)
+        cpu = choose_os_cpu("win", rng)
+    elif os_id == "linux":
+        cpu = choose_os_cpu("linux", rng)
+        platform_version = choose_os_platform("linux", rng)
+    elif os_id == "mac":
+        cpu = choose_os_cpu("mac", rng)
+        platform_version = choose_os_platform("mac", rng)
+        if navigator_id == "chrome":
+            mac_build = rng.choice(get_mac_builds(platform_version))
+    else:
+        platform_version = choose_os_platform("android", rng)
+        if navigator_id == "chrome":
+            device_id = rng.choice(get_smartphone_dev_ids())
+        cpu = choose_os_cpu("android", rng)
+    return render_system_components(
+        device_type, os_id, navigator_id, platform_version, cpu, mac_build, device_id
+    )
+
+
+def render_system_components(  # pylint: disable=too-many-positional-arguments
+    device_type,  # type: str
+    os_id,  # type: str
+    navigator_id,  # type: str
+    platform_version,  # type: str
+    cpu,  # type: str
+    mac_build=None,  # type: None | int
+    device_id=None,  # type: None | str
+):
+    # type: (...) -> tuple[str, str, str, str]
+    """Build platform and oscpu components from chosen table items.
+
+    :param platform_version: item of OS_PLATFORM
+    :param cpu: item of OS_CPU
+    :param mac_build: minor version of mac os, required for chrome on mac,
+        see `get_mac_builds`
+    :param device_id: device id, required for chrome on android
+    :return: same tuple as `pick_system_components` returns
+    """
     if os_id == "win":
-        platform_version = randomizer.choice(OS_PLATFORM["win"])
-        cpu = randomizer.choice(OS_CPU["win"])
         platform = "{}; {}".format(platform_version, cpu) if cpu else platform_version
-        return {
-            "platform_version": platform_version,
-            "platform": platform,
-            "ua_platform": platform,
-            "oscpu": platform,
-        }
+        return platform_version, platform, platform, platform
     if os_id == "linux":
-        cpu = randomizer.choice(OS_CPU["linux"])
-        platform_version = randomizer.choice(OS_PLATFORM["linux"])
         platform = "{} {}".format(platform_version, cpu)
-        return {
-            "platform_version": platform_version,
-            "platform": platform,
-            "ua_platform": platform,
-            "oscpu": "Linux {}".format(cpu),
-        }
+        return platform_version, platform, platform, "Linux {}".format(cpu)
     if os_id == "mac":
-        cpu = randomizer.choice(OS_CPU["mac"])
-        platform_version = randomizer.choice(OS_PLATFORM["mac"])
         platform = platform_version
         if navigator_id == "chrome":
-            platform = fix_chrome_mac_platform(platform)
-        return {
-            "platform_version": platform_version,
-            "platform": "MacIntel",
-            "ua_platform": platform,
-            "oscpu": "Intel Mac OS X {}".format(platform.split(" ")[-1]),
-        }
+            assert mac_build is not None
+            platform = format_chrome_mac_platform(platform, mac_build)
+        return (
+            platform_version,
+            "MacIntel",
+            platform,
+            "Intel Mac OS X {}".format(platform.split(" ")[-1]),
+        )
     # os_id could be only "android" here
     assert navigator_id in {"firefox", "chrome"}
     assert device_type in {"smartphone", "tablet"}
-    platform_version = randomizer.choice(OS_PLATFORM["android"])
     if navigator_id == "firefox":
         if device_type == "smartphone":
             ua_platform = "{}; Mobile".format(platform_version)
-        elif device_type == "tablet":
-            ua_platform = "{}; Tablet".format(platform_version)
         else:
-            ua_platform = "TODO"
-    elif navigator_id == "chrome":
-        device_id = randomizer.choice(SMARTPHONE_DEV_IDS)
-        ua_platform = "Linux; {}; {}".format(platform_version, device_id)
+            ua_platform = "{}; Tablet".format(platform_version)
     else:
-        ua_platform = "TODO"
-    oscpu = "Linux {}".format(randomizer.choice(OS_CPU["android"]))
+        ua_platform = "Linux; {}; {}".format(platform_version, device_id)
+    oscpu = "Linux {}".format(cpu)
+    return platform_version, oscpu, ua_platform, oscpu
+
+
+def build_system_components(device_type, os_id, navigator_id, rng=None):
+    # type: (str, str, str, None | Random) -> dict[str, str]
+    """Build random platform and oscpu components for given parameters.
+
+    Returns dict {platform_version, platform, ua_platform, oscpu}
+
+    platform_version is OS name used in different places
+    ua_platform goes to navigator.platform
+    platform is used in building navigator.userAgent
+    oscpu goes to navigator.oscpu
+    """
+    platform_version, platform, ua_platform, oscpu = pick_system_components(
+        device_type, os_id, navigator_id, rng
+    )
     return {
         "platform_version": platform_version,
+        "platform": platform,
         "ua_platform": ua_platform,
-        "platform": oscpu,
         "oscpu": oscpu,
     }
 
 
-def build_app_components(os_id, navigator_id):
-    # type: (str, str) -> dict[str, None | str]
-    """Build app features for given os and navigator.
+def pick_app_components(os_id, navigator_id, rng=None):
+    # type: (str, str, None | Random) -> AppComponents
+    """Pick app features for given os and navigator.
 
-    Returns dict {name, product_sub, vendor, build_version, build_id}
+    Returns tuple (name, product_sub, vendor, build_version, build_id,
+    geckotrail, trident_version). Last two items are None for navigators
+    which do not use them.
     """
     assert navigator_id in {"firefox", "chrome", "ie"}
     if navigator_id == "firefox":
-        build_version, build_id = get_firefox_build()
+        build = get_firefox_build(rng)  # type: Any
+    elif navigator_id == "chrome":
+        build = get_chrome_build(rng)
+    else:
+        build = get_ie_build(rng)
+    return render_app_components(os_id, navigator_id, build)
+
+
+def render_app_components(os_id, navigator_id, build):
+    # type: (str, str, Any) -> AppComponents
+    """Build app features from chosen build.
+
+    :param build: (version, build id) tuple returned by `get_firefox_build`,
+        item of CHROME_BUILD or item of IE_VERSION
+    :return: same tuple as `pick_app_components` returns
+    """
+    if navigator_id == "firefox":
+        build_version, build_id = build
         geckotrail = "20100101" if os_id in {"win", "linux", "mac"} else build_version
-        return {
-            "name": "Netscape",
-            "product_sub": "20100101",
-            "vendor": "",
-            "build_version": build_version,
-            "build_id": build_id,
-            "geckotrail": geckotrail,
-        }
+        return (
+            "Netscape",
+            "20100101",
+            "",
+            build_version,
+            build_id,
+            geckotrail,
+            None,
+        )
     if navigator_id == "chrome":
-        return {
-            "name": "Netscape",
-            "product_sub": "20030107",
-            "vendor": "Google Inc.",
-            "build_version": get_chrome_build(),
-            "build_id": None,
-        }
+        return (
+            "Netscape",
+            "20030107",
+            "Google Inc.",
+            build,
+            None,
+            None,
+            None,
+        )
     # navigator_id could be only "ie" here
-    num_ver, build_version, trident_version = get_ie_build()
+    num_ver, build_version, trident_version = build
     app_name = (
         "Netscape" if num_ver >= IE_NETSCAPE_VERSION else "Microsoft Internet Explorer"
     )
-    return {
-        "name": app_name,
-        "product_sub": None,
-        "vendor": "",
+    return (app_name, None, "", build_version, None, None, trident_version)
+
+
+def build_app_components(os_id, navigator_id, rng=None):
+    # type: (str, str, None | Random) -> dict[str, None | str]
+    """Build app features for given os and navigator.
+
+    Returns dict {name, product_sub, vendor, build_version, build_id}
+    """
+    (
+        name,
+        product_sub,
+        vendor,
+        build_version,
+        build_id,
+        geckotrail,
+        trident_version,
+    ) = pick_app_components(os_id, navigator_id, rng)
+    app = {
+        "name": name,
+        "product_sub": product_sub,
+        "vendor": vendor,
         "build_version": build_version,
-        "build_id": None,
-        "trident_version": trident_version,
+        "build_id": build_id,
     }
+    if navigator_id == "firefox":
+        app["geckotrail"] = geckotrail
+    elif navigator_id == "ie":
+        app["trident_version"] = trident_version
+    return app
+
+
+def normalize_option_value(opt_value):
+    # type: (None | str | Sequence[str]) -> None | tuple[str, ...]
+    """Convert value of generation option to hashable form.
+
+    String and sequence of strings are converted to tuple, None is kept as is.
+    Values of other types are returned unchanged, it is up to caller
+    to validate them.
+    """
+    if opt_value is None or isinstance(opt_value, tuple):
+        return opt_value
+    if isinstance(opt_value, str):
+        return (opt_value,)
+    if isinstance(opt_value, list):
+        return tuple(opt_value)
+    if isinstance(opt_value, Sequence):
+        return tuple(opt_value)
+    return opt_value
 
 
-# TODO: I have no idea what this function does
 def get_option_choices(
     opt_name,  # type: str
     opt_value,  # type: None | str | Sequence[str]
-    default_value,  # type: list[str]
-    all_choices,  # type: list[str]
+    default_value,  # type: Sequence[str]
+    all_choices,  # type: Sequence[str]
 ):
-    # type: (...) -> list[str]
-    """Generate something.
+    # type: (...) -> tuple[str, ...]
+    """Generate possible choices for the option `opt_name`.
 
-    Long uninformative description: Generate possible choices for the
-    option `opt_name` limited to `opt_value` value with default value
-    as `default_value`
+    Choices are limited to `opt_value` value, `default_value` is used
+    if `opt_value` is None. Special item "all" is expanded to `all_choices`.
+
+    :return: tuple of choices which could be used as a cache key
+    :raises InvalidOption: if option value is invalid
     """
-    choices = []
-    if isinstance(opt_value, str):
-        choices = [opt_value]
-    elif isinstance(
-        opt_value, typing.Sequence  # pylint: disable=deprecated-typing-alias
-    ):
-        choices = list(opt_value)
-    elif opt_value is None:
-        choices = default_value
-    else:
+    choices = normalize_option_value(opt_value)
+    if choices is None:
+        choices = tuple(default_value)
+    elif not isinstance(choices, tuple):
         raise InvalidOption(
             "Option {} has invalid value: {}".format(opt_name, opt_value)
         )
     if "all" in choices:
-        choices = all_choices
+        choices = tuple(all_choices)
     for item in choices:
         if item not in all_choices:
             raise InvalidOption(
@@ -432,21 +832,18 @@ def get_option_choices(
     return choices
 
 
-def pick_config_ids(
-    device_type=None,  # type: None | str | list[str]
+def build_config_variants(
+    device_type=None,  # type: None | str | Sequence[str]
     os=None,  # type: None | str | Sequence[str]
     navigator=None,  # type: None | str | Sequence[str]
 ):
-    # type: (...) -> tuple[str, str, str]
-    """Select one item from all possible combinations of (device, os, navigator) items.
+    # type: (...) -> tuple[tuple[str, str, str], ...]
+    """Build all valid combinations of (device, os, navigator) items.
 
-    :param os: allowed os(es)
-    :type os: string or list/tuple or None
-    :param navigator: allowed browser engine(s)
-    :type navigator: string or list/tuple or None
-    :param device_type: limit possible oses by device type
-    :type device_type: str or list/tuple or None, possible values:
-        "desktop", "smartphone", "tablet", "all"
+    Accepts same options as `pick_config_ids`. Does not use cache, see
+    `resolve_config_variants`.
+
+    :raises InvalidOption: if options conflicts with each other
     """
     default_dev_types = ["desktop"] if os is None else list(DEVICE_TYPE_OS.keys())
     dev_type_choices = get_option_choices(
@@ -473,7 +870,135 @@ def pick_config_ids(
         raise InvalidOption(
             "Options device_type, os and navigator conflicts with each other"
         )
-    device_type, os_id, navigator_id = randomizer.choice(variants)
+    return tuple(variants)
+
+
+def resolve_config_variants(
+    device_type=None,  # type: None | str | Sequence[str]
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+):
+    # type: (...) -> tuple[tuple[str, str, str], ...]
+    """Return all valid combinations of (device, os, navigator) items.
+
+    Result is cached per normalized set of options, see `build_config_variants`.
+    """
+    key = (
+        normalize_option_value(device_type),
+        normalize_option_value(os),
+        normalize_option_value(navigator),
+    )  # type: VariantsCacheKey | None
+    try:
+        return VARIANTS_CACHE[key]  # type: ignore[index]
+    except KeyError:
+        pass
+    except TypeError:
+        # unhashable option value, it will not pass validation anyway
+        key = None
+    variants = build_config_variants(device_type, os, navigator)
+    if key is not None:
+        if len(VARIANTS_CACHE) >= VARIANTS_CACHE_SIZE:
+            VARIANTS_CACHE.clear()
+        VARIANTS_CACHE[key] = variants
+    return variants
+
+
+def build_variant_weights(
+    variants,  # type: Sequence[tuple[str, str, str]]
+    os_weight,  # type: None | Weights
+    navigator_weight,  # type: None | Weights
+):
+    # type: (...) -> list[float]
+    """Build weights of (device, os, navigator) variants.
+
+    Total weight of variants of each os is its weight in `os_weight`
+    or number of its variants if `os_weight` is None. Inside each os
+    the weight is shared between variants according to `navigator_weight`,
+    evenly if all navigators of os have zero weight.
+    """
+    nav_weights = [
+        1 if navigator_weight is None else navigator_weight.get(navigator_id, 0)
+        for _, _, navigator_id in variants
+    ]
+    os_counts = {}  # type: dict[str, int]
+    os_nav_totals = {}  # type: dict[str, float]
+    for (_, os_id, _), nav_weight in zip(variants, nav_weights):
+        os_counts[os_id] = os_counts.get(os_id, 0) + 1
+        os_nav_totals[os_id] = os_nav_totals.get(os_id, 0) + nav_weight
+    weights = []
+    for (_, os_id, _), nav_weight in zip(variants, nav_weights):
+        count = os_counts[os_id]
+        nav_total = os_nav_totals[os_id]
+        os_total = count if os_weight is None else os_weight.get(os_id, 0)
+        weights.append(
+            os_total * (nav_weight / float(nav_total) if nav_total else 1.0 / count)
+        )
+    return weights
+
+
+def get_variants_alias_table(variants):
+    # type: (Sequence[tuple[str, str, str]]) -> None | AliasTable
+    """Return alias table for choice from `variants` according to weights.
+
+    Weights are defined by OS_WEIGHT and NAVIGATOR_WEIGHT,
+    see `build_variant_weights`.
+
+    :return: alias table or None if choice has to be uniform: weights
+        are not set or all of them are zero
+    """
+    os_weight = OS_WEIGHT
+    navigator_weight = NAVIGATOR_WEIGHT
+    if os_weight is None and navigator_weight is None:
+        return None
+    cache_key = (id(variants), id(os_weight), id(navigator_weight))
+    try:
+        return ALIAS_TABLE_CACHE[cache_key][2]
+    except KeyError:
+        pass
+    weights = build_variant_weights(variants, os_weight, navigator_weight)
+    return cache_alias_table(
+        cache_key,
+        variants,
+        (os_weight, navigator_weight),
+        AliasTable(variants, weights) if any(weights) else None,
+    )
+
+
+def choose_variant(variants, rng):
+    # type: (Sequence[tuple[str, str, str]], Random) -> tuple[str, str, str]
+    """Return random (device, os, navigator) item of `variants`.
+
+    Choice is uniform unless OS_WEIGHT or NAVIGATOR_WEIGHT is set.
+    """
+    table = get_variants_alias_table(variants)
+    if table is not None:
+        return table.choice(rng)  # type: ignore[no-any-return]
+    return rng.choice(variants)
+
+
+def pick_config_ids(
+    device_type=None,  # type: None | str | Sequence[str]
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    rng=None,  # type: None | Random
+):
+    # type: (...) -> tuple[str, str, str]
+    """Select one item from all possible combinations of (device, os, navigator) items.
+
+    :param os: allowed os(es)
+    :type os: string or list/tuple or None
+    :param navigator: allowed browser engine(s)
+    :type navigator: string or list/tuple or None
+    :param device_type: limit possible oses by device type
+    :type device_type: str or list/tuple or None, possible values:
+        "desktop", "smartphone", "tablet", "all"
+    :param rng: source of randomness, e.g. `random.Random(seed)` for
+        reproducible output, module's `randomizer` (SystemRandom) by default
+    """
+    variants = resolve_config_variants(device_type, os, navigator)
+    device_type, os_id, navigator_id = choose_variant(
+        variants, randomizer if rng is None else rng
+    )
 
     assert os_id in OS_PLATFORM
     assert navigator_id in NAVIGATOR_OS
@@ -482,21 +1007,91 @@ def pick_config_ids(
     return device_type, os_id, navigator_id
 
 
+def choose_ua_template_name(device_type, navigator_id, build_version):
+    # type: (str, str, None | str) -> str
+    """Return key of USER_AGENT_TEMPLATE to use for given config."""
+    if navigator_id == "ie":
+        return "ie_11" if build_version == "MSIE 11.0" else "ie_less_11"
+    if navigator_id == "chrome":
+        if device_type == "smartphone":
+            return "chrome_smartphone"
+        if device_type == "tablet":
+            return "chrome_tablet"
+    return navigator_id
+
+
 def choose_ua_template(
     device_type,  # type: str
     navigator_id,  # type: str
     app,  # type: dict[str, None | str]
 ):
     # type: (...) -> str
-    tpl_name = navigator_id
-    if navigator_id == "ie":
-        tpl_name = "ie_11" if app["build_version"] == "MSIE 11.0" else "ie_less_11"
-    if navigator_id == "chrome":
-        if device_type == "smartphone":
-            tpl_name = "chrome_smartphone"
-        if device_type == "tablet":
-            tpl_name = "chrome_tablet"
-    return USER_AGENT_TEMPLATE[tpl_name]
+    return USER_AGENT_TEMPLATE[
+        choose_ua_template_name(device_type, navigator_id, app["build_version"])
+    ]
+
+
+def split_ua_template(template):
+    # type: (str) -> list[tuple[str, None | str]]
+    """Split user agent template into (literal text, field key) pairs.
+
+    Key is name of USER_AGENT_TEMPLATE field like "ua_platform" which follows
+    the literal text, it is None for the last pair.
+
+    :raises ValueError: if template contains unknown field
+    """
+    parts = []  # type: list[tuple[str, None | str]]
+    rest = template
+    while "{" in rest:
+        literal, rest = rest.split("{", 1)
+        field, rest = rest.split("}", 1)
+        key = field.partition("[")[2].rstrip("]")
+        if key not in UA_TEMPLATE_FIELDS:
+            raise ValueError("Unknown field in user agent template: {}".format(field))
+        parts.append((literal, key))
+    parts.append((rest, None))
+    return parts
+
+
+def compile_ua_template(template):
+    # type: (str) -> UaRenderer
+    """Compile user agent template into renderer function.
+
+    Template placeholders like "{system[ua_platform]}" are replaced with
+    "%s" once, so rendering does not parse template and does not need dicts
+    of components. Renderer accepts component values as positional
+    arguments in order of UA_TEMPLATE_FIELDS and returns exactly the same
+    string as `template.format(system=..., app=...)` does.
+    """
+    parts = []
+    field_indexes = []
+    for literal, key in split_ua_template(template):
+        parts.append(literal.replace("%", "%%"))
+        if key is not None:
+            parts.append("%s")
+            field_indexes.append(UA_TEMPLATE_FIELDS.index(key))
+    fmt = "".join(parts)
+    pick_values = itemgetter(*field_indexes) if field_indexes else (lambda _: ())
+
+    def render(ua_platform, build_version, geckotrail=None, trident_version=None):
+        # type: (str, str, None | str, None | str) -> str
+        values = pick_values((ua_platform, build_version, geckotrail, trident_version))
+        if len(field_indexes) == 1:
+            values = (values,)
+        return fmt % values
+
+    return render
+
+
+def get_ua_renderer(tpl_name):
+    # type: (str) -> UaRenderer
+    """Return compiled renderer of USER_AGENT_TEMPLATE item."""
+    template = USER_AGENT_TEMPLATE[tpl_name]
+    try:
+        return UA_RENDERER_CACHE[template]
+    except KeyError:
+        renderer = UA_RENDERER_CACHE[template] = compile_ua_template(template)
+        return renderer
 
 
 def build_navigator_app_version(os_id, navigator_id, platform_version, user_agent):
@@ -504,15 +1099,95 @@ def build_navigator_app_version(os_id, navigator_id, platform_version, user_agen
     if navigator_id == "firefox":
         if os_id == "android":
             return "5.0 ({})".format(platform_version)
-        os_token = {
-            "win": "Windows",
-            "mac": "Macintosh",
-            "linux": "X11",
-        }[os_id]
-        return "5.0 ({})".format(os_token)
+        return FIREFOX_APP_VERSION[os_id]
     # here navigator_id could be only "chrome" and "ie"
     assert user_agent.startswith("Mozilla/")
-    return user_agent.split("Mozilla/", 1)[1]
+    return user_agent[8:]  # len("Mozilla/") == 8
+
+
+def build_navigator(device_type, os_id, navigator_id, rng=None):
+    # type: (str, str, str, None | Random) -> dict[str, None | str]
+    """Build random web navigator's config for given config ids.
+
+    Returns dict with same keys as `generate_navigator` does.
+    """
+    if rng is None:
+        rng = randomizer
+    return render_navigator(
+        device_type,
+        os_id,
+        navigator_id,
+        pick_system_components(device_type, os_id, navigator_id, rng),
+        pick_app_components(os_id, navigator_id, rng),
+    )
+
+
+def render_navigator(  # pylint: disable=too-many-locals
+    device_type,  # type: str
+    os_id,  # type: str
+    navigator_id,  # type: str
+    system,  # type: tuple[str, str, str, str]
+    app,  # type: AppComponents
+):
+    # type: (...) -> dict[str, None | str]
+    """Build web navigator's config from system and app components.
+
+    :param system: tuple returned by `pick_system_components`
+    :param app: tuple returned by `pick_app_components`
+    """
+    platform_version, platform, ua_platform, oscpu = system
+    (
+        app_name,
+        product_sub,
+        vendor,
+        build_version,
+        build_id,
+        geckotrail,
+        trident_version,
+    ) = app
+    user_agent = get_ua_renderer(
+        choose_ua_template_name(device_type, navigator_id, build_version)
+    )(ua_platform, build_version, geckotrail, trident_version)
+    return {
+        # ids
+        "os_id": os_id,
+        "navigator_id": navigator_id,
+        # system components
+        "platform": platform,
+        "oscpu": oscpu,
+        # app components
+        "build_version": build_version,
+        "build_id": build_id,
+        "app_version": build_navigator_app_version(
+            os_id, navigator_id, platform_version, user_agent
+        ),
+        "app_name": app_name,
+        "app_code_name": "Mozilla",
+        "product": "Gecko",
+        "product_sub": product_sub,
+        "vendor": vendor,
+        "vendor_sub": "",
+        # compiled user agent
+        "user_agent": user_agent,
+    }
+
+
+def convert_navigator_to_js(config):
+    # type: (dict[str, None | str]) -> dict[str, None | str]
+    """Convert config built by `generate_navigator` to `window.navigator` keys."""
+    return {
+        "appCodeName": config["app_code_name"],
+        "appName": config["app_name"],
+        "appVersion": config["app_version"],
+        "platform": config["platform"],
+        "userAgent": config["user_agent"],
+        "oscpu": config["oscpu"],
+        "product": config["product"],
+        "productSub": config["product_sub"],
+        "vendor": config["vendor"],
+        "vendorSub": config["vendor_sub"],
+        "buildID": config["build_id"],
+    }
 
 
 def generate_navigator(
@@ -520,6 +1195,7 @@ def generate_navigator(
     navigator=None,  # type: None | str
     platform=None,  # type: None | str
     device_type=None,  # type: None | str
+    rng=None,  # type: None | Random
 ):
     # type: (...) -> dict[str, None | str]
     """Generate web navigator's config.
@@ -531,6 +1207,8 @@ def generate_navigator(
     :param device_type: limit possible oses by device type
     :type device_type: list/tuple or None, possible values:
         "desktop", "smartphone", "tablet", "all"
+    :param rng: source of randomness, e.g. `random.Random(seed)` for
+        reproducible output, module's `randomizer` (SystemRandom) by default
 
     :return: User-Agent config
     :rtype: dict with keys (os, name, platform, oscpu, build_version,
@@ -547,34 +1225,12 @@ def generate_navigator(
             "The `platform` option is deprecated. Use `os` option instead.",
             stacklevel=3,
         )
-    device_type, os_id, navigator_id = pick_config_ids(device_type, os, navigator)
-    system = build_system_components(device_type, os_id, navigator_id)
-    app = build_app_components(os_id, navigator_id)
-    ua_template = choose_ua_template(device_type, navigator_id, app)
-    user_agent = ua_template.format(system=system, app=app)
-    app_version = build_navigator_app_version(
-        os_id, navigator_id, system["platform_version"], user_agent
+    if rng is None:
+        rng = randomizer
+    device_type, os_id, navigator_id = pick_config_ids(
+        device_type, os, navigator, rng
     )
-    return {
-        # ids
-        "os_id": os_id,
-        "navigator_id": navigator_id,
-        # system components
-        "platform": system["platform"],
-        "oscpu": system["oscpu"],
-        # app components
-        "build_version": app["build_version"],
-        "build_id": app["build_id"],
-        "app_version": app_version,
-        "app_name": app["name"],
-        "app_code_name": "Mozilla",
-        "product": "Gecko",
-        "product_sub": app["product_sub"],
-        "vendor": app["vendor"],
-        "vendor_sub": "",
-        # compiled user agent
-        "user_agent": user_agent,
-    }
+    return build_navigator(device_type, os_id, navigator_id, rng)
 
 
 def generate_user_agent(
@@ -582,6 +1238,7 @@ def generate_user_agent(
     navigator=None,  # type: None | str
     platform=None,  # type: None | str
     device_type=None,  # type: None | str
+    rng=None,  # type: None | Random
 ):
     # type: (...) -> str
     """Generate HTTP User-Agent header.
@@ -593,6 +1250,8 @@ def generate_user_agent(
     :param device_type: limit possible oses by device type
     :type device_type: list/tuple or None, possible values:
         "desktop", "smartphone", "tablet", "all"
+    :param rng: source of randomness, e.g. `random.Random(seed)` for
+        reproducible output, module's `randomizer` (SystemRandom) by default
     :return: User-Agent string
     :rtype: string
     :raises InvalidOption: if could not generate user-agent for
@@ -600,7 +1259,11 @@ def generate_user_agent(
     :raise InvalidOption: if any of passed options is invalid
     """
     config = generate_navigator(
-        os=os, navigator=navigator, platform=platform, device_type=device_type
+        os=os,
+        navigator=navigator,
+        platform=platform,
+        device_type=device_type,
+        rng=rng,
     )
     assert config["user_agent"] is not None
     return config["user_agent"]
@@ -611,6 +1274,7 @@ def generate_navigator_js(
     navigator=None,  # type: None | str
     platform=None,  # type: None | str
     device_type=None,  # type: None | str
+    rng=None,  # type: None | Random
 ):
     # type: (...) -> dict[str, None | str]
     """Generate config for `windows.navigator` JavaScript object.
@@ -622,6 +1286,8 @@ def generate_navigator_js(
     :param device_type: limit possible oses by device type
     :type device_type: list/tuple or None, possible values:
         "desktop", "smartphone", "tablet", "all"
+    :param rng: source of randomness, e.g. `random.Random(seed)` for
+        reproducible output, module's `randomizer` (SystemRandom) by default
     :return: User-Agent config
     :rtype: dict with keys (TODO)
     :raises InvalidOption: if could not generate user-agent for
@@ -629,18 +1295,317 @@ def generate_navigator_js(
     :raise InvalidOption: if any of passed options is invalid
     """
     config = generate_navigator(
-        os=os, navigator=navigator, platform=platform, device_type=device_type
+        os=os,
+        navigator=navigator,
+        platform=platform,
+        device_type=device_type,
+        rng=rng,
     )
-    return {
-        "appCodeName": config["app_code_name"],
-        "appName": config["app_name"],
-        "appVersion": config["app_version"],
-        "platform": config["platform"],
-        "userAgent": config["user_agent"],
-        "oscpu": config["oscpu"],
-        "product": config["product"],
-        "productSub": config["product_sub"],
-        "vendor": config["vendor"],
-        "vendorSub": config["vendor_sub"],
-        "buildID": config["build_id"],
-    }
+    return convert_navigator_to_js(config)
+
+
+def generate_navigators(
+    count,  # type: int
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+    rng=None,  # type: None | Random
+):
+    # type: (...) -> list[dict[str, None | str]]
+    """Generate list of web navigator's configs.
+
+    Options are validated and resolved only once for the whole batch.
+    With same `rng` items are the same as returned by `count` calls of
+    `generate_navigator`. If `rng` is None the OS entropy source is read
+    in large blocks once per batch instead of once per random draw,
+    see `UserAgentGenerator`.
+
+    :param count: number of configs to generate
+    :param os: limit list of oses for generation
+    :type os: string or list/tuple or None
+    :param navigator: limit list of browser engines for generation
+    :type navigator: string or list/tuple or None
+    :param device_type: limit possible oses by device type
+    :type device_type: list/tuple or None, possible values:
+        "desktop", "smartphone", "tablet", "all"
+    :param rng: source of randomness, e.g. `random.Random(seed)` for
+        reproducible output, module's `randomizer` (SystemRandom) by default
+    :return: list of configs, see `generate_navigator`
+    :raises InvalidOption: if could not generate user-agent for
+        any combination of allowed oses and navigators
+    :raise InvalidOption: if any of passed options is invalid
+    """
+    generator = UserAgentGenerator(
+        os=os, navigator=navigator, device_type=device_type, rng=rng
+    )
+    return generator.navigators(count)
+
+
+def generate_user_agents(
+    count,  # type: int
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+    rng=None,  # type: None | Random
+):
+    # type: (...) -> list[str]
+    """Generate list of HTTP User-Agent headers.
+
+    Accepts same options as `generate_navigators`.
+
+    :return: list of User-Agent strings
+    """
+    generator = UserAgentGenerator(
+        os=os, navigator=navigator, device_type=device_type, rng=rng
+    )
+    return generator.user_agents(count)
+
+
+def generate_navigators_js(
+    count,  # type: int
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+    rng=None,  # type: None | Random
+):
+    # type: (...) -> list[dict[str, None | str]]
+    """Generate list of configs for `windows.navigator` JavaScript object.
+
+    Accepts same options as `generate_navigators`.
+
+    :return: list of configs, see `generate_navigator_js`
+    """
+    generator = UserAgentGenerator(
+        os=os, navigator=navigator, device_type=device_type, rng=rng
+    )
+    return generator.navigators_js(count)
+
+
+def iter_variant_navigators(
+    variants,  # type: Sequence[tuple[str, str, str]]
+    count,  # type: None | int
+    rng,  # type: Random
+):
+    # type: (...) -> Iterator[NavigatorDict]
+    """Yield web navigator's configs for randomly chosen items of `variants`.
+
+    :param variants: (device_type, os, navigator) combinations, see
+        `resolve_config_variants`
+    :param count: number of configs to yield, None means infinite stream
+    :param rng: source of randomness
+
+    Weights are looked up for each item, so changes of them are applied
+    to the running stream, see `choose_variant`.
+    """
+    for _ in repeat(None) if count is None else repeat(None, count):
+        device_type, os_id, navigator_id = choose_variant(variants, rng)
+        yield build_navigator(device_type, os_id, navigator_id, rng)
+
+
+def iter_navigators(
+    count=None,  # type: None | int
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+    rng=None,  # type: None | Random
+):
+    # type: (...) -> Iterator[NavigatorDict]
+    """Return iterator yielding web navigator's configs one by one.
+
+    Options are validated immediately and only once, memory used
+    by the iterator does not depend on number of consumed items.
+
+    :param count: number of configs to yield, by default the iterator
+        is infinite
+    :param os: limit list of oses for generation
+    :type os: string or list/tuple or None
+    :param navigator: limit list of browser engines for generation
+    :type navigator: string or list/tuple or None
+    :param device_type: limit possible oses by device type
+    :type device_type: list/tuple or None, possible values:
+        "desktop", "smartphone", "tablet", "all"
+    :param rng: source of randomness, e.g. `random.Random(seed)` for
+        reproducible output, module's `randomizer` (SystemRandom) by default
+    :return: iterator of configs, see `generate_navigator`
+    :raises InvalidOption: if could not generate user-agent for
+        any combination of allowed oses and navigators
+    :raise InvalidOption: if any of passed options is invalid
+    """
+    generator = UserAgentGenerator(
+        os=os, navigator=navigator, device_type=device_type, rng=rng
+    )
+    return generator.iter_navigators(count)
+
+
+def iter_user_agents(
+    count=None,  # type: None | int
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+    rng=None,  # type: None | Random
+):
+    # type: (...) -> Iterator[str]
+    """Return iterator yielding HTTP User-Agent headers one by one.
+
+    Accepts same options as `iter_navigators`.
+    """
+    generator = UserAgentGenerator(
+        os=os, navigator=navigator, device_type=device_type, rng=rng
+    )
+    return generator.iter_user_agents(count)
+
+
+def iter_navigators_js(
+    count=None,  # type: None | int
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+    rng=None,  # type: None | Random
+):
+    # type: (...) -> Iterator[NavigatorDict]
+    """Return iterator yielding configs for `windows.navigator` JS object.
+
+    Accepts same options as `iter_navigators`.
+    """
+    generator = UserAgentGenerator(
+        os=os, navigator=navigator, device_type=device_type, rng=rng
+    )
+    return generator.iter_navigators_js(count)
+
+
+def preload_variant_data(variants):
+    # type: (Sequence[tuple[str, str, str]]) -> None
+    """Load data and compile templates required to build configs of `variants`."""
+    for device_type, os_id, navigator_id in variants:
+        if navigator_id == "firefox":
+            get_firefox_build_table()
+        elif navigator_id == "chrome" and os_id == "android":
+            get_smartphone_dev_ids()
+        tpl_names = (
+            ["ie_11", "ie_less_11"]
+            if navigator_id == "ie"
+            else [choose_ua_template_name(device_type, navigator_id, None)]
+        )
+        for tpl_name in tpl_names:
+            get_ua_renderer(tpl_name)
+
+
+class UserAgentGenerator:
+    """Generator of user agents and web navigator's configs.
+
+    All setup work: validation of options, building of (device, os,
+    navigator) variants, loading of device data and compiling of templates
+    is done once in constructor, so each generated item costs only random
+    draws and string formatting. Alias tables of weights (see OS_WEIGHT)
+    are cached, the generator uses current weights for each item.
+
+    Usage example::
+
+        gen = UserAgentGenerator(os=("win", "mac"), rng=random.Random(42))
+        gen.user_agent()
+        gen.navigators(1000)
+
+    :param os: limit list of oses for generation
+    :type os: string or list/tuple or None
+    :param navigator: limit list of browser engines for generation
+    :type navigator: string or list/tuple or None
+    :param device_type: limit possible oses by device type
+    :type device_type: list/tuple or None, possible values:
+        "desktop", "smartphone", "tablet", "all"
+    :param rng: source of randomness, e.g. `random.Random(seed)` for
+        reproducible output, by default `BufferedSystemRandom` owned by
+        the generator: it reads OS entropy source in large blocks, so
+        bulk generation makes few syscalls
+    :raises InvalidOption: if could not generate user-agent for
+        any combination of allowed oses and navigators
+    :raise InvalidOption: if any of passed options is invalid
+    """
+
+    def __init__(  # noqa: ANN204
+        self,
+        os=None,  # type: None | str | Sequence[str]
+        navigator=None,  # type: None | str | Sequence[str]
+        device_type=None,  # type: None | str | Sequence[str]
+        rng=None,  # type: None | Random
+    ):
+        # type: (...) -> None
+        if rng is None:
+            # imported on demand as it loads hashlib and threading
+            from .randomness import BufferedSystemRandom  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+            rng = BufferedSystemRandom()
+        self.rng = rng  # type: Random
+        self.variants = resolve_config_variants(device_type, os, navigator)
+        preload_variant_data(self.variants)
+
+    def navigator(self):
+        # type: () -> NavigatorDict
+        """Generate web navigator's config, see `generate_navigator`."""
+        device_type, os_id, navigator_id = choose_variant(self.variants, self.rng)
+        return build_navigator(device_type, os_id, navigator_id, self.rng)
+
+    def navigator_js(self):
+        # type: () -> NavigatorDict
+        """Generate config for `windows.navigator` JS object."""
+        return convert_navigator_to_js(self.navigator())
+
+    def user_agent(self):
+        # type: () -> str
+        """Generate HTTP User-Agent header."""
+        user_agent = self.navigator()["user_agent"]
+        assert user_agent is not None
+        return user_agent
+
+    def iter_navigators(self, count=None):
+        # type: (None | int) -> Iterator[NavigatorDict]
+        """Return iterator yielding `count` navigator's configs.
+
+        By default the iterator is infinite.
+        """
+        return iter_variant_navigators(self.variants, count, self.rng)
+
+    def iter_navigators_js(self, count=None):
+        # type: (None | int) -> Iterator[NavigatorDict]
+        """Return iterator yielding `count` configs for `windows.navigator`."""
+        return (
+            convert_navigator_to_js(config)
+            for config in self.iter_navigators(count)
+        )
+
+    def iter_user_agents(self, count=None):
+        # type: (None | int) -> Iterator[str]
+        """Return iterator yielding `count` User-Agent headers."""
+        return (
+            config["user_agent"]  # type: ignore[misc]
+            for config in self.iter_navigators(count)
+        )
+
+    def navigators(self, count):
+        # type: (int) -> list[NavigatorDict]
+        """Generate list of `count` navigator's configs."""
+        return list(self.iter_navigators(count))
+
+    def navigators_js(self, count):
+        # type: (int) -> list[NavigatorDict]
+        """Generate list of `count` configs for `windows.navigator`."""
+        return list(self.iter_navigators_js(count))
+
+    def user_agents(self, count):
+        # type: (int) -> list[str]
+        """Generate list of `count` User-Agent headers."""
+        return list(self.iter_user_agents(count))
+
+    def config(self):
+        # type: () -> NavigatorConfig
+        """Generate compact web navigator's config, see `NavigatorConfig`."""
+        return NavigatorConfig(self.navigator())
+
+    def iter_configs(self, count=None):
+        # type: (None | int) -> Iterator[NavigatorConfig]
+        """Return iterator yielding `count` compact navigator's configs."""
+        return (NavigatorConfig(config) for config in self.iter_navigators(count))
+
+    def configs(self, count):
+        # type: (int) -> list[NavigatorConfig]
+        """Generate list of `count` compact navigator's configs."""
+        return list(self.iter_configs(count))
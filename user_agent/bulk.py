@@ -0,0 +1,197 @@
+"""Generation of large amounts of user agents in a pool of processes.
+
+Generation is pure-python code bound by GIL, so it is spread across worker
+processes. Work is split into chunks, each chunk is generated with its own
+`random.Random` seeded with a seed derived from the master seed and
+the chunk index. Output depends only on the master seed and the chunk size,
+it does not depend on number of processes or on scheduling.
+
+Chunks could also be serialized to text by workers, see `output_format`
+argument of `iter_bulk_chunks`, then the parent process only writes them.
+"""
+# from __future__ import annotations
+
+import csv
+import json
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool, cpu_count
+from random import Random, SystemRandom
+
+from .base import UserAgentGenerator, resolve_config_variants
+from .error import InvalidOption
+from .randomness import derive_seed
+
+try:
+    # python 2, csv module writes byte strings
+    from cStringIO import StringIO  # type: ignore[import-not-found]
+except ImportError:
+    from io import StringIO
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias,consider-alternative-union-syntax
+    from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+    OptionValue = Union[None, str, Sequence[str]]
+    GenerationOptions = Dict[str, OptionValue]
+    ChunkTask = Tuple[int, int, str, GenerationOptions, Optional[str], bool]
+    Chunk = List[Any]
+    # pylint: enable=deprecated-typing-alias,consider-alternative-union-syntax
+
+__all__ = ["iter_bulk_chunks"]
+
+DEFAULT_CHUNK_SIZE = 10000
+# Number of chunks sent to each worker process in advance
+CHUNKS_PER_PROCESS = 2
+BULK_KINDS = ("navigator", "navigator_js", "user_agent")
+BULK_OUTPUT_FORMATS = ("text", "jsonl", "csv")
+
+
+def format_chunk(chunk, output_format, header=False):
+    # type: (Chunk, str, bool) -> str
+    """Serialize chunk of items to text block.
+
+    :param output_format: "text" (one item per line), "jsonl" (one JSON
+        object per line) or "csv" (one row per item)
+    :param header: add CSV header with names of fields
+    """
+    if output_format == "text":
+        return "".join([item + "\n" for item in chunk])
+    if output_format == "jsonl":
+        dumps = json.dumps
+        return "".join([dumps(item) + "\n" for item in chunk])
+    out = StringIO()
+    if chunk:
+        writer = csv.DictWriter(out, fieldnames=list(chunk[0]))
+        if header:
+            writer.writeheader()
+        writer.writerows(chunk)
+    block = out.getvalue()  # type: str
+    return block  # noqa: RET504
+
+
+def generate_chunk(task):
+    # type: (ChunkTask) -> Chunk | str
+    """Generate one chunk of items, it is called in worker process."""
+    seed, size, kind, options, output_format, header = task
+    gen = UserAgentGenerator(rng=Random(seed), **options)  # noqa: S311
+    if kind == "navigator_js":
+        chunk = gen.navigators_js(size)  # type: Chunk
+    elif kind == "user_agent":
+        chunk = gen.user_agents(size)
+    else:
+        chunk = gen.navigators(size)
+    if output_format is None:
+        return chunk
+    return format_chunk(chunk, output_format, header)
+
+
+def iter_chunk_tasks(  # pylint: disable=too-many-positional-arguments
+    count,  # type: int
+    seed,  # type: int
+    chunk_size,  # type: int
+    kind,  # type: str
+    options,  # type: GenerationOptions
+    output_format,  # type: None | str
+):
+    # type: (...) -> Iterator[ChunkTask]
+    for chunk_idx, offset in enumerate(range(0, count, chunk_size)):
+        size = min(chunk_size, count - offset)
+        yield (
+            derive_seed(seed, chunk_idx),
+            size,
+            kind,
+            options,
+            output_format,
+            chunk_idx == 0,
+        )
+
+
+def iter_bulk_chunks(  # pylint: disable=too-many-positional-arguments
+    count,  # type: int
+    kind="navigator",  # type: str
+    seed=None,  # type: None | int
+    processes=None,  # type: None | int
+    chunk_size=DEFAULT_CHUNK_SIZE,  # type: int
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+    output_format=None,  # type: None | str
+):
+    # type: (...) -> Iterator[Any]
+    """Generate `count` items in a pool of processes.
+
+    Items are yielded in chunks (lists of up to `chunk_size` items) in
+    deterministic order. Only few chunks per process are generated
+    in advance, so memory usage does not depend on `count`.
+
+    :param count: total number of items
+    :param kind: type of items: "navigator" (see `generate_navigator`),
+        "navigator_js" (see `generate_navigator_js`) or "user_agent"
+    :param seed: master seed, same seed and chunk size produce same output,
+        by default random seed is used
+    :param processes: number of worker processes, by default number of CPUs,
+        if 1 then items are generated in current process
+    :param chunk_size: number of items generated by worker in one task
+    :param os: limit list of oses for generation
+    :param navigator: limit list of browser engines for generation
+    :param device_type: limit possible oses by device type
+    :param output_format: if set, each chunk is serialized by worker
+        and yielded as text block, see `format_chunk`: "text" for
+        kind "user_agent", "jsonl" or "csv" for other kinds; CSV header
+        is added to the first block
+    :raises InvalidOption: if any of passed options is invalid
+    """
+    if kind not in BULK_KINDS:
+        raise InvalidOption("Option kind has invalid value: {}".format(kind))
+    if output_format is not None and (
+        output_format not in BULK_OUTPUT_FORMATS
+        or (output_format == "text") != (kind == "user_agent")
+    ):
+        raise InvalidOption(
+            "Option output_format has invalid value for items of kind {}: {}".format(
+                kind, output_format
+            )
+        )
+    if chunk_size < 1:
+        raise InvalidOption(
+            "Option chunk_size has invalid value: {}".format(chunk_size)
+        )
+    # validate generation options before starting processes
+    resolve_config_variants(device_type, os, navigator)
+    options = {
+        "os": os,
+        "navigator": navigator,
+        "device_type": device_type,
+    }  # type: GenerationOptions
+    if seed is None:
+        seed = SystemRandom().getrandbits(64)
+    tasks = iter_chunk_tasks(count, seed, chunk_size, kind, options, output_format)
+    if processes == 1:
+        return (generate_chunk(task) for task in tasks)
+    return iter_pool_chunks(tasks, processes)
+
+
+def iter_pool_chunks(tasks, processes):
+    # type: (Iterator[ChunkTask], None | int) -> Iterator[Chunk | str]
+    """Run tasks in pool of processes, yield results in order of tasks."""
+    if processes is None:
+        processes = cpu_count()
+    max_pending = CHUNKS_PER_PROCESS * processes
+    # python 2 Pool does not support context manager protocol
+    pool = Pool(processes)  # pylint: disable=consider-using-with
+    try:
+        pending = deque(
+            pool.apply_async(generate_chunk, (task,))
+            for task in islice(tasks, max_pending)
+        )
+        while pending:
+            chunk = pending.popleft().get()
+            for task in islice(tasks, 1):
+                pending.append(pool.apply_async(generate_chunk, (task,)))
+            yield chunk
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
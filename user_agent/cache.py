@@ -0,0 +1,169 @@
+"""Cache of user agents assigned to keys for limited time.
+
+Unlike `user_agent_for_key` which assigns user agent to key forever,
+`UserAgentCache` generates random config for new key, returns it for
+the same key during `ttl` seconds and then generates new one. Configs
+are kept as compact `NavigatorConfig` objects, so the cache could hold
+millions of keys.
+"""
+# from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from random import Random  # pylint: disable=unused-import
+
+from .base import UserAgentGenerator
+from .config import NavigatorConfig  # pylint: disable=unused-import
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias,consider-alternative-union-syntax
+    from typing import Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+    NavigatorDict = Dict[str, Optional[str]]
+    # (expiration time or None, config)
+    CacheEntry = Tuple[Optional[float], NavigatorConfig]
+    # pylint: enable=deprecated-typing-alias,consider-alternative-union-syntax
+
+__all__ = ["UserAgentCache"]
+
+CACHE_SIZE = 100000
+# time.monotonic is missing in python 2
+monotonic = getattr(time, "monotonic", time.time)  # type: Callable[[], float]
+
+
+class UserAgentCache:  # pylint: disable=too-many-instance-attributes
+    """Keyed cache of generated web navigator's configs.
+
+    Config of new key is generated on first access, then it is returned
+    for the same key until it expires `ttl` seconds later. Least recently
+    used keys are evicted when cache is full. Lookups of live keys do not
+    generate anything. The cache could be shared between threads.
+
+    Usage example::
+
+        cache = UserAgentCache(ttl=3600, max_size=10 ** 6, os="win")
+        cache.user_agent(session_id)
+        cache.stats()
+
+    :param ttl: lifetime of config in seconds, None means no expiration
+    :param max_size: max number of keys
+    :param os: limit list of oses for generation
+    :type os: string or list/tuple or None
+    :param navigator: limit list of browser engines for generation
+    :type navigator: string or list/tuple or None
+    :param device_type: limit possible oses by device type
+    :type device_type: list/tuple or None, possible values:
+        "desktop", "smartphone", "tablet", "all"
+    :param rng: source of randomness, see `UserAgentGenerator`
+    :param clock: function returning current time in seconds,
+        `time.monotonic` by default
+    :raises InvalidOption: if any of options is invalid or options conflict
+    """
+
+    def __init__(  # noqa: ANN204 pylint: disable=too-many-positional-arguments
+        self,
+        ttl=None,  # type: None | float
+        max_size=CACHE_SIZE,  # type: int
+        os=None,  # type: None | str | Sequence[str]
+        navigator=None,  # type: None | str | Sequence[str]
+        device_type=None,  # type: None | str | Sequence[str]
+        rng=None,  # type: None | Random
+        clock=monotonic,  # type: Callable[[], float]
+    ):
+        # type: (...) -> None
+        if max_size < 1:
+            raise ValueError("Size of cache must be positive")
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.generator = UserAgentGenerator(
+            os=os, navigator=navigator, device_type=device_type, rng=rng
+        )
+        self.entries = OrderedDict()  # type: OrderedDict[Hashable, CacheEntry]
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):  # noqa: ANN204
+        # type: () -> int
+        return len(self.entries)
+
+    def get_entry(self, key):
+        # type: (Hashable) -> CacheEntry
+        """Return live entry of key, create it if needed.
+
+        Must be called with acquired lock.
+        """
+        entries = self.entries
+        try:
+            # pop and insert again to move item to the end, works in python 2
+            entry = entries.pop(key)
+        except KeyError:
+            entry = None
+        now = self.clock()
+        if entry is not None and (entry[0] is None or entry[0] > now):
+            self.hits += 1
+        else:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.expirations += 1
+            if len(entries) >= self.max_size:
+                entries.popitem(last=False)
+                self.evictions += 1
+            entry = (
+                None if self.ttl is None else now + self.ttl,
+                self.generator.config(),
+            )
+        entries[key] = entry
+        return entry
+
+    def navigator(self, key):
+        # type: (Hashable) -> NavigatorDict
+        """Return web navigator's config of key, see `generate_navigator`."""
+        with self.lock:
+            return self.get_entry(key)[1].to_dict()
+
+    def navigator_js(self, key):
+        # type: (Hashable) -> NavigatorDict
+        """Return config for `windows.navigator` of key."""
+        with self.lock:
+            return self.get_entry(key)[1].to_js()
+
+    def user_agent(self, key):
+        # type: (Hashable) -> str
+        """Return User-Agent header of key."""
+        with self.lock:
+            return self.get_entry(key)[1].user_agent  # type: ignore[return-value]
+
+    def invalidate(self, key):
+        # type: (Hashable) -> None
+        """Forget config of key, next access generates new one."""
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        # type: () -> None
+        """Forget all keys, counters are not reset."""
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        # type: () -> dict[str, int]
+        """Return dict of counters: size, hits, misses, evictions, expirations.
+
+        Misses count new keys, expirations count keys which got new config
+        because old one expired.
+        """
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
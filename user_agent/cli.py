@@ -1,21 +1,172 @@
+import errno
+import io
 import json
+import os
+import sys
 from argparse import ArgumentParser
+from random import Random
 
 from user_agent import generate_navigator_js
+from user_agent.compat import text_type
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from argparse import Namespace
+    from typing import IO, Iterable
 
-def script_ua():
-    # type: () -> None
+OUTPUT_FORMATS = ("text", "jsonl", "csv")
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+BULK_CHUNK_SIZE = 10000
+
+
+def build_parser():
+    # type: () -> ArgumentParser
     parser = ArgumentParser()
-    parser.add_argument("-e", "--extended", action="store_true", default=False)
+    parser.add_argument(
+        "-e",
+        "--extended",
+        action="store_true",
+        default=False,
+        help="output navigator config as JSON instead of user agent",
+    )
     parser.add_argument("-o", "--os")
     parser.add_argument("-n", "--navigator")
     parser.add_argument("-d", "--device-type")
-    opts = parser.parse_args()
-    nav = generate_navigator_js(
-        os=opts.os, navigator=opts.navigator, device_type=opts.device_type
+    parser.add_argument(
+        "-c",
+        "--count",
+        type=int,
+        help="generate COUNT items, one per line",
     )
-    if opts.extended:
-        print(json.dumps(nav, indent=2))
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help=(
+            "output format of bulk mode: user agents (text),"
+            " navigator configs (jsonl, csv)"
+        ),
+    )
+    parser.add_argument("--seed", type=int, help="seed for reproducible output")
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=int,
+        default=1,
+        help="number of processes generating items in bulk mode",
+    )
+    parser.add_argument("--output", help="write output to file instead of stdout")
+    parser.add_argument(
+        "--serve",
+        metavar="ADDRESS",
+        help=(
+            "serve JSON configs over HTTP on HOST:PORT or unix:PATH,"
+            " -o/-n/-d options are defaults of requests"
+        ),
+    )
+    parser.add_argument(
+        "--buffer-size",
+        type=int,
+        help="number of pre-generated configs per set of options in service mode",
+    )
+    return parser
+
+
+def run_service(parser, opts):
+    # type: (ArgumentParser, Namespace) -> None
+    if opts.buffer_size is not None and opts.buffer_size < 1:
+        parser.error("argument --buffer-size: must be positive")
+    if sys.version_info < (3,):  # noqa: UP036 python 2 compatible
+        parser.error("argument --serve: service requires python 3")
+    # imported on demand as they start threads, service is python 3 only
+    from user_agent.prefetch import PREFETCH_SIZE  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+    from user_agent.service import serve  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    sys.stderr.write("Serving user agents on {}\n".format(opts.serve))
+    try:
+        serve(
+            opts.serve,
+            size=PREFETCH_SIZE if opts.buffer_size is None else opts.buffer_size,
+            os=opts.os,
+            navigator=opts.navigator,
+            device_type=opts.device_type,
+        )
+    except ValueError as ex:
+        parser.error("argument --serve: {}".format(ex))
+
+
+def write_bulk_output(out, opts):
+    # type: (IO[str], Namespace) -> None
+    """Generate `opts.count` items and write them to `out` in large blocks.
+
+    Items are serialized by worker processes, see `iter_bulk_chunks`.
+    """
+    # imported on demand as multiprocessing is slow to import
+    from user_agent.bulk import iter_bulk_chunks  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    if opts.format == "text" and not opts.extended:
+        kind, output_format = "user_agent", "text"
+    else:
+        kind = "navigator_js"
+        output_format = "jsonl" if opts.format == "text" else opts.format
+    blocks = iter_bulk_chunks(
+        opts.count,
+        kind=kind,
+        seed=opts.seed,
+        processes=opts.processes,
+        chunk_size=BULK_CHUNK_SIZE,
+        os=opts.os,
+        navigator=opts.navigator,
+        device_type=opts.device_type,
+        output_format=output_format,
+    )  # type: Iterable[str]
+    for block in blocks:
+        out.write(text_type(block))
+
+
+def script_ua():
+    # type: () -> None
+    parser = build_parser()
+    opts = parser.parse_args()
+    if opts.serve is not None:
+        run_service(parser, opts)
+        return
+    if opts.count is None and opts.format == "text" and opts.output is None:
+        nav = generate_navigator_js(
+            os=opts.os,
+            navigator=opts.navigator,
+            device_type=opts.device_type,
+            rng=None if opts.seed is None else Random(opts.seed),  # noqa: S311
+        )
+        if opts.extended:
+            print(json.dumps(nav, indent=2))
+        else:
+            print(nav["userAgent"])
+        return
+    if opts.count is None:
+        opts.count = 1
+    if opts.count < 0:
+        parser.error("argument -c/--count: must be non-negative")
+    if opts.processes < 1:
+        parser.error("argument -p/--processes: must be positive")
+    if opts.output is None:
+        try:
+            write_bulk_output(sys.stdout, opts)
+            sys.stdout.flush()
+        except IOError as ex:  # noqa: UP024 python 2 compatible
+            # output is piped to a program which exited, e.g. `ua -c 1000 | head`
+            if ex.errno != errno.EPIPE:
+                raise
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(1)
     else:
-        print(nav["userAgent"])
+        # io.open accepts encoding and newline arguments in python 2 too
+        with io.open(  # noqa: UP020
+            opts.output,
+            "w",
+            buffering=OUTPUT_BUFFER_SIZE,
+            encoding="utf-8",
+            newline="" if opts.format == "csv" else None,
+        ) as out:
+            write_bulk_output(out, opts)
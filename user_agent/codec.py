@@ -0,0 +1,118 @@
+"""Encoding of web navigator's configs into 64-bit integers.
+
+Each generated config is fully defined by few items of data tables, so it
+is stored as its index in `UserAgentSpace(device_type="all",
+mode="navigator")` plus version of code format in high bits::
+
+    code = encode_navigator(generate_navigator())
+    decode_navigator(code)  # same dict again
+
+Codes take 8 bytes instead of about a kilobyte of dict, arrays of codes
+could be saved to files or shared between processes as raw bytes.
+
+Codes depend on content of data tables: CODE_VERSION is increased when
+tables of the package change, decoding of code of other version fails.
+"""
+# from __future__ import annotations
+
+from array import array
+
+from .space import UserAgentSpace
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias,consider-alternative-union-syntax
+    from typing import Dict, Iterable, Iterator, Mapping, Optional
+
+    NavigatorDict = Dict[str, Optional[str]]
+    # pylint: enable=deprecated-typing-alias,consider-alternative-union-syntax
+
+__all__ = [
+    "decode_navigator",
+    "decode_navigators",
+    "encode_navigator",
+    "encode_navigators",
+]
+
+
+def probe_array_itemsize(typecode):
+    # type: (str) -> int
+    """Return item size of `array` typecode, 0 if typecode is not supported."""
+    try:
+        return array(typecode).itemsize
+    except ValueError:
+        return 0
+
+# Version of code format, stored in high byte of each code
+CODE_VERSION = 2
+CODE_INDEX_BITS = 56
+CODE_INDEX_MASK = (1 << CODE_INDEX_BITS) - 1
+# Typecode of `array` of unsigned 64-bit integers, python 2 does not
+# support "Q", its "L" is 64-bit on most platforms except Windows
+CODE_ARRAY_TYPE = next(
+    (code for code in ("Q", "L") if probe_array_itemsize(code) == 8),  # noqa: PLR2004
+    None,
+)  # type: None | str
+CODE_SPACE = []  # type: list[UserAgentSpace]
+
+
+def get_code_space():
+    # type: () -> UserAgentSpace
+    """Return space of all configs, it is created on first use."""
+    if not CODE_SPACE:
+        space = UserAgentSpace(device_type="all", mode="navigator")
+        assert len(space) <= CODE_INDEX_MASK
+        CODE_SPACE.append(space)
+    return CODE_SPACE[0]
+
+
+def encode_navigator(config):
+    # type: (Mapping[str, None | str]) -> int
+    """Encode web navigator's config into 64-bit unsigned integer.
+
+    :param config: config returned by `generate_navigator` or
+        `NavigatorConfig`
+    :raises ValueError: if config was not generated by the package
+    """
+    index = get_code_space().navigator_index(config)
+    return (CODE_VERSION << CODE_INDEX_BITS) | index
+
+
+def decode_navigator(code):
+    # type: (int) -> NavigatorDict
+    """Decode integer returned by `encode_navigator` into navigator's config.
+
+    :return: dict, see `generate_navigator`
+    :raises ValueError: if code is invalid or has other version
+    """
+    version = code >> CODE_INDEX_BITS
+    if version != CODE_VERSION:
+        raise ValueError(
+            "Code version {} does not match {}".format(version, CODE_VERSION)
+        )
+    try:
+        return get_code_space().navigator(code & CODE_INDEX_MASK)
+    except IndexError:
+        pass
+    raise ValueError("Invalid code: {}".format(code))
+
+
+def encode_navigators(configs):
+    # type: (Iterable[Mapping[str, None | str]]) -> array[int] | list[int]
+    """Encode configs into array of unsigned 64-bit integers.
+
+    Use `array.tobytes()` to get 8 bytes per config in native byte order.
+    Codes are returned as list if platform has no `array` typecode
+    of 64-bit integers (python 2 on Windows).
+    """
+    codes = (encode_navigator(config) for config in configs)
+    if CODE_ARRAY_TYPE is None:
+        return list(codes)
+    return array(CODE_ARRAY_TYPE, codes)
+
+
+def decode_navigators(codes):
+    # type: (Iterable[int]) -> Iterator[NavigatorDict]
+    """Decode configs lazily, see `decode_navigator`."""
+    for code in codes:
+        yield decode_navigator(code)
@@ -0,0 +1,58 @@
+"""Helpers for python versions which lack features used by the package."""
+# from __future__ import annotations
+
+import sys
+from types import ModuleType
+
+# Do not import typing at runtime, it slows down importing of the package
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+try:
+    # python 2, range builds list
+    lazy_range = xrange  # type: ignore[name-defined] # noqa: F821 # pylint: disable=undefined-variable
+except NameError:
+    lazy_range = range  # pylint: disable=invalid-name
+
+try:
+    # python 2, str is bytes
+    text_type = unicode  # type: ignore[name-defined] # noqa: F821 # pylint: disable=undefined-variable
+except NameError:
+    text_type = str  # pylint: disable=invalid-name
+
+# Original modules replaced in sys.modules by `enable_module_getattr`,
+# python 2 clears namespace of module when module object is destroyed
+REPLACED_MODULES = []  # type: list[ModuleType]
+
+
+class LazyAttributeModule(ModuleType):
+    """Module which looks up missing attributes with its `__getattr__` function."""
+
+    def __getattr__(self, name):  # noqa: ANN204
+        # type: (str) -> Any
+        getter = self.__dict__.get("__getattr__")
+        if getter is None:
+            raise AttributeError(
+                "module {!r} has no attribute {!r}".format(self.__name__, name)
+            )
+        return getter(name)
+
+
+def enable_module_getattr(name):
+    # type: (str) -> None
+    """Make module-level `__getattr__` of module `name` work on python < 3.7.
+
+    Python 3.7+ supports it natively (PEP 562), there the call does nothing.
+    Call it at the end of module body.
+    """
+    if sys.version_info >= (3, 7):  # noqa: UP036 python 2 compatible
+        return
+    module = sys.modules[name]
+    try:
+        module.__class__ = LazyAttributeModule
+    except TypeError:  # python 2 does not allow to change class of module
+        replacement = LazyAttributeModule(name)
+        replacement.__dict__.update(module.__dict__)
+        REPLACED_MODULES.append(module)
+        sys.modules[name] = replacement
@@ -0,0 +1,186 @@
+"""Compact read-only web navigator's config.
+
+Dict returned by `generate_navigator` takes about a kilobyte of memory:
+hash table of 14 keys plus freshly formatted strings of values.
+`NavigatorConfig` keeps values in `__slots__` and shares equal strings
+between configs, so millions of configs could be kept in memory.
+"""
+# from __future__ import annotations
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # python 2
+    # pylint: disable=deprecated-class
+    from collections import Mapping  # type: ignore[attr-defined] # noqa: UP035
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias,consider-alternative-union-syntax
+    from typing import Callable, Dict, Iterator, Optional
+
+    NavigatorDict = Dict[str, Optional[str]]
+    # pylint: enable=deprecated-typing-alias,consider-alternative-union-syntax
+
+__all__ = ["NavigatorConfig"]
+
+# Keys of config in same order as `generate_navigator` returns them
+NAVIGATOR_FIELDS = (
+    "os_id",
+    "navigator_id",
+    "platform",
+    "oscpu",
+    "build_version",
+    "build_id",
+    "app_version",
+    "app_name",
+    "app_code_name",
+    "product",
+    "product_sub",
+    "vendor",
+    "vendor_sub",
+    "user_agent",
+)
+NAVIGATOR_FIELD_SET = frozenset(NAVIGATOR_FIELDS)
+# Fields which have same value in all configs
+NAVIGATOR_CONSTANTS = {
+    "app_code_name": "Mozilla",
+    "product": "Gecko",
+    "vendor_sub": "",
+}
+# Table of shared strings, see `intern_value`
+INTERN_CACHE_SIZE = 100000
+INTERN_CACHE = {}  # type: dict[str, str]
+
+
+def intern_value(value):
+    # type: (None | str) -> None | str
+    """Return shared string equal to `value`.
+
+    Equal values of configs are stored once. Unlike `sys.intern` the table
+    is bounded: it is cleared when it is full, strings shared before are
+    still shared.
+    """
+    if value is None:
+        return None
+    try:
+        return INTERN_CACHE[value]
+    except KeyError:
+        if len(INTERN_CACHE) >= INTERN_CACHE_SIZE:
+            INTERN_CACHE.clear()
+        INTERN_CACHE[value] = value
+        return value
+
+
+class NavigatorConfig(Mapping):  # type: ignore[type-arg] # pylint: disable=too-many-instance-attributes
+    """Compact read-only web navigator's config.
+
+    Config is a `Mapping` with same keys as dict returned by
+    `generate_navigator`, so code reading `config["user_agent"]` keeps
+    working, values are also available as attributes::
+
+        config = NavigatorConfig(generate_navigator())
+        config.user_agent
+        config.to_dict()
+        config.to_js()
+
+    Assigning or deleting attributes raises AttributeError.
+
+    :param config: dict returned by `generate_navigator`
+    """
+
+    # slots are declared as class variables for type checkers only
+    # pylint: disable=class-variable-slots-conflict
+    __slots__ = (
+        "app_name",
+        "app_version",
+        "build_id",
+        "build_version",
+        "navigator_id",
+        "os_id",
+        "oscpu",
+        "platform",
+        "product_sub",
+        "user_agent",
+        "vendor",
+    )
+    # pylint: enable=class-variable-slots-conflict
+    app_code_name = NAVIGATOR_CONSTANTS["app_code_name"]
+    product = NAVIGATOR_CONSTANTS["product"]
+    vendor_sub = NAVIGATOR_CONSTANTS["vendor_sub"]
+
+    if TYPE_CHECKING:
+        os_id = None  # type: None | str
+        navigator_id = None  # type: None | str
+        platform = None  # type: None | str
+        oscpu = None  # type: None | str
+        build_version = None  # type: None | str
+        build_id = None  # type: None | str
+        app_version = None  # type: None | str
+        app_name = None  # type: None | str
+        product_sub = None  # type: None | str
+        vendor = None  # type: None | str
+        user_agent = None  # type: None | str
+
+    def __init__(self, config):  # noqa: ANN204
+        # type: (Mapping[str, None | str]) -> None
+        for key, set_value in SLOT_SETTERS:
+            set_value(self, intern_value(config[key]))
+
+    def __setattr__(self, name, value):  # noqa: ANN204
+        # type: (str, object) -> None
+        raise AttributeError("NavigatorConfig is read-only")
+
+    def __delattr__(self, name):  # noqa: ANN204
+        # type: (str) -> None
+        raise AttributeError("NavigatorConfig is read-only")
+
+    def __getitem__(self, key):  # noqa: ANN204
+        # type: (str) -> None | str
+        if key not in NAVIGATOR_FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)  # type: ignore[no-any-return]
+
+    def __iter__(self):  # noqa: ANN204
+        # type: () -> Iterator[str]
+        return iter(NAVIGATOR_FIELDS)
+
+    def __len__(self):  # noqa: ANN204
+        # type: () -> int
+        return len(NAVIGATOR_FIELDS)
+
+    def __repr__(self):  # noqa: ANN204
+        # type: () -> str
+        return "NavigatorConfig({!r})".format(self.to_dict())
+
+    def __reduce__(self):  # noqa: ANN204
+        # type: () -> tuple[type[NavigatorConfig], tuple[NavigatorDict]]
+        return NavigatorConfig, (self.to_dict(),)
+
+    def to_dict(self):
+        # type: () -> NavigatorDict
+        """Return config as dict, same as `generate_navigator` returns."""
+        return {key: getattr(self, key) for key in NAVIGATOR_FIELDS}
+
+    def to_js(self):
+        # type: () -> NavigatorDict
+        """Return config for `windows.navigator`, see `generate_navigator_js`."""
+        return {
+            "appCodeName": self.app_code_name,
+            "appName": self.app_name,
+            "appVersion": self.app_version,
+            "platform": self.platform,
+            "userAgent": self.user_agent,
+            "oscpu": self.oscpu,
+            "product": self.product,
+            "productSub": self.product_sub,
+            "vendor": self.vendor,
+            "vendorSub": self.vendor_sub,
+            "buildID": self.build_id,
+        }
+
+
+# Setters of slots of NavigatorConfig, its attributes could not be assigned
+# in usual way, see `NavigatorConfig.__setattr__`
+SLOT_SETTERS = tuple(
+    (key, NavigatorConfig.__dict__[key].__set__) for key in NavigatorConfig.__slots__
+)  # type: tuple[tuple[str, Callable[[NavigatorConfig, None | str], None]], ...]
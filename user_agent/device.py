@@ -1,22 +1,71 @@
+"""Device data bundled with the package.
+
+Data is loaded from JSON files on first access, importing the module
+does not read anything. Use `get_smartphone_dev_ids` and `get_tablet_dev_ids`
+accessors or module attributes `SMARTPHONE_DEV_IDS` and `TABLET_DEV_IDS`.
+"""
 # from __future__ import annotations
 
-import json
-import pkgutil
-from typing import Any, Dict, List, cast
+from .compat import enable_module_getattr
+
+# Do not import typing at runtime, it slows down importing of the package
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias
+    from typing import Any, Callable, Dict, List
 
-# pylint: disable=deprecated-typing-alias
-DataStore = List[Dict[str, Any]]
-# pylint: enable=deprecated-typing-alias
+    DataStore = List[Dict[str, Any]]
+    # pylint: enable=deprecated-typing-alias
+
+SMARTPHONE_DEV_IDS_LOCATION = "data/smartphone_dev_id.json"
+TABLET_DEV_IDS_LOCATION = "data/tablet_dev_id.json"
+DATA_CACHE = {}  # type: dict[str, DataStore]
 
 
 def load_package_json_data(location):
     # type: (str) -> DataStore
-    return cast(
-        DataStore, json.loads(cast(bytes, pkgutil.get_data("user_agent", location)))
-    )
+    # json and pkgutil are used only here, import them on demand
+    import json  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+    import pkgutil  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    data = pkgutil.get_data("user_agent", location)
+    assert data is not None
+    result = json.loads(data.decode("utf-8"))  # type: DataStore
+    return result  # noqa: RET504
+
+
+def get_package_json_data(location):
+    # type: (str) -> DataStore
+    """Return data of package JSON file, file is loaded only once."""
+    try:
+        return DATA_CACHE[location]
+    except KeyError:
+        data = DATA_CACHE[location] = load_package_json_data(location)
+        return data
+
+
+def get_smartphone_dev_ids():
+    # type: () -> DataStore
+    return get_package_json_data(SMARTPHONE_DEV_IDS_LOCATION)
+
+
+def get_tablet_dev_ids():
+    # type: () -> DataStore
+    return get_package_json_data(TABLET_DEV_IDS_LOCATION)
+
+
+LAZY_ATTRIBUTES = {
+    "SMARTPHONE_DEV_IDS": get_smartphone_dev_ids,
+    "TABLET_DEV_IDS": get_tablet_dev_ids,
+}  # type: dict[str, Callable[[], DataStore]]
+
+
+def __getattr__(name):
+    # type: (str) -> DataStore
+    """Load device data on first access to module attribute."""
+    if name in LAZY_ATTRIBUTES:
+        return LAZY_ATTRIBUTES[name]()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
-SMARTPHONE_DEV_IDS = load_package_json_data(
-    "data/smartphone_dev_id.json"
-)  # type: DataStore
-TABLET_DEV_IDS = load_package_json_data("data/tablet_dev_id.json")  # type: DataStore
+enable_module_getattr(__name__)
@@ -1,4 +1,9 @@
-__all__ = ["InvalidOption", "InvalidOptionError", "UserAgentError"]
+__all__ = [
+    "InvalidOption",
+    "InvalidOptionError",
+    "PoolExhaustedError",
+    "UserAgentError",
+]
 
 
 class UserAgentError(Exception):
@@ -9,4 +14,8 @@ class InvalidOptionError(UserAgentError):
     """Raises when user_agent library methods are called with incorrect arguments."""
 
 
+class PoolExhaustedError(UserAgentError):
+    """Raises when more items are requested from pool than it has left."""
+
+
 InvalidOption = InvalidOptionError  # for backward compatibility
@@ -0,0 +1,263 @@
+"""Parsing of User-Agent headers back into navigator's config fields.
+
+Parser inverts USER_AGENT_TEMPLATE: each template is compiled into regular
+expression once, then parsing of a header costs one substring check and one
+regex match. Results of recent headers are kept in bounded LRU cache,
+so repeated headers from logs are parsed once.
+"""
+# from __future__ import annotations
+
+import re
+from collections import OrderedDict
+
+from . import base
+from .base import split_ua_template
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias,consider-alternative-union-syntax
+    from typing import (
+        Dict,
+        Iterable,
+        Iterator,
+        List,
+        Match,
+        Optional,
+        Pattern,
+        Tuple,
+    )
+
+    ParsedConfig = Dict[str, Optional[str]]
+    TemplatePatterns = List[Tuple[str, Pattern[str]]]
+    # pylint: enable=deprecated-typing-alias,consider-alternative-union-syntax
+
+__all__ = ["UserAgentParser", "parse_user_agent", "parse_user_agents"]
+
+PARSE_CACHE_SIZE = 10000
+# Regular expressions of values of USER_AGENT_TEMPLATE fields
+UA_FIELD_PATTERNS = {
+    "ua_platform": r"[^()]+?",
+    "build_version": r"(?:MSIE )?[^\s;()]+",
+    "geckotrail": r"[^\s;()]+",
+    "trident_version": r"[^;()]+?",
+}
+# Build versions of templates which do not contain build version field
+TEMPLATE_BUILD_VERSION = {"ie_11": "MSIE 11.0"}
+# Substrings which identify navigator of user agent, checked in order
+NAVIGATOR_MARKERS = (
+    ("ie", "Trident/"),
+    ("firefox", "Firefox/"),
+    ("chrome", "Chrome/"),
+)
+
+
+def compile_ua_pattern(template):
+    # type: (str) -> Pattern[str]
+    """Compile user agent template into regular expression.
+
+    Each placeholder like "{system[ua_platform]}" becomes named group,
+    repeated placeholder must match same value as first one.
+    """
+    parts = []
+    seen = set()
+    for literal, key in split_ua_template(template):
+        parts.append(re.escape(literal))
+        if key is None:
+            continue
+        if key in seen:
+            parts.append("(?P={})".format(key))
+        else:
+            seen.add(key)
+            parts.append("(?P<{}>{})".format(key, UA_FIELD_PATTERNS[key]))
+    return re.compile(r"\A{}\Z".format("".join(parts)))
+
+
+def build_template_patterns():
+    # type: () -> dict[str, TemplatePatterns]
+    """Compile USER_AGENT_TEMPLATE items grouped by navigator.
+
+    Returns dict {navigator_id: [(template name, pattern), ...]}, templates
+    with identical text are compiled once.
+    """
+    result = {}  # type: dict[str, TemplatePatterns]
+    seen = set()
+    for tpl_name, template in sorted(base.USER_AGENT_TEMPLATE.items()):
+        if template in seen:
+            continue
+        seen.add(template)
+        navigator_id = tpl_name.split("_")[0]
+        result.setdefault(navigator_id, []).append(
+            (tpl_name, compile_ua_pattern(template))
+        )
+    return result
+
+
+def parse_ua_platform(ua_platform):
+    # type: (str) -> tuple[str, None | str, None | str] | None
+    """Detect os of user agent platform.
+
+    :return: tuple (os_id, platform, oscpu) where platform and oscpu are same
+        as `generate_navigator` returns, they are None for android because
+        its cpu is not visible in user agent; None if os is unknown
+    """
+    if ua_platform.startswith("Windows NT "):
+        return "win", ua_platform, ua_platform
+    if ua_platform.startswith("X11; ") and "Linux " in ua_platform:
+        return "linux", ua_platform, "Linux {}".format(ua_platform.split("Linux ")[1])
+    if ua_platform.startswith("Macintosh; Intel Mac OS X "):
+        return (
+            "mac",
+            "MacIntel",
+            "Intel Mac OS X {}".format(ua_platform.split(" ")[-1]),
+        )
+    if "Android " in ua_platform:
+        return "android", None, None
+    return None
+
+
+def detect_device_type(os_id, tpl_name, ua_platform):
+    # type: (str, str, str) -> str
+    if os_id != "android":
+        return "desktop"
+    if tpl_name == "chrome_smartphone" or ua_platform.endswith("; Mobile"):
+        return "smartphone"
+    return "tablet"
+
+
+def detect_navigator(user_agent):
+    # type: (str) -> None | str
+    for navigator_id, marker in NAVIGATOR_MARKERS:
+        if marker in user_agent:
+            return navigator_id
+    return None
+
+
+def match_template(user_agent, patterns):
+    # type: (str, TemplatePatterns) -> tuple[str, Match[str]] | None
+    """Return (template name, match) of first pattern matching user agent."""
+    for tpl_name, pattern in patterns:
+        match = pattern.match(user_agent)
+        if match is not None:
+            return tpl_name, match
+    return None
+
+
+def match_user_agent(user_agent, template_patterns):
+    # type: (str, dict[str, TemplatePatterns]) -> tuple[str, str, Match[str]] | None
+    """Find template of User-Agent header.
+
+    :param template_patterns: patterns built by `build_template_patterns`
+    :return: tuple (navigator_id, template name, match) or None
+    """
+    navigator_id = detect_navigator(user_agent)
+    if navigator_id is None:
+        return None
+    matched = match_template(user_agent, template_patterns.get(navigator_id, []))
+    if matched is None:
+        return None
+    tpl_name, match = matched
+    return navigator_id, tpl_name, match
+
+
+def parse_user_agent_uncached(user_agent, template_patterns):
+    # type: (str, dict[str, TemplatePatterns]) -> ParsedConfig | None
+    """Parse User-Agent header, see `UserAgentParser.parse`."""
+    matched = match_user_agent(user_agent, template_patterns)
+    if matched is None:
+        return None
+    navigator_id, tpl_name, match = matched
+    ua_platform = match.group("ua_platform")
+    os_info = parse_ua_platform(ua_platform)
+    if os_info is None:
+        return None
+    os_id, platform, oscpu = os_info
+    build_version = TEMPLATE_BUILD_VERSION.get(tpl_name) or match.group("build_version")
+    return {
+        "device_type": detect_device_type(os_id, tpl_name, ua_platform),
+        "os_id": os_id,
+        "navigator_id": navigator_id,
+        "build_version": build_version,
+        "platform": platform,
+        "oscpu": oscpu,
+        "user_agent": user_agent,
+    }
+
+
+class UserAgentParser:
+    """Parser of User-Agent headers into navigator's config fields.
+
+    Templates are compiled in constructor, results are cached in LRU cache
+    of `cache_size` items.
+
+    Usage example::
+
+        parser = UserAgentParser()
+        parser.parse(user_agent)
+        for config in parser.parse_many(open("access.log")):
+            ...
+
+    :param cache_size: max number of cached results, 0 disables cache
+    """
+
+    def __init__(self, cache_size=PARSE_CACHE_SIZE):  # noqa: ANN204
+        # type: (int) -> None
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # type: OrderedDict[str, ParsedConfig | None]
+        self.template_patterns = build_template_patterns()
+
+    def parse(self, user_agent):
+        # type: (str) -> ParsedConfig | None
+        """Parse User-Agent header.
+
+        :return: dict with keys (device_type, os_id, navigator_id,
+            build_version, platform, oscpu, user_agent) with same values
+            as `generate_navigator` returns or None if header does not
+            match any of USER_AGENT_TEMPLATE items. Platform and oscpu
+            are None for android.
+        """
+        cache = self.cache
+        try:
+            # pop and insert again to move item to the end, works in python 2
+            result = cache.pop(user_agent)
+        except KeyError:
+            result = parse_user_agent_uncached(user_agent, self.template_patterns)
+            if not self.cache_size:
+                return result
+            if len(cache) >= self.cache_size:
+                cache.popitem(last=False)
+        cache[user_agent] = result
+        return None if result is None else dict(result)
+
+    def parse_many(self, user_agents):
+        # type: (Iterable[str]) -> Iterator[ParsedConfig | None]
+        """Parse User-Agent headers one by one.
+
+        Surrounding whitespace of each header is stripped, so lines of a file
+        could be passed as is.
+        """
+        parse = self.parse
+        for user_agent in user_agents:
+            yield parse(user_agent.strip())
+
+
+DEFAULT_PARSER = []  # type: list[UserAgentParser]
+
+
+def get_default_parser():
+    # type: () -> UserAgentParser
+    """Return parser shared by module functions, it is created on first use."""
+    if not DEFAULT_PARSER:
+        DEFAULT_PARSER.append(UserAgentParser())
+    return DEFAULT_PARSER[0]
+
+
+def parse_user_agent(user_agent):
+    # type: (str) -> ParsedConfig | None
+    """Parse User-Agent header, see `UserAgentParser.parse`."""
+    return get_default_parser().parse(user_agent)
+
+
+def parse_user_agents(user_agents):
+    # type: (Iterable[str]) -> Iterator[ParsedConfig | None]
+    """Parse User-Agent headers lazily, see `UserAgentParser.parse_many`."""
+    return get_default_parser().parse_many(user_agents)
@@ -0,0 +1,136 @@
+"""Pool of distinct user agents sampled without replacement.
+
+Pool shuffles indexes of `UserAgentSpace` with `RandomPermutation`, so
+no user agent is returned twice until the pool is reset, each item costs
+constant time and memory used by the pool does not depend on its size.
+"""
+# from __future__ import annotations
+
+from random import Random  # pylint: disable=unused-import
+
+from . import base
+from .error import PoolExhaustedError
+from .sampling import RandomPermutation
+from .space import UserAgentSpace
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias,consider-alternative-union-syntax
+    from typing import Dict, Iterator, Optional, Sequence
+
+    NavigatorDict = Dict[str, Optional[str]]
+    # pylint: enable=deprecated-typing-alias,consider-alternative-union-syntax
+
+__all__ = ["UserAgentPool"]
+
+
+class UserAgentPool:
+    """Pool of distinct user agents returned in random order without repeats.
+
+    Usage example::
+
+        pool = UserAgentPool(os="win", rng=random.Random(1))
+        pool.take(10)
+        pool.remaining
+        pool.reset()
+
+    :param os: limit list of oses
+    :type os: string or list/tuple or None
+    :param navigator: limit list of browser engines
+    :type navigator: string or list/tuple or None
+    :param device_type: limit possible oses by device type
+    :type device_type: list/tuple or None, possible values:
+        "desktop", "smartphone", "tablet", "all"
+    :param rng: source of randomness, e.g. `random.Random(seed)` for
+        reproducible order, module's `base.randomizer` by default
+    :param mode: "user_agent" (default) for pool of distinct user agents,
+        "navigator" for pool of distinct navigator's configs,
+        see `UserAgentSpace`
+    :raises InvalidOption: if any of options is invalid or options conflict
+    """
+
+    def __init__(  # noqa: ANN204
+        self,
+        os=None,  # type: None | str | Sequence[str]
+        navigator=None,  # type: None | str | Sequence[str]
+        device_type=None,  # type: None | str | Sequence[str]
+        rng=None,  # type: None | Random
+        mode="user_agent",  # type: str
+    ):
+        # type: (...) -> None
+        self.space = UserAgentSpace(
+            os=os, navigator=navigator, device_type=device_type, mode=mode
+        )
+        self.rng = base.randomizer if rng is None else rng
+        self.permutation = RandomPermutation(len(self.space), self.rng)
+        self.position = 0
+
+    def __len__(self):  # noqa: ANN204
+        # type: () -> int
+        """Return total number of items in pool."""
+        return len(self.space)
+
+    @property
+    def remaining(self):
+        # type: () -> int
+        """Number of items which could be taken before pool is exhausted."""
+        return len(self.space) - self.position
+
+    @property
+    def exhausted(self):
+        # type: () -> bool
+        """True if all items of pool have been taken."""
+        return self.position >= len(self.space)
+
+    def reset(self):
+        # type: () -> None
+        """Return all items to the pool and shuffle them in new order."""
+        self.permutation = RandomPermutation(len(self.space), self.rng)
+        self.position = 0
+
+    def take_indexes(self, count):
+        # type: (int) -> range
+        """Reserve `count` next positions of permutation.
+
+        :raises PoolExhaustedError: if pool has less than `count` items left,
+            no items are taken in this case
+        """
+        if count < 0:
+            raise ValueError("Count must not be negative")
+        if count > self.remaining:
+            raise PoolExhaustedError(
+                "Pool has {} items left, {} items requested".format(
+                    self.remaining, count
+                )
+            )
+        start = self.position
+        self.position += count
+        return range(start, self.position)
+
+    def take(self, count):
+        # type: (int) -> list[str]
+        """Take `count` distinct User-Agent headers from the pool.
+
+        :raises PoolExhaustedError: if pool has less than `count` items left,
+            no items are taken in this case
+        """
+        permutation = self.permutation
+        user_agent = self.space.user_agent
+        return [user_agent(permutation[pos]) for pos in self.take_indexes(count)]
+
+    def take_navigators(self, count):
+        # type: (int) -> list[NavigatorDict]
+        """Take `count` distinct web navigator's configs from the pool.
+
+        :raises PoolExhaustedError: if pool has less than `count` items left,
+            no items are taken in this case
+        """
+        permutation = self.permutation
+        navigator = self.space.navigator
+        return [navigator(permutation[pos]) for pos in self.take_indexes(count)]
+
+    def __iter__(self):  # noqa: ANN204
+        # type: () -> Iterator[str]
+        """Take User-Agent headers one by one until pool is exhausted."""
+        while not self.exhausted:
+            yield self.take(1)[0]
@@ -0,0 +1,201 @@
+"""Pre-generated web navigator's configs for latency sensitive code.
+
+`PrefetchBuffer` keeps a buffer of ready configs and refills it in
+background, so taking a config costs only removal of item from buffer::
+
+    with PrefetchBuffer(size=10000, os="win") as prefetch:
+        prefetch.get()["user_agent"]
+"""
+# from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from random import Random  # pylint: disable=unused-import
+
+from .base import UserAgentGenerator
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias,consider-alternative-union-syntax
+    from concurrent.futures import Executor
+    from typing import Callable, Dict, Optional, Sequence
+
+    NavigatorDict = Dict[str, Optional[str]]
+    # pylint: enable=deprecated-typing-alias,consider-alternative-union-syntax
+
+__all__ = ["PrefetchBuffer"]
+
+PREFETCH_SIZE = 4096
+PREFETCH_BATCH_SIZE = 256
+# time.perf_counter is missing in python 2
+perf_counter = getattr(time, "perf_counter", time.time)  # type: Callable[[], float]
+
+
+class PrefetchBuffer:  # pylint: disable=too-many-instance-attributes
+    """Buffer of pre-generated web navigator's configs.
+
+    When number of configs in buffer drops below `low_water` mark, buffer
+    is refilled up to `size` items by batches of `batch_size` configs in
+    background thread or in `executor`. If buffer is empty, `get` generates
+    config itself and counts underrun: increase `size` or `low_water` if
+    underruns happen.
+
+    Buffer is filled in constructor. Background thread is started in
+    constructor too and stopped by `close` or on exit from `with` block.
+
+    :param size: max number of configs in buffer
+    :param low_water: refill is started when buffer has fewer configs,
+        half of `size` by default
+    :param batch_size: number of configs generated at once while refilling
+    :param os: limit list of oses for generation
+    :type os: string or list/tuple or None
+    :param navigator: limit list of browser engines for generation
+    :type navigator: string or list/tuple or None
+    :param device_type: limit possible oses by device type
+    :type device_type: list/tuple or None, possible values:
+        "desktop", "smartphone", "tablet", "all"
+    :param rng: source of randomness, see `UserAgentGenerator`, it is used
+        by background refills and by `get` concurrently, so it must be
+        thread-safe as `random.Random` is
+    :param executor: `concurrent.futures.Executor` to run refills in,
+        dedicated daemon thread is used by default
+    :raises InvalidOption: if any of options is invalid or options conflict
+    """
+
+    def __init__(  # noqa: ANN204 pylint: disable=too-many-positional-arguments
+        self,
+        size=PREFETCH_SIZE,  # type: int
+        low_water=None,  # type: None | int
+        batch_size=PREFETCH_BATCH_SIZE,  # type: int
+        os=None,  # type: None | str | Sequence[str]
+        navigator=None,  # type: None | str | Sequence[str]
+        device_type=None,  # type: None | str | Sequence[str]
+        rng=None,  # type: None | Random
+        executor=None,  # type: None | Executor
+    ):
+        # type: (...) -> None
+        if size < 1 or batch_size < 1:
+            raise ValueError("Size and batch size of buffer must be positive")
+        self.size = size
+        self.low_water = size // 2 if low_water is None else min(low_water, size)
+        self.batch_size = batch_size
+        self.generator = UserAgentGenerator(
+            os=os, navigator=navigator, device_type=device_type, rng=rng
+        )
+        self.executor = executor
+        self.buffer = deque()  # type: deque[NavigatorDict]
+        # Guards counters and refill_pending flag, configs are generated
+        # without lock, so `get` does not wait for refill of the buffer
+        self.lock = threading.Lock()
+        self.refill_pending = False
+        self.closed = False
+        self.underruns = 0
+        self.refills = 0
+        self.refill_time = 0.0
+        self.wakeup = threading.Event()
+        self.thread = None  # type: None | threading.Thread
+        self.refill()
+        if executor is None:
+            self.thread = threading.Thread(target=self.run, name="user-agent-prefetch")
+            self.thread.daemon = True
+            self.thread.start()
+
+    def __len__(self):  # noqa: ANN204
+        # type: () -> int
+        return len(self.buffer)
+
+    def __enter__(self):  # noqa: ANN204
+        # type: () -> PrefetchBuffer
+        return self
+
+    def __exit__(self, *args):  # noqa: ANN002, ANN204
+        # type: (object) -> None
+        self.close()
+
+    def get(self):
+        # type: () -> NavigatorDict
+        """Return web navigator's config, see `generate_navigator`."""
+        buffer = self.buffer
+        try:
+            config = buffer.popleft()
+        except IndexError:
+            config = self.generator.navigator()
+            with self.lock:
+                self.underruns += 1
+        if len(buffer) < self.low_water and not self.refill_pending:
+            self.schedule_refill()
+        return config
+
+    def schedule_refill(self):
+        # type: () -> None
+        """Start refill in background unless it is already started."""
+        with self.lock:
+            if self.refill_pending or self.closed:
+                return
+            self.refill_pending = True
+        if self.executor is None:
+            self.wakeup.set()
+            return
+        try:
+            self.executor.submit(self.refill)
+        except BaseException:
+            # e.g. executor is shut down, next `get` tries again
+            with self.lock:
+                self.refill_pending = False
+            raise
+
+    def refill(self):
+        # type: () -> None
+        """Generate configs until buffer is full."""
+        buffer = self.buffer
+        try:
+            while not self.closed:
+                count = min(self.batch_size, self.size - len(buffer))
+                if count <= 0:
+                    break
+                started = perf_counter()
+                batch = self.generator.navigators(count)
+                elapsed = perf_counter() - started
+                with self.lock:
+                    buffer.extend(batch)
+                    self.refill_time += elapsed
+                    self.refills += 1
+        finally:
+            self.refill_pending = False
+
+    def run(self):
+        # type: () -> None
+        """Refill buffer on request until buffer is closed."""
+        while True:
+            self.wakeup.wait()
+            self.wakeup.clear()
+            if self.closed:
+                break
+            self.refill()
+
+    def close(self):
+        # type: () -> None
+        """Stop background refills, configs left in buffer could be taken."""
+        self.closed = True
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def stats(self):
+        # type: () -> dict[str, float]
+        """Return dict of counters.
+
+        Keys are: size (current number of configs in buffer), underruns
+        (configs generated by `get` because buffer was empty), refills
+        (number of generated batches), refill_time (total time spent on
+        generation of batches in seconds).
+        """
+        with self.lock:
+            return {
+                "size": len(self.buffer),
+                "underruns": self.underruns,
+                "refills": self.refills,
+                "refill_time": self.refill_time,
+            }
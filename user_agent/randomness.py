@@ -0,0 +1,362 @@
+"""Sources of randomness which could be used in place of `base.randomizer`.
+
+Any instance of `random.Random` could be passed as `rng` argument to
+generation functions. This module provides sources that are not available
+in the standard library.
+"""
+# from __future__ import annotations
+
+import hashlib
+import numbers
+import os
+import threading
+import weakref
+from array import array
+from binascii import hexlify
+from itertools import islice
+from random import Random
+
+from .compat import text_type
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, Sequence, TypeVar
+
+    T = TypeVar("T")
+
+__all__ = ["BufferedSystemRandom", "ThreadLocalRandom", "derive_seed"]
+
+BUFFER_SIZE = 4096
+RECIP_BPF = 2.0**-53  # 1 / (2 ** float mantissa size)
+WORD_BITS = 64
+try:
+    array("Q")
+except ValueError:  # python 2 does not support unsigned long long arrays
+    WORD_TYPECODE = None  # type: str | None
+else:
+    WORD_TYPECODE = "Q"
+
+try:
+    int_from_bytes = int.from_bytes
+except AttributeError:  # python 2
+
+    def int_from_bytes(data, byteorder):  # type: ignore[misc]
+        # type: (bytearray, str) -> int
+        assert byteorder == "big"
+        return int(hexlify(data), 16)
+
+
+def derive_seed(master_seed, *path):  # noqa: ANN002
+    # type: (int | str, int | str) -> int
+    """Derive 64-bit seed from master seed and path of identifiers.
+
+    Result depends only on arguments, it is stable across processes,
+    platforms and python versions. Seeds derived for different paths are
+    independent, e.g. derive_seed(seed, 0) and derive_seed(seed, 1) could
+    seed generators of two workers.
+    """
+    # python 2 compatible, do not use (master_seed, *path)
+    key = ":".join(text_type(item) for item in (master_seed,) + path)  # noqa: RUF005
+    return int_from_bytes(
+        bytearray(hashlib.sha256(key.encode("utf-8")).digest()[:8]), "big"
+    )
+
+
+# Instances of BufferedSystemRandom which buffers
+# have to be dropped in the child process after fork
+BUFFERED_INSTANCES = (
+    weakref.WeakSet()
+)  # type: weakref.WeakSet[BufferedSystemRandom]
+
+
+# Instances of ThreadLocalRandom which states
+# have to be derived again in the child process after fork
+THREAD_LOCAL_INSTANCES = (
+    weakref.WeakSet()
+)  # type: weakref.WeakSet[ThreadLocalRandom]
+
+
+def reset_buffered_instances():
+    # type: () -> None
+    for inst in list(BUFFERED_INSTANCES):
+        inst.reset()
+
+
+def count_thread_local_forks():
+    # type: () -> None
+    for inst in list(THREAD_LOCAL_INSTANCES):
+        inst.fork_count += 1
+
+
+def fork_thread_local_instances():
+    # type: () -> None
+    for inst in list(THREAD_LOCAL_INSTANCES):
+        inst.after_fork(("fork", inst.fork_count))
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_buffered_instances)
+    os.register_at_fork(
+        before=count_thread_local_forks,
+        after_in_child=fork_thread_local_instances,
+    )
+    FORK_HOOK_INSTALLED = True
+else:
+    FORK_HOOK_INSTALLED = False
+
+
+class BufferedSystemRandom(Random):
+    """Random generator reading OS entropy source in large blocks.
+
+    Works like `random.SystemRandom`: all values are produced from bytes
+    returned by `os.urandom`, but the syscall is made once per `buffer_size`
+    bytes instead of once per draw. Bounded integers (hence `choice`,
+    `randint`, `randrange`) are produced with rejection sampling, so they
+    have no modulo bias.
+
+    The instance is thread-safe: buffered bytes are consumed through
+    an iterator, so each byte is given to exactly one caller. Buffer is
+    dropped in the child process after `os.fork` so parent and child never
+    share random bytes.
+
+    Like `SystemRandom` it could not be seeded, its state could not be saved
+    or restored.
+
+    :param buffer_size: number of bytes read from OS at once, it is rounded
+        up to multiple of 8 bytes as 64-bit words are read from the buffer
+    :raises ValueError: if buffer size is not positive
+    """
+
+    def __init__(self, buffer_size=BUFFER_SIZE):  # noqa: ANN204
+        # type: (int) -> None
+        if buffer_size < 1:
+            raise ValueError("Buffer size must be positive")
+        self._buffer_size = -(-buffer_size // 8) * 8
+        self._bytes = iter(bytearray())  # type: Iterator[int]
+        self._words = iter(())  # type: Iterator[int]
+        self._pid = os.getpid()
+        Random.__init__(self)  # pylint: disable=non-parent-init-called
+        BUFFERED_INSTANCES.add(self)
+
+    def reset(self):
+        # type: () -> None
+        """Drop all buffered random bytes."""
+        self._bytes = iter(bytearray())
+        self._words = iter(())
+        self._pid = os.getpid()
+
+    def refill(self):
+        # type: () -> None
+        """Replace buffered bytes with new block read from OS entropy source."""
+        if not FORK_HOOK_INSTALLED:
+            self._pid = os.getpid()
+        self._bytes = iter(bytearray(os.urandom(self._buffer_size)))
+
+    def read_byte(self):
+        # type: () -> int
+        """Return one random byte as integer."""
+        if not FORK_HOOK_INSTALLED and self._pid != os.getpid():
+            self.reset()
+        value = next(self._bytes, -1)
+        while value < 0:
+            self.refill()
+            value = next(self._bytes, -1)
+        return value
+
+    def read_word(self):
+        # type: () -> int
+        """Return random 64-bit unsigned integer."""
+        if WORD_TYPECODE is None:
+            return int_from_bytes(self.read_bytes(8), "big")
+        if not FORK_HOOK_INSTALLED and self._pid != os.getpid():
+            self.reset()
+        value = next(self._words, -1)
+        while value < 0:
+            if not FORK_HOOK_INSTALLED:
+                self._pid = os.getpid()
+            words = array(WORD_TYPECODE)
+            words.frombytes(os.urandom(self._buffer_size))
+            self._words = iter(words)
+            value = next(self._words, -1)
+        return value
+
+    def read_bytes(self, size):
+        # type: (int) -> bytearray
+        """Return `size` random bytes."""
+        if not FORK_HOOK_INSTALLED and self._pid != os.getpid():
+            self.reset()
+        data = bytearray(islice(self._bytes, size))
+        while len(data) < size:
+            self.refill()
+            data.extend(islice(self._bytes, size - len(data)))
+        return data
+
+    def getrandbits(self, k):
+        # type: (int) -> int
+        """Return non-negative integer with k random bits."""
+        if k <= 8:  # noqa: PLR2004
+            if k < 0:
+                raise ValueError("number of bits must be non-negative")
+            return self.read_byte() >> (8 - k)
+        if k <= WORD_BITS:
+            return self.read_word() >> (WORD_BITS - k)
+        num_bytes = (k + 7) // 8
+        value = int_from_bytes(self.read_bytes(num_bytes), "big")
+        return value >> (num_bytes * 8 - k)
+
+    def _randbelow(self, limit):
+        # type: (int) -> int
+        """Return random integer in range [0, limit) using rejection sampling.
+
+        Like standard `Random` return 0 for empty range, so `choice`
+        raises IndexError for empty sequence instead of endless loop.
+        """
+        if limit <= 0:
+            return 0
+        k = limit.bit_length()
+        if k <= 8:  # noqa: PLR2004
+            # fast path for choice from small tables, one byte per attempt
+            shift = 8 - k
+            read_byte = self.read_byte
+            value = read_byte() >> shift
+            while value >= limit:
+                value = read_byte() >> shift
+            return value
+        if k <= WORD_BITS:
+            shift = WORD_BITS - k
+            read_word = self.read_word
+            value = read_word() >> shift
+            while value >= limit:
+                value = read_word() >> shift
+            return value
+        value = self.getrandbits(k)
+        while value >= limit:
+            value = self.getrandbits(k)
+        return value
+
+    def random(self):
+        # type: () -> float
+        """Return random float in [0.0, 1.0)."""
+        return (self.read_word() >> 11) * RECIP_BPF
+
+    def seed(self, a=None, version=2):  # noqa: ARG002
+        # type: (object, int) -> None
+        """Stub method, buffered system source could not be seeded."""
+        return
+
+    def getstate(self):
+        # type: () -> tuple[int, ...]
+        raise NotImplementedError("System entropy source does not have state.")
+
+    def setstate(self, state):  # noqa: ARG002
+        # type: (tuple[int, ...]) -> None
+        raise NotImplementedError("System entropy source does not have state.")
+
+
+class ThreadLocalRandom(Random):  # pylint: disable=too-many-instance-attributes
+    """Seeded random generator with independent state in each thread.
+
+    Each thread draws from its own `random.Random` seeded with
+    `derive_seed(seed, thread_index)`, where thread_index is the order
+    in which threads first used the instance. Threads do not share state,
+    so they do not affect each other's sequences and do not contend for
+    it. Sequences are reproducible if threads start drawing in the same
+    order, e.g. one thread per worker started one by one.
+
+    In the child process after `os.fork` states are derived again from
+    seed and number of forks made by parent, so forked workers do not
+    repeat each other's or parent's sequences. Python without
+    `os.register_at_fork` uses process id instead of number of forks.
+
+    :param seed: root seed, int or str, OS entropy source by default
+    """
+
+    def __init__(self, seed=None):  # noqa: ANN204
+        # type: (None | int | str) -> None
+        self.local = threading.local()
+        # Guards thread_count
+        self.lock = threading.Lock()
+        self.root_seed = 0  # type: int | str
+        self.path = ()  # type: tuple[int | str, ...]
+        self.thread_count = 0
+        self.fork_count = 0
+        # Thread states of older generations are dropped on next draw
+        self.generation = 0
+        self.pid = os.getpid()
+        Random.__init__(self, seed)  # pylint: disable=non-parent-init-called
+        THREAD_LOCAL_INSTANCES.add(self)
+
+    def seed(self, a=None, version=2):  # noqa: ARG002
+        # type: (object, int) -> None
+        """Set root seed, states of all threads are derived from it again."""
+        if a is None:
+            a = int_from_bytes(bytearray(os.urandom(8)), "big")
+        elif isinstance(a, numbers.Integral):
+            a = int(a)
+        elif not isinstance(a, (text_type, str)):
+            raise TypeError("Seed must be int or str")
+        self.root_seed = a
+        self.path = ()
+        self.reset()
+
+    def reset(self):
+        # type: () -> None
+        """Drop states of all threads."""
+        with self.lock:
+            self.thread_count = 0
+            self.generation += 1
+
+    def after_fork(self, fork_id):
+        # type: (tuple[int | str, ...]) -> None
+        """Derive states from new path in the child process."""
+        self.lock = threading.Lock()
+        self.path += fork_id
+        self.fork_count = 0
+        self.pid = os.getpid()
+        self.reset()
+
+    def thread_rng(self):
+        # type: () -> Random
+        """Return generator of current thread, create it on first use."""
+        local = self.local
+        if not FORK_HOOK_INSTALLED and self.pid != os.getpid():
+            self.after_fork(("pid", os.getpid()))
+        if getattr(local, "generation", None) == self.generation:
+            return local.rng  # type: ignore[no-any-return]
+        with self.lock:
+            generation = self.generation
+            thread_index = self.thread_count
+            self.thread_count += 1
+        # python 2 compatible, do not use (*self.path, thread_index)
+        path = self.path + (thread_index,)  # noqa: RUF005
+        local.rng = Random(derive_seed(self.root_seed, *path))  # noqa: S311
+        local.generation = generation
+        return local.rng  # type: ignore[no-any-return]
+
+    def random(self):
+        # type: () -> float
+        """Return random float in [0.0, 1.0)."""
+        return self.thread_rng().random()
+
+    def getrandbits(self, k):
+        # type: (int) -> int
+        """Return non-negative integer with k random bits."""
+        return self.thread_rng().getrandbits(k)
+
+    def _randbelow(self, limit):
+        # type: (int) -> int
+        """Return random integer in range [0, limit)."""
+        return self.thread_rng().randrange(limit)
+
+    def choice(self, seq):  # type: ignore[override]
+        # type: (Sequence[T]) -> T
+        """Choose random element of non-empty sequence."""
+        return self.thread_rng().choice(seq)
+
+    def getstate(self):
+        # type: () -> tuple[int, ...]
+        raise NotImplementedError("State of generator is separate in each thread.")
+
+    def setstate(self, state):  # noqa: ARG002
+        # type: (tuple[int, ...]) -> None
+        raise NotImplementedError("State of generator is separate in each thread.")
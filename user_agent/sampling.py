@@ -0,0 +1,151 @@
+"""Random sampling from fixed tables in constant time.
+
+Weighted choice: alias tables are built once per table with Vose's method,
+then each draw costs one call of `rng.random()`, one multiplication and one
+comparison, which is as cheap as uniform `rng.choice`.
+
+Sampling without replacement: `RandomPermutation` shuffles indexes of
+a table of any size in constant memory.
+"""
+# from __future__ import annotations
+
+from random import Random  # pylint: disable=unused-import
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias
+    from typing import Any, Sequence
+
+    # pylint: enable=deprecated-typing-alias
+
+__all__ = ["AliasTable", "RandomPermutation", "build_alias_table"]
+
+
+def build_alias_table(weights):
+    # type: (Sequence[float]) -> tuple[list[float], list[int]]
+    """Build alias table for distribution defined by relative `weights`.
+
+    Returns tuple (probabilities, aliases): to make a draw choose random
+    index `idx` uniformly, then return `idx` with probability
+    `probabilities[idx]` or `aliases[idx]` otherwise.
+
+    :raises ValueError: if weights are empty, negative or all zero
+    """
+    size = len(weights)
+    if not size:
+        raise ValueError("Weights must not be empty")
+    if any(weight < 0 for weight in weights):
+        raise ValueError("Weights must not be negative")
+    total = float(sum(weights))
+    if total <= 0:
+        raise ValueError("Total of weights must be positive")
+    scaled = [weight * size / total for weight in weights]
+    probabilities = [1.0] * size
+    aliases = list(range(size))
+    small = [idx for idx, prob in enumerate(scaled) if prob < 1.0]
+    large = [idx for idx, prob in enumerate(scaled) if prob >= 1.0]
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+        probabilities[less] = scaled[less]
+        aliases[less] = more
+        scaled[more] = (scaled[more] + scaled[less]) - 1.0
+        if scaled[more] < 1.0:
+            small.append(more)
+        else:
+            large.append(more)
+    # Items left in any list have probability 1.0 up to rounding error
+    return probabilities, aliases
+
+
+class AliasTable:
+    """Table of items which could be randomly chosen according to weights.
+
+    Usage example::
+
+        table = AliasTable(["win", "mac", "linux"], [70, 20, 10])
+        table.choice(random.Random(1))
+
+    :param items: items to choose from
+    :param weights: relative weights of items, same length as `items`
+    :raises ValueError: if weights are invalid, see `build_alias_table`
+    """
+
+    def __init__(self, items, weights):  # noqa: ANN204
+        # type: (Sequence[Any], Sequence[float]) -> None
+        if len(items) != len(weights):
+            raise ValueError("Number of weights does not match number of items")
+        probabilities, aliases = build_alias_table(weights)
+        self.items = list(items)
+        self.size = len(self.items)
+        self.probabilities = probabilities
+        self.alias_items = [self.items[idx] for idx in aliases]
+        # Guard against rare rounding of random() * size up to size
+        self.items.append(self.items[-1])
+        self.probabilities.append(1.0)
+
+    def choice(self, rng):
+        # type: (Random) -> Any
+        """Return random item, uses exactly one `rng.random()` call."""
+        pos = rng.random() * self.size
+        idx = int(pos)
+        if pos - idx < self.probabilities[idx]:
+            return self.items[idx]
+        return self.alias_items[idx]
+
+
+# Multiplier of round function of RandomPermutation, odd 64-bit constant
+PERMUTATION_MULTIPLIER = 0x9E3779B97F4A7C15
+PERMUTATION_ROUNDS = 4
+WORD_MASK = (1 << 64) - 1
+
+
+class RandomPermutation:
+    """Random permutation of integers in range [0, size).
+
+    Permutation is computed on demand with Feistel network keyed by random
+    round keys and cycle walking, so it takes constant memory for any size
+    and `permutation[idx]` costs constant time. It is not a cryptographic
+    permutation, it is only meant to shuffle items.
+
+    :param size: number of items
+    :param rng: source of randomness used to generate keys
+    """
+
+    def __init__(self, size, rng):  # noqa: ANN204
+        # type: (int, Random) -> None
+        if size < 0:
+            raise ValueError("Size of permutation must not be negative")
+        self.size = size
+        # Feistel network permutes integers of even number of bits
+        half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self.half_bits = half_bits
+        self.half_mask = (1 << half_bits) - 1
+        self.keys = [rng.getrandbits(64) for _ in range(PERMUTATION_ROUNDS)]
+
+    def __len__(self):  # noqa: ANN204
+        # type: () -> int
+        return self.size
+
+    def encrypt(self, value):
+        # type: (int) -> int
+        """Map integer in [0, 4 ** half_bits) to another one in same range."""
+        half_bits = self.half_bits
+        half_mask = self.half_mask
+        left = value >> half_bits
+        right = value & half_mask
+        for key in self.keys:
+            mixed = ((right ^ key) * PERMUTATION_MULTIPLIER) & WORD_MASK
+            left, right = right, left ^ ((mixed >> 32) & half_mask)
+        return (left << half_bits) | right
+
+    def __getitem__(self, index):  # noqa: ANN204
+        # type: (int) -> int
+        if not 0 <= index < self.size:
+            raise IndexError("Index out of range")
+        # cycle walking: encrypt until value falls into range,
+        # domain of network is less than 4 * size, so it takes few steps
+        value = self.encrypt(index)
+        while value >= self.size:
+            value = self.encrypt(value)
+        return value
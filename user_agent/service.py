@@ -0,0 +1,461 @@
+"""Local HTTP service of pre-generated web navigator's configs.
+
+Many worker processes could share one service instead of loading data
+and generating configs in each of them. Service is started with
+`ua --serve 127.0.0.1:8000` or `ua --serve unix:/tmp/ua.sock` and
+serves JSON::
+
+    GET /user_agent                   "Mozilla/5.0 ..."
+    GET /navigator?os=win,mac         {"os_id": "win", ...}
+    GET /navigator_js?count=10        [{"appCodeName": "Mozilla", ...}, ...]
+    GET /stats                        {"pools": [...]}
+
+Configs are taken from `PrefetchBuffer` kept for each set of options.
+`UserAgentServiceClient` is a client which supports both kinds of address.
+
+The module requires python 3, it is not imported by `user_agent` package.
+"""
+
+import json
+import socket
+import socketserver
+import threading
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from os import lstat, unlink
+from stat import S_ISSOCK
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from .base import convert_navigator_to_js
+from .error import InvalidOption, UserAgentError
+from .prefetch import PREFETCH_BATCH_SIZE, PREFETCH_SIZE, PrefetchBuffer
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias,consider-alternative-union-syntax
+    from socketserver import BaseServer
+    from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+    OptionItems = Optional[Tuple[str, ...]]
+    OptionsKey = Tuple[OptionItems, OptionItems, OptionItems]
+    NavigatorDict = Dict[str, Optional[str]]
+    OptionValue = Union[None, str, Sequence[str]]
+    # pylint: enable=deprecated-typing-alias,consider-alternative-union-syntax
+
+__all__ = ["UserAgentService", "UserAgentServiceClient", "serve"]
+
+SERVICE_KINDS = ("user_agent", "navigator", "navigator_js")
+SERVICE_OPTIONS = ("os", "navigator", "device_type")
+# Max number of items returned by one request
+SERVICE_MAX_COUNT = 10000
+# Max number of buffers for distinct sets of options
+SERVICE_MAX_POOLS = 64
+SERVICE_TIMEOUT = 10
+UNIX_ADDRESS_PREFIX = "unix:"
+# Windows does not support unix sockets
+UNIX_SOCKETS_SUPPORTED = hasattr(socket, "AF_UNIX")
+
+
+def parse_service_address(address):
+    # type: (str) -> tuple[str, str, int]
+    """Parse "HOST:PORT" or "unix:PATH" address.
+
+    :return: tuple ("tcp", host, port) or ("unix", path, 0)
+    :raises ValueError: if address is invalid or unix sockets are not
+        supported by platform
+    """
+    if address.startswith(UNIX_ADDRESS_PREFIX):
+        if not UNIX_SOCKETS_SUPPORTED:
+            raise ValueError(
+                "Unix socket address {!r} is not supported on this platform".format(
+                    address
+                )
+            )
+        path = address[len(UNIX_ADDRESS_PREFIX) :]
+        if path:
+            return "unix", path, 0
+    else:
+        host, _, port = address.rpartition(":")
+        if host and port.isdigit():
+            return "tcp", host, int(port)
+    raise ValueError(
+        "Invalid address {!r}, expected HOST:PORT or unix:PATH".format(address)
+    )
+
+
+def split_option(value):
+    # type: (None | str) -> None | tuple[str, ...]
+    """Split comma separated value of option of request.
+
+    Values are sorted and deduplicated, so "win,mac" and "mac,win"
+    select the same buffer of configs.
+    """
+    return None if value is None else tuple(sorted(set(value.split(","))))
+
+
+def join_option(value):
+    # type: (None | tuple[str, ...]) -> None | str
+    """Join value of option split by `split_option`."""
+    return None if value is None else ",".join(value)
+
+
+class UserAgentService:
+    """Handler of service requests, it does not depend on transport.
+
+    :param size: size of buffer of each set of options
+    :param batch_size: refill batch size, see `PrefetchBuffer`
+    :param os: default value of os option of requests
+    :param navigator: default value of navigator option of requests
+    :param device_type: default value of device_type option of requests
+    """
+
+    def __init__(  # noqa: ANN204
+        self,
+        size=PREFETCH_SIZE,  # type: int
+        batch_size=PREFETCH_BATCH_SIZE,  # type: int
+        os=None,  # type: None | str
+        navigator=None,  # type: None | str
+        device_type=None,  # type: None | str
+    ):
+        # type: (...) -> None
+        self.size = size
+        self.batch_size = batch_size
+        self.default_options = {
+            "os": os,
+            "navigator": navigator,
+            "device_type": device_type,
+        }  # type: Dict[str, Optional[str]]
+        self.pools = {}  # type: Dict[OptionsKey, PrefetchBuffer]
+        # Buffers are filled in constructor, each one is created under lock
+        # of its options, so requests with other options are not blocked
+        self.pool_locks = {}  # type: Dict[OptionsKey, threading.Lock]
+        # Guards pools, pool_locks and closed flag
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def get_pool(self, options):
+        # type: (Dict[str, Optional[str]]) -> PrefetchBuffer
+        """Return buffer of configs for options, create it on first use.
+
+        :param options: dict of comma separated values of options
+        :raises InvalidOption: if options are invalid
+        """
+        key = (
+            split_option(options["os"]),
+            split_option(options["navigator"]),
+            split_option(options["device_type"]),
+        )
+        with self.lock:
+            pool = self.pools.get(key)
+            if pool is not None:
+                return pool
+            pool_lock = self.pool_locks.get(key)
+            if pool_lock is None:
+                if len(self.pools) + len(self.pool_locks) >= SERVICE_MAX_POOLS:
+                    raise InvalidOption("Too many distinct sets of options")
+                pool_lock = self.pool_locks[key] = threading.Lock()
+        with pool_lock:
+            with self.lock:
+                pool = self.pools.get(key)
+            if pool is not None:
+                return pool
+            try:
+                pool = PrefetchBuffer(
+                    size=self.size,
+                    batch_size=self.batch_size,
+                    os=key[0],
+                    navigator=key[1],
+                    device_type=key[2],
+                )
+            except BaseException:
+                with self.lock:
+                    self.pool_locks.pop(key, None)
+                raise
+            with self.lock:
+                self.pool_locks.pop(key, None)
+                if not self.closed:
+                    self.pools[key] = pool
+                    return pool
+        # service was closed while the buffer was filled
+        pool.close()
+        return pool
+
+    def handle(self, path, query):
+        # type: (str, Dict[str, List[str]]) -> tuple[int, Any]
+        """Handle request.
+
+        :param path: path of URL, e.g. "/navigator"
+        :param query: parsed query string, see `urllib.parse.parse_qs`
+        :return: tuple (HTTP status, data to serialize into JSON)
+        """
+        kind = path.strip("/")
+        if kind == "stats":
+            return 200, self.stats()
+        if kind not in SERVICE_KINDS:
+            return 404, {"error": "Unknown path: {}".format(path)}
+        options = dict(self.default_options)
+        for name in SERVICE_OPTIONS:
+            if name in query:
+                options[name] = query[name][-1]
+        count_value = query.get("count", [None])[-1]
+        if count_value is not None and not (
+            count_value.isdigit() and 0 < int(count_value) <= SERVICE_MAX_COUNT
+        ):
+            error = "Option count must be in range 1..{}".format(SERVICE_MAX_COUNT)
+            return 400, {"error": error}
+        try:
+            pool = self.get_pool(options)
+        except InvalidOption as ex:
+            return 400, {"error": str(ex)}
+        items = [
+            pool.get() for _ in range(1 if count_value is None else int(count_value))
+        ]  # type: List[Any]
+        if kind == "user_agent":
+            items = [item["user_agent"] for item in items]
+        elif kind == "navigator_js":
+            items = [convert_navigator_to_js(item) for item in items]
+        return 200, items[0] if count_value is None else items
+
+    def stats(self):
+        # type: () -> Dict[str, Any]
+        """Return options and counters of all buffers."""
+        with self.lock:
+            pools = list(self.pools.items())
+        return {
+            "pools": [
+                dict(
+                    pool.stats(),
+                    options={
+                        name: join_option(value)
+                        for name, value in zip(SERVICE_OPTIONS, key)
+                    },
+                )
+                for key, pool in pools
+            ]
+        }
+
+    def close(self):
+        # type: () -> None
+        """Stop background refills of all buffers."""
+        with self.lock:
+            self.closed = True
+            for pool in self.pools.values():
+                pool.close()
+            self.pools.clear()
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "user_agent"
+
+    def do_GET(self):  # noqa: N802 pylint: disable=invalid-name
+        # type: () -> None
+        url = urlsplit(self.path)
+        status, data = self.server.service.handle(  # type: ignore[attr-defined]
+            url.path, parse_qs(url.query)
+        )
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # noqa: ANN002
+        # type: (Any) -> None
+        """Do not log requests."""
+
+
+class TCPServiceServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service):  # noqa: ANN204
+        # type: (tuple[str, int], UserAgentService) -> None
+        self.service = service
+        HTTPServer.__init__(self, address, ServiceRequestHandler)
+
+
+if UNIX_SOCKETS_SUPPORTED:
+
+    class UnixServiceServer(
+        socketserver.ThreadingMixIn,
+        socketserver.UnixStreamServer,
+    ):
+        daemon_threads = True
+
+        def __init__(self, path, service):  # noqa: ANN204
+            # type: (str, UserAgentService) -> None
+            self.service = service
+            socketserver.UnixStreamServer.__init__(self, path, ServiceRequestHandler)
+
+        def get_request(self):
+            # type: () -> tuple[socket.socket, Any]
+            # BaseHTTPRequestHandler expects client address to be a tuple
+            request, _ = super().get_request()
+            return request, ("unix", 0)
+
+
+def remove_stale_socket(path):
+    # type: (str) -> None
+    """Remove unix socket file left by previous run of service."""
+    try:
+        mode = lstat(path).st_mode
+    except OSError:
+        return
+    if S_ISSOCK(mode):
+        unlink(path)
+
+
+def make_server(address, service):
+    # type: (str, UserAgentService) -> BaseServer
+    """Create server of service listening on address.
+
+    :param address: "HOST:PORT" or "unix:PATH"
+    """
+    kind, host, port = parse_service_address(address)
+    if kind == "unix":
+        remove_stale_socket(host)
+        # parse_service_address rejects unix addresses if class is missing
+        return UnixServiceServer(host, service)  # pylint: disable=possibly-used-before-assignment
+    return TCPServiceServer((host, port), service)
+
+
+def serve(  # pylint: disable=too-many-positional-arguments
+    address,  # type: str
+    size=PREFETCH_SIZE,  # type: int
+    batch_size=PREFETCH_BATCH_SIZE,  # type: int
+    os=None,  # type: None | str
+    navigator=None,  # type: None | str
+    device_type=None,  # type: None | str
+):
+    # type: (...) -> None
+    """Run service until process is interrupted.
+
+    See `UserAgentService` for description of options.
+    """
+    service = UserAgentService(
+        size=size,
+        batch_size=batch_size,
+        os=os,
+        navigator=navigator,
+        device_type=device_type,
+    )
+    server = make_server(address, service)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+class UnixHTTPConnection(HTTPConnection):
+    def __init__(self, path, timeout=SERVICE_TIMEOUT):  # noqa: ANN204
+        # type: (str, float) -> None
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        # type: () -> None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.path)
+        self.sock = sock
+
+
+class UserAgentServiceClient:
+    """Client of the service, it keeps connection open between requests.
+
+    Client is not thread-safe, use one client per thread.
+
+    :param address: "HOST:PORT" or "unix:PATH" address of the service
+    :param timeout: timeout of socket operations in seconds
+    """
+
+    def __init__(self, address, timeout=SERVICE_TIMEOUT):  # noqa: ANN204
+        # type: (str, float) -> None
+        kind, host, port = parse_service_address(address)
+        self.connection = (
+            UnixHTTPConnection(host, timeout=timeout)
+            if kind == "unix"
+            else HTTPConnection(host, port, timeout=timeout)
+        )
+
+    def request(self, kind, options):
+        # type: (str, Dict[str, Any]) -> Any
+        """Send request and return decoded response.
+
+        :raises InvalidOption: if service rejected options
+        :raises UserAgentError: if request failed
+        """
+        params = {}
+        for name, value in options.items():
+            if value is not None:
+                params[name] = (
+                    value if isinstance(value, (str, int)) else ",".join(value)
+                )
+        url = "/{}?{}".format(kind, urlencode(sorted(params.items())))
+        try:
+            response = self.send(url)
+        except OSError:
+            # connection could be closed by server, try once with new one
+            self.connection.close()
+            response = self.send(url)
+        status, body = response
+        data = json.loads(body.decode("utf-8"))
+        if status == 400:  # noqa: PLR2004
+            raise InvalidOption(data["error"])
+        if status != 200:  # noqa: PLR2004
+            raise UserAgentError(data.get("error", "Service error"))
+        return data
+
+    def send(self, url):
+        # type: (str) -> tuple[int, bytes]
+        self.connection.request("GET", url)
+        response = self.connection.getresponse()
+        return response.status, response.read()
+
+    def user_agent(self, os=None, navigator=None, device_type=None):
+        # type: (OptionValue, OptionValue, OptionValue) -> str
+        """Return User-Agent header, see `generate_user_agent`."""
+        return self.request(  # type: ignore[no-any-return]
+            "user_agent", {"os": os, "navigator": navigator, "device_type": device_type}
+        )
+
+    def navigator(self, os=None, navigator=None, device_type=None):
+        # type: (OptionValue, OptionValue, OptionValue) -> NavigatorDict
+        """Return web navigator's config, see `generate_navigator`."""
+        return self.request(  # type: ignore[no-any-return]
+            "navigator", {"os": os, "navigator": navigator, "device_type": device_type}
+        )
+
+    def navigator_js(self, os=None, navigator=None, device_type=None):
+        # type: (OptionValue, OptionValue, OptionValue) -> NavigatorDict
+        """Return config for `windows.navigator`, see `generate_navigator_js`."""
+        return self.request(  # type: ignore[no-any-return]
+            "navigator_js",
+            {"os": os, "navigator": navigator, "device_type": device_type},
+        )
+
+    def navigators_js(self, count, os=None, navigator=None, device_type=None):
+        # type: (int, OptionValue, OptionValue, OptionValue) -> List[NavigatorDict]
+        """Return list of `count` configs for `windows.navigator`."""
+        return self.request(  # type: ignore[no-any-return]
+            "navigator_js",
+            {
+                "count": count,
+                "os": os,
+                "navigator": navigator,
+                "device_type": device_type,
+            },
+        )
+
+    def stats(self):
+        # type: () -> Dict[str, Any]
+        """Return counters of buffers of the service."""
+        return self.request("stats", {})  # type: ignore[no-any-return]
+
+    def close(self):
+        # type: () -> None
+        self.connection.close()
@@ -0,0 +1,295 @@
+"""Pool of generated configs shared by many processes.
+
+`create_shared_pool` generates pool once and writes it into shared memory
+or into file as array of 64-bit codes (see `user_agent.codec`). Other
+processes attach to it by name or path with `attach_shared_pool` and
+decode configs by index straight from shared buffer, so each of them
+uses only few kilobytes of own memory::
+
+    # in master process
+    pool = create_shared_pool(1000000, name="ua_pool", os="win")
+    # in worker processes
+    pool = attach_shared_pool(name="ua_pool")
+    pool.user_agent(12345)
+    pool.random_navigator()
+
+Layout of buffer: header of 16 bytes (magic b"UAPOOL", code version as
+unsigned 16-bit integer, number of records as unsigned 64-bit integer)
+followed by records, each is code of config as unsigned 64-bit integer.
+All numbers are little-endian.
+"""
+# from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from itertools import islice
+from os import remove
+from random import Random  # pylint: disable=unused-import
+
+from . import base
+from .base import UserAgentGenerator, convert_navigator_to_js
+from .codec import CODE_VERSION, decode_navigator, encode_navigators
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias,consider-alternative-union-syntax
+    from multiprocessing.shared_memory import SharedMemory
+    from typing import Any, Dict, Iterator, Optional, Sequence, Union
+
+    NavigatorDict = Dict[str, Optional[str]]
+    # pylint: enable=deprecated-typing-alias,consider-alternative-union-syntax
+
+__all__ = ["SharedUserAgentPool", "attach_shared_pool", "create_shared_pool"]
+
+SHARED_POOL_MAGIC = b"UAPOOL"
+SHARED_POOL_HEADER = struct.Struct("<6sHQ")
+SHARED_POOL_RECORD = struct.Struct("<Q")
+# Number of configs generated and written at once while creating pool
+SHARED_POOL_CHUNK_SIZE = 10000
+
+
+def open_shared_memory(name, size=None):
+    # type: (str, None | int) -> SharedMemory
+    """Create shared memory block of `size` bytes or attach to existing one.
+
+    Attached block is not registered in resource tracker of current
+    process, otherwise the block would be destroyed when process exits.
+    """
+    # python 3.8+, imported on demand as it is slow to import
+    from multiprocessing import shared_memory  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    if size is not None:
+        return shared_memory.SharedMemory(name, create=True, size=size)
+    try:
+        return shared_memory.SharedMemory(name, track=False)  # type: ignore[call-arg,unused-ignore] # pylint: disable=unexpected-keyword-arg
+    except TypeError:  # python < 3.13 does not support track argument
+        pass
+    block = shared_memory.SharedMemory(name)
+    if sys.platform != "win32":
+        from multiprocessing import resource_tracker  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+        resource_tracker.unregister(getattr(block, "_name", name), "shared_memory")
+    return block
+
+
+class SharedUserAgentPool:
+    """Read-only sequence of web navigator's configs in shared buffer.
+
+    Use `create_shared_pool` to generate new pool and `attach_shared_pool`
+    to open existing one. Items of sequence are configs as returned by
+    `generate_navigator`, they are decoded on each access, nothing is
+    copied from shared buffer except 8 bytes of code.
+
+    :param handle: `SharedMemory` or `mmap.mmap` object
+    :param buffer: buffer of pool, `SharedMemory.buf` or mmap itself
+    :param path: path of pool file, None for shared memory block
+    :raises ValueError: if buffer does not contain pool of compatible
+        version
+    """
+
+    def __init__(self, handle, buffer, path=None):  # noqa: ANN204
+        # type: (Union[SharedMemory, mmap.mmap], Any, None | str) -> None
+        self.handle = handle
+        self.buffer = buffer
+        self.path = path
+        if len(buffer) < SHARED_POOL_HEADER.size:
+            raise ValueError("Buffer is too small to contain pool")
+        magic, version, size = SHARED_POOL_HEADER.unpack_from(buffer, 0)
+        if magic != SHARED_POOL_MAGIC:
+            raise ValueError("Buffer does not contain pool of configs")
+        if version != CODE_VERSION:
+            raise ValueError(
+                "Code version {} does not match {}".format(version, CODE_VERSION)
+            )
+        if len(buffer) < SHARED_POOL_HEADER.size + size * SHARED_POOL_RECORD.size:
+            raise ValueError("Pool is truncated")
+        self.size = size  # type: int
+
+    def __len__(self):  # noqa: ANN204
+        # type: () -> int
+        return self.size
+
+    def __getitem__(self, index):  # noqa: ANN204
+        # type: (int) -> NavigatorDict
+        return decode_navigator(self.code(index))
+
+    def __enter__(self):  # noqa: ANN204
+        # type: () -> SharedUserAgentPool
+        return self
+
+    def __exit__(self, *args):  # noqa: ANN002, ANN204
+        # type: (object) -> None
+        self.close()
+
+    @property
+    def name(self):
+        # type: () -> None | str
+        """Name of shared memory block, None for pool in file."""
+        if self.path is not None:
+            return None
+        return self.handle.name  # type: ignore[union-attr]
+
+    def code(self, index):
+        # type: (int) -> int
+        """Return code of config, see `encode_navigator`.
+
+        :raises IndexError: if index is out of range
+        """
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("Pool index out of range")
+        offset = SHARED_POOL_HEADER.size + index * SHARED_POOL_RECORD.size
+        return SHARED_POOL_RECORD.unpack_from(self.buffer, offset)[0]  # type: ignore[no-any-return]
+
+    def navigator(self, index):
+        # type: (int) -> NavigatorDict
+        """Return web navigator's config, see `generate_navigator`."""
+        return decode_navigator(self.code(index))
+
+    def navigator_js(self, index):
+        # type: (int) -> NavigatorDict
+        """Return config for `windows.navigator`, see `generate_navigator_js`."""
+        return convert_navigator_to_js(decode_navigator(self.code(index)))
+
+    def user_agent(self, index):
+        # type: (int) -> str
+        """Return User-Agent header of config."""
+        user_agent = decode_navigator(self.code(index))["user_agent"]
+        assert user_agent is not None
+        return user_agent
+
+    def random_navigator(self, rng=None):
+        # type: (None | Random) -> NavigatorDict
+        """Return config at random index.
+
+        :param rng: source of randomness, module's `base.randomizer`
+            by default
+        :raises IndexError: if pool is empty
+        """
+        if not self.size:
+            raise IndexError("Pool is empty")
+        return self.navigator(
+            (base.randomizer if rng is None else rng).randrange(self.size)
+        )
+
+    def close(self):
+        # type: () -> None
+        """Detach from buffer, configs could not be accessed after that."""
+        if isinstance(self.buffer, memoryview):
+            # block could not be closed while views of it exist
+            self.buffer.release()
+        self.handle.close()
+
+    def unlink(self):
+        # type: () -> None
+        """Remove shared memory block or file, attached pools keep working."""
+        if self.path is None:
+            self.handle.unlink()  # type: ignore[union-attr]
+        else:
+            remove(self.path)
+
+
+def iter_pool_chunks(generator, size):
+    # type: (UserAgentGenerator, int) -> Iterator[bytes]
+    """Yield header and records of pool of `size` generated configs."""
+    yield SHARED_POOL_HEADER.pack(SHARED_POOL_MAGIC, CODE_VERSION, size)
+    configs = generator.iter_configs(size)
+    while True:
+        codes = encode_navigators(islice(configs, SHARED_POOL_CHUNK_SIZE))
+        if not codes:
+            break
+        yield struct.pack("<{}Q".format(len(codes)), *codes)
+
+
+def create_shared_pool(  # pylint: disable=too-many-positional-arguments
+    size,  # type: int
+    name=None,  # type: None | str
+    path=None,  # type: None | str
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+    rng=None,  # type: None | Random
+):
+    # type: (...) -> SharedUserAgentPool
+    """Generate `size` configs and write them into new shared buffer.
+
+    Exactly one of `name` and `path` must be given. Pool should be removed
+    with `SharedUserAgentPool.unlink` when it is not needed. Shared memory
+    block is also removed when process which created it exits.
+
+    :param size: number of configs
+    :param name: name of shared memory block to create, python 3.8+
+    :param path: path of file to create, existing file is overwritten
+    :param os: limit list of oses for generation
+    :type os: string or list/tuple or None
+    :param navigator: limit list of browser engines for generation
+    :type navigator: string or list/tuple or None
+    :param device_type: limit possible oses by device type
+    :type device_type: list/tuple or None, possible values:
+        "desktop", "smartphone", "tablet", "all"
+    :param rng: source of randomness, see `UserAgentGenerator`
+    :raises InvalidOption: if any of options is invalid or options conflict
+    :raises FileExistsError: if shared memory block already exists
+    """
+    if (name is None) == (path is None):
+        raise ValueError("Exactly one of name and path must be given")
+    if size < 0:
+        raise ValueError("Size of pool must be non-negative")
+    generator = UserAgentGenerator(
+        os=os, navigator=navigator, device_type=device_type, rng=rng
+    )
+    chunks = iter_pool_chunks(generator, size)
+    if path is not None:
+        with open(path, "wb") as out:
+            out.writelines(chunks)
+        return attach_shared_pool(path=path)
+    assert name is not None
+    block = open_shared_memory(
+        name, size=SHARED_POOL_HEADER.size + size * SHARED_POOL_RECORD.size
+    )
+    try:
+        buffer = block.buf
+        assert buffer is not None
+        offset = 0
+        for chunk in chunks:
+            buffer[offset : offset + len(chunk)] = chunk
+            offset += len(chunk)
+        return SharedUserAgentPool(block, buffer)
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+
+
+def attach_shared_pool(name=None, path=None):
+    # type: (None | str, None | str) -> SharedUserAgentPool
+    """Open pool created by `create_shared_pool` in this or other process.
+
+    :param name: name of shared memory block, it is attached read-only
+    :param path: path of pool file, it is memory-mapped read-only
+    :raises ValueError: if buffer does not contain pool of compatible
+        version
+    """
+    if (name is None) == (path is None):
+        raise ValueError("Exactly one of name and path must be given")
+    if path is not None:
+        with open(path, "rb") as inp:
+            handle = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return SharedUserAgentPool(handle, handle, path=path)
+        except ValueError:
+            handle.close()
+            raise
+    assert name is not None
+    block = open_shared_memory(name)
+    assert block.buf is not None
+    # attached pool must not modify block owned by other process
+    buffer = block.buf.toreadonly()
+    try:
+        return SharedUserAgentPool(block, buffer)
+    except ValueError:
+        buffer.release()
+        block.close()
+        raise
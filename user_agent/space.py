@@ -0,0 +1,494 @@
+"""Enumeration of all user agents which could be generated.
+
+The set of distinct user agents is finite: for each (device, os, navigator)
+variant it is the product of data tables: OS_PLATFORM, OS_CPU, CHROME_BUILD,
+MACOSX_CHROME_BUILD_RANGE, smartphone device ids, etc. `UserAgentSpace`
+reports exact size of the set for given options, iterates it lazily and
+maps integer index to item (unranking), so distinct user agents could be
+drawn by sampling indices::
+
+    space = UserAgentSpace(os="win")
+    len(space)
+    space.sample(100, rng=random.Random(1))
+
+Ranking is the inverse operation: `UserAgentSpace.navigator_index` maps
+generated navigator's config to its index, see `user_agent.codec`.
+"""
+# from __future__ import annotations
+
+from bisect import bisect_right
+from random import Random  # pylint: disable=unused-import
+
+try:
+    from collections.abc import Sequence
+except ImportError:  # python 2
+    # pylint: disable=deprecated-class
+    from collections import Sequence  # type: ignore[attr-defined] # noqa: UP035
+
+from . import base
+from .base import (
+    SECONDS_IN_DAY,
+    convert_navigator_to_js,
+    format_firefox_build,
+    get_firefox_build_table,
+    get_mac_builds,
+    render_app_components,
+    render_navigator,
+    render_system_components,
+    resolve_config_variants,
+)
+from .compat import lazy_range
+from .device import get_smartphone_dev_ids
+from .error import InvalidOption
+from .parser import detect_device_type, get_default_parser, match_user_agent
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias,consider-alternative-union-syntax
+    from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+    FirefoxBuildRange = Tuple[str, int, int, List[str]]
+    VariantKey = Tuple[str, str, str]
+    NavigatorDict = Dict[str, Optional[str]]
+    # pylint: enable=deprecated-typing-alias,consider-alternative-union-syntax
+
+__all__ = ["UserAgentSpace"]
+
+# "user_agent": each item of space is distinct user agent, components
+#   which are not visible in user agent (cpu of android, build time of
+#   firefox) take their first value
+# "navigator": each item is distinct navigator's config
+SPACE_MODES = ("user_agent", "navigator")
+# Length of firefox build id formatted as "%Y%m%d%H%M%S"
+FIREFOX_BUILD_ID_LENGTH = 14
+
+
+class FirefoxBuildSequence(Sequence):  # type: ignore[type-arg]
+    """Lazy sequence of all (version, build id) pairs of firefox builds.
+
+    Each version could be built at any second of its build time range,
+    see `base.build_firefox_build_table`.
+    """
+
+    def __init__(self, table):  # noqa: ANN204
+        # type: (list[FirefoxBuildRange]) -> None
+        self.table = table
+        self.starts = []  # type: list[int]
+        self.version_positions = {}  # type: dict[str, int]
+        size = 0
+        for pos, build_range in enumerate(table):
+            self.starts.append(size)
+            self.version_positions[build_range[0]] = pos
+            size += build_range[2]
+        self.size = size
+
+    def __len__(self):  # noqa: ANN204
+        # type: () -> int
+        return self.size
+
+    def __getitem__(self, index):  # type: ignore[override] # noqa: ANN204
+        # type: (int) -> tuple[str, str]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("Index out of range")
+        pos = bisect_right(self.starts, index) - 1
+        return format_firefox_build(self.table[pos], index - self.starts[pos])
+
+    def position(self, build):
+        # type: (tuple[str, None | str]) -> int
+        """Return index of (version, build id) pair, inverse of `__getitem__`.
+
+        :raises ValueError: if build is not in sequence
+        """
+        build_ver, build_id = build
+        pos = self.version_positions.get(build_ver)
+        if (
+            pos is None
+            or build_id is None
+            or len(build_id) != FIREFOX_BUILD_ID_LENGTH
+            or not build_id.isdigit()
+        ):
+            raise ValueError("Unknown firefox build")
+        _, start_offset, num_seconds, day_prefixes = self.table[pos]
+        if build_id[:8] not in day_prefixes:
+            raise ValueError("Unknown firefox build")
+        offset = (
+            day_prefixes.index(build_id[:8]) * SECONDS_IN_DAY
+            + int(build_id[8:10]) * 3600
+            + int(build_id[10:12]) * 60
+            + int(build_id[12:])
+            - start_offset
+        )
+        if not 0 <= offset < num_seconds:
+            raise ValueError("Unknown firefox build")
+        return self.starts[pos] + offset
+
+
+def get_build_table(navigator_id, mode):
+    # type: (str, str) -> Sequence[Any]
+    """Return table of builds of navigator, see `base.render_app_components`."""
+    if navigator_id == "firefox":
+        table = get_firefox_build_table()
+        if mode == "user_agent":
+            return [format_firefox_build(build_range, 0) for build_range in table]
+        return FirefoxBuildSequence(table)
+    if navigator_id == "chrome":
+        return base.CHROME_BUILD
+    return base.IE_VERSION
+
+
+def build_variant_dimensions(os_id, navigator_id, mode):
+    # type: (str, str, str) -> list[tuple[str, Sequence[Any]]]
+    """Build list of (name, items) tables which define configs of variant.
+
+    Each config of variant is a combination of one item of each table.
+    """
+    dimensions = []  # type: list[tuple[str, Sequence[Any]]]
+    if os_id == "mac" and navigator_id == "chrome":
+        dimensions.append(
+            (
+                "mac_platform",
+                [
+                    (platform_version, mac_build)
+                    for platform_version in base.OS_PLATFORM["mac"]
+                    for mac_build in get_mac_builds(platform_version)
+                ],
+            )
+        )
+    else:
+        dimensions.append(("platform", base.OS_PLATFORM[os_id]))
+    cpus = base.OS_CPU[os_id]
+    if os_id == "android" and mode == "user_agent":
+        # cpu is not visible in user agent of android
+        cpus = cpus[:1]
+    dimensions.append(("cpu", cpus))
+    if os_id == "android" and navigator_id == "chrome":
+        dimensions.append(("device_id", get_smartphone_dev_ids()))
+    dimensions.append(("build", get_build_table(navigator_id, mode)))
+    return dimensions
+
+
+def parse_variant_components(os_id, navigator_id, ua_platform, config):
+    # type: (str, str, str, Mapping[str, None | str]) -> dict[str, Any]
+    """Return dimension items of navigator's config, inverse of rendering.
+
+    :param ua_platform: platform part of user agent, see
+        `base.render_system_components`
+    :param config: navigator's config returned by `generate_navigator`
+    :return: dict {dimension name: item}, see `build_variant_dimensions`,
+        items are not validated
+    """
+    items = {}  # type: dict[str, Any]
+    if os_id == "win":
+        platform_version, _, cpu = ua_platform.partition("; ")
+    elif os_id == "mac":
+        platform_version, cpu = ua_platform, ""
+        if navigator_id == "chrome":
+            # "Macintosh; Intel Mac OS X 10_8_2" -> ("... 10.8", 2)
+            mac_version = ua_platform.partition("OS X ")[2]
+            mac_version, _, mac_build = mac_version.rpartition("_")
+            items["mac_platform"] = (
+                "Macintosh; Intel Mac OS X {}".format(mac_version.replace("_", ".")),
+                int(mac_build) if mac_build.isdigit() else None,
+            )
+    else:
+        # oscpu of linux and android is "Linux {cpu}"
+        cpu = (config["oscpu"] or "")[len("Linux ") :]
+        if os_id == "linux":
+            platform_version = ua_platform[: -len(cpu) - 1]
+        elif navigator_id == "chrome":
+            # "Linux; {platform_version}; {device_id}"
+            device_platform = ua_platform.partition("; ")[2]
+            platform_version, _, items["device_id"] = device_platform.partition("; ")
+        else:
+            platform_version = ua_platform.rpartition("; ")[0]
+    items["platform"] = platform_version
+    items["cpu"] = cpu
+    build_version = config["build_version"]
+    if navigator_id == "firefox":
+        items["build"] = (build_version, config["build_id"])
+    elif navigator_id == "chrome":
+        items["build"] = build_version
+    else:
+        items["build"] = next(
+            (item for item in base.IE_VERSION if item[1] == build_version), None
+        )
+    return items
+
+
+class VariantSpace:
+    """All configs of one (device, os, navigator) variant.
+
+    Config with index `idx` is defined by items of dimension tables,
+    index is a mixed radix number where last table is the fastest digit.
+    """
+
+    def __init__(self, device_type, os_id, navigator_id, mode):  # noqa: ANN204
+        # type: (str, str, str, str) -> None
+        self.device_type = device_type
+        self.os_id = os_id
+        self.navigator_id = navigator_id
+        self.dimensions = build_variant_dimensions(os_id, navigator_id, mode)
+        # {dimension name: {item: position}}, built on first use by `rank`
+        self.positions = {}  # type: dict[str, dict[Any, int]]
+        self.size = 1
+        for _, items in self.dimensions:
+            self.size *= len(items)
+
+    def components(self, index):
+        # type: (int) -> dict[str, Any]
+        """Return dict {dimension name: item} for config with given index."""
+        result = {}
+        for name, items in reversed(self.dimensions):
+            index, pos = divmod(index, len(items))
+            result[name] = items[pos]
+        return result
+
+    def position(self, name, items, item):
+        # type: (str, Sequence[Any], Any) -> int
+        """Return position of item in table of dimension `name`.
+
+        :raises ValueError: if item is not in table
+        """
+        if isinstance(items, FirefoxBuildSequence):
+            return items.position(item)
+        try:
+            positions = self.positions[name]
+        except KeyError:
+            positions = self.positions[name] = {
+                value: pos for pos, value in enumerate(items)
+            }
+        try:
+            return positions[item]
+        except KeyError:
+            pass
+        raise ValueError("Unknown item of {}: {!r}".format(name, item))
+
+    def rank(self, components):
+        # type: (Mapping[str, Any]) -> int
+        """Return index of config with given dimension items.
+
+        Inverse of `components`.
+
+        :raises ValueError: if any item is not in its table
+        """
+        index = 0
+        for name, items in self.dimensions:
+            pos = self.position(name, items, components.get(name))
+            index = index * len(items) + pos
+        return index
+
+    def navigator(self, index):
+        # type: (int) -> NavigatorDict
+        """Return web navigator's config with given index."""
+        items = self.components(index)
+        if "mac_platform" in items:
+            platform_version, mac_build = items["mac_platform"]
+        else:
+            platform_version, mac_build = items["platform"], None
+        return render_navigator(
+            self.device_type,
+            self.os_id,
+            self.navigator_id,
+            render_system_components(
+                self.device_type,
+                self.os_id,
+                self.navigator_id,
+                platform_version,
+                items["cpu"],
+                mac_build,
+                items.get("device_id"),
+            ),
+            render_app_components(self.os_id, self.navigator_id, items["build"]),
+        )
+
+
+class UserAgentSpace(Sequence):  # type: ignore[type-arg]
+    """Sequence of all distinct user agents which could be generated.
+
+    Items are computed on demand from their indexes, the space takes
+    little memory regardless of its size. `len(space)` is exact number of
+    distinct user agents, `space[idx]` returns user agent with index `idx`.
+    Space is a `Sequence`, so `random.sample(space, k)` works as well as
+    `space.sample(k)`.
+
+    Data tables are read once in constructor. Items are ordered by
+    (device, os, navigator) variant, so index of item is same on all
+    python versions.
+
+    :param os: limit list of oses
+    :type os: string or list/tuple or None
+    :param navigator: limit list of browser engines
+    :type navigator: string or list/tuple or None
+    :param device_type: limit possible oses by device type
+    :type device_type: list/tuple or None, possible values:
+        "desktop", "smartphone", "tablet", "all"
+    :param mode: "user_agent" (default) to enumerate distinct user agents or
+        "navigator" to enumerate distinct navigator's configs, including
+        components which are not visible in user agent: cpu of android and
+        build time of firefox. In "user_agent" mode such components take
+        their first values.
+    :raises InvalidOption: if any of options is invalid or options conflict
+    """
+
+    def __init__(  # noqa: ANN204
+        self,
+        os=None,  # type: None | str | Sequence[str]
+        navigator=None,  # type: None | str | Sequence[str]
+        device_type=None,  # type: None | str | Sequence[str]
+        mode="user_agent",  # type: str
+    ):
+        # type: (...) -> None
+        if mode not in SPACE_MODES:
+            raise InvalidOption("Option mode has invalid value: {}".format(mode))
+        self.mode = mode
+        # variants are sorted, so indexes do not depend on order of keys
+        # of data dicts which differs between python versions
+        self.variants = [
+            VariantSpace(device_type_id, os_id, navigator_id, mode)
+            for device_type_id, os_id, navigator_id in sorted(
+                resolve_config_variants(device_type, os, navigator)
+            )
+        ]
+        self.offsets = []  # type: list[int]
+        # {(device_type, os, navigator): (variant, offset)}
+        self.variant_offsets = {}  # type: dict[VariantKey, tuple[VariantSpace, int]]
+        self.size = 0
+        for variant in self.variants:
+            self.offsets.append(self.size)
+            self.variant_offsets[
+                variant.device_type, variant.os_id, variant.navigator_id
+            ] = (variant, self.size)
+            self.size += variant.size
+
+    def __len__(self):  # noqa: ANN204
+        # type: () -> int
+        return self.size
+
+    def locate(self, index):
+        # type: (int) -> tuple[VariantSpace, int]
+        """Return variant containing item with given index and index inside it.
+
+        :raises IndexError: if index is out of range
+        """
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("Index out of range")
+        pos = bisect_right(self.offsets, index) - 1
+        return self.variants[pos], index - self.offsets[pos]
+
+    def navigator(self, index):
+        # type: (int) -> NavigatorDict
+        """Return web navigator's config with given index."""
+        variant, variant_index = self.locate(index)
+        return variant.navigator(variant_index)
+
+    def navigator_index(self, config):
+        # type: (Mapping[str, None | str]) -> int
+        """Return index of web navigator's config, inverse of `navigator`.
+
+        Config could be any config returned by `generate_navigator` with
+        options of the space, it is not required to come from the space.
+
+        :raises ValueError: if config is not in space
+        """
+        user_agent = config["user_agent"]
+        matched = (
+            None
+            if user_agent is None
+            else match_user_agent(user_agent, get_default_parser().template_patterns)
+        )
+        os_id = config["os_id"] or ""
+        navigator_id = config["navigator_id"] or ""
+        if matched is None:
+            raise ValueError("Config is not in space")
+        _, tpl_name, match = matched
+        ua_platform = match.group("ua_platform")
+        try:
+            variant, offset = self.variant_offsets[
+                detect_device_type(os_id, tpl_name, ua_platform), os_id, navigator_id
+            ]
+        except KeyError:
+            pass
+        else:
+            return offset + variant.rank(
+                parse_variant_components(os_id, navigator_id, ua_platform, config)
+            )
+        raise ValueError("Config is not in space")
+
+    def navigator_js(self, index):
+        # type: (int) -> NavigatorDict
+        """Return config for `windows.navigator` JS object with given index."""
+        return convert_navigator_to_js(self.navigator(index))
+
+    def user_agent(self, index):
+        # type: (int) -> str
+        """Return User-Agent header with given index."""
+        user_agent = self.navigator(index)["user_agent"]
+        assert user_agent is not None
+        return user_agent
+
+    def __getitem__(self, index):  # noqa: ANN204
+        # type: (int | slice) -> str | list[str]
+        if isinstance(index, slice):
+            return [self.user_agent(idx) for idx in range(*index.indices(self.size))]
+        return self.user_agent(index)
+
+    def iter_navigators(self):
+        # type: () -> Iterator[NavigatorDict]
+        """Iterate lazily over navigator's configs in order of indexes."""
+        for variant in self.variants:
+            for variant_index in lazy_range(variant.size):
+                yield variant.navigator(variant_index)
+
+    def iter_navigators_js(self):
+        # type: () -> Iterator[NavigatorDict]
+        """Iterate lazily over configs for `windows.navigator` JS object."""
+        for config in self.iter_navigators():
+            yield convert_navigator_to_js(config)
+
+    def iter_user_agents(self):
+        # type: () -> Iterator[str]
+        """Iterate lazily over User-Agent headers in order of indexes."""
+        for config in self.iter_navigators():
+            yield config["user_agent"]  # type: ignore[misc]
+
+    def __iter__(self):  # noqa: ANN204
+        # type: () -> Iterator[str]
+        return self.iter_user_agents()
+
+    def sample_indexes(self, count, rng=None):
+        # type: (int, None | Random) -> list[int]
+        """Return `count` distinct random indexes of items.
+
+        :param rng: source of randomness, module's `base.randomizer` by default
+        :raises ValueError: if `count` is larger than size of space
+        """
+        rng = base.randomizer if rng is None else rng
+        return rng.sample(lazy_range(self.size), count)
+
+    def sample(self, count, rng=None):
+        # type: (int, None | Random) -> list[str]
+        """Return User-Agent headers of `count` distinct random items.
+
+        Headers are distinct in "user_agent" mode. In "navigator" mode
+        distinct configs could have same header, e.g. firefox builds
+        which differ only in build time, see `sample_navigators`.
+
+        :param rng: source of randomness, module's `base.randomizer` by default
+        :raises ValueError: if `count` is larger than size of space
+        """
+        return [self.user_agent(idx) for idx in self.sample_indexes(count, rng)]
+
+    def sample_navigators(self, count, rng=None):
+        # type: (int, None | Random) -> list[NavigatorDict]
+        """Return `count` distinct random navigator's configs.
+
+        With same `rng` configs are those which headers `sample` returns.
+
+        :param rng: source of randomness, module's `base.randomizer` by default
+        :raises ValueError: if `count` is larger than size of space
+        """
+        return [self.navigator(idx) for idx in self.sample_indexes(count, rng)]
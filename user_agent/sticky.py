@@ -0,0 +1,132 @@
+"""Deterministic assignment of user agents to keys.
+
+Same key always gets same user agent without any shared storage: key is
+hashed into two integers which select (device, os, navigator) variant and
+config of variant, see `user_agent.space.VariantSpace`::
+
+    user_agent_for_key("proxy-1:account-42", os="win")
+
+Mapping depends only on key, options and content of data tables, so it
+is same in all processes, on all machines and python versions: variants
+are sorted by (device, os, navigator), their order does not depend on
+order of keys of data dicts. KEY_MAPPING_VERSION is
+increased when data tables or hashing change, all keys get new user
+agents then.
+"""
+# from __future__ import annotations
+
+import hashlib
+import struct
+
+from .base import resolve_config_variants
+from .compat import text_type
+from .space import VariantSpace
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # pylint: disable=deprecated-typing-alias,consider-alternative-union-syntax
+    from typing import Dict, Optional, Sequence, Tuple
+
+    NavigatorDict = Dict[str, Optional[str]]
+    Variants = Tuple[Tuple[str, str, str], ...]
+    KeyVariants = Tuple[VariantSpace, ...]
+    # pylint: enable=deprecated-typing-alias,consider-alternative-union-syntax
+
+__all__ = ["navigator_for_key", "user_agent_for_key"]
+
+# Version of key to user agent mapping, it is a part of hashed data
+KEY_MAPPING_VERSION = 2
+# Spaces of configs of variants for resolved variants of options
+KEY_VARIANTS_CACHE_SIZE = 256
+KEY_VARIANTS_CACHE = {}  # type: dict[Variants, KeyVariants]
+
+
+def get_key_variants(
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+):
+    # type: (...) -> KeyVariants
+    """Return spaces of configs of variants allowed by options.
+
+    Variants are sorted by (device, os, navigator), result is cached.
+    """
+    variants = resolve_config_variants(device_type, os, navigator)
+    try:
+        return KEY_VARIANTS_CACHE[variants]
+    except KeyError:
+        pass
+    key_variants = tuple(
+        VariantSpace(device_type_id, os_id, navigator_id, "navigator")
+        for device_type_id, os_id, navigator_id in sorted(variants)
+    )
+    if len(KEY_VARIANTS_CACHE) >= KEY_VARIANTS_CACHE_SIZE:
+        KEY_VARIANTS_CACHE.clear()
+    KEY_VARIANTS_CACHE[variants] = key_variants
+    return key_variants
+
+
+def hash_key(key):
+    # type: (str | bytes) -> tuple[int, int]
+    """Hash key into two independent 64-bit integers.
+
+    Text is hashed as its UTF-8 encoding.
+
+    :raises TypeError: if key is not text or bytes
+    """
+    if isinstance(key, bytes):
+        data = key
+    elif isinstance(key, text_type):
+        data = key.encode("utf-8")
+    else:
+        raise TypeError("Key must be str or bytes, got {}".format(type(key).__name__))
+    digest = hashlib.sha256(
+        "user_agent:{}:".format(KEY_MAPPING_VERSION).encode("ascii") + data
+    ).digest()
+    return struct.unpack(">QQ", digest[:16])
+
+
+def navigator_for_key(
+    key,  # type: str | bytes
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+):
+    # type: (...) -> NavigatorDict
+    """Return web navigator's config assigned to key.
+
+    Like `generate_navigator` each (device, os, navigator) variant allowed
+    by options is equally likely, configs of variant are equally likely.
+    Weights of `user_agent.base` are not used: they could change while
+    mapping must not.
+
+    :param key: any str or bytes, e.g. "{proxy}:{account}"
+    :param os: limit list of oses
+    :type os: string or list/tuple or None
+    :param navigator: limit list of browser engines
+    :type navigator: string or list/tuple or None
+    :param device_type: limit possible oses by device type
+    :type device_type: list/tuple or None, possible values:
+        "desktop", "smartphone", "tablet", "all"
+    :return: config, see `generate_navigator`
+    :raises InvalidOption: if any of options is invalid or options conflict
+    """
+    variants = get_key_variants(os=os, navigator=navigator, device_type=device_type)
+    variant_hash, config_hash = hash_key(key)
+    variant = variants[variant_hash % len(variants)]
+    return variant.navigator(config_hash % variant.size)
+
+
+def user_agent_for_key(
+    key,  # type: str | bytes
+    os=None,  # type: None | str | Sequence[str]
+    navigator=None,  # type: None | str | Sequence[str]
+    device_type=None,  # type: None | str | Sequence[str]
+):
+    # type: (...) -> str
+    """Return User-Agent header assigned to key, see `navigator_for_key`."""
+    user_agent = navigator_for_key(
+        key, os=os, navigator=navigator, device_type=device_type
+    )["user_agent"]
+    assert user_agent is not None
+    return user_agent